@@ -1,27 +1,313 @@
 """Audio Controller using Windows Core Audio API."""
 
+import collections
 import ctypes
 import logging
 import math
+import sys
+import threading
 import time
 
-import comtypes
-import numpy as np
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import (DEVICE_STATE, AudioUtilities, EDataFlow,
-                         IAudioEndpointVolume, IAudioMeterInformation,
-                         IMMDeviceEnumerator)
+# Core Audio notifications need the multithreaded apartment, and so does
+# creating the controller on one thread and using it from another. comtypes
+# initializes the importing thread with this flag.
+sys.coinit_flags = getattr(sys, "coinit_flags", 0)
+
+try:
+    import comtypes
+    from comtypes import CLSCTX_ALL
+    from pycaw.callbacks import (AudioEndpointVolumeCallback,
+                                 MMNotificationClient)
+    from pycaw.pycaw import (DEVICE_STATE, AudioUtilities, EDataFlow,
+                             IAudioEndpointVolume, IAudioMeterInformation,
+                             IMMDeviceEnumerator)
+
+    CORE_AUDIO_IMPORT_ERROR = None
+    # Passed with every SetMute so notifications of our own changes, which
+    # may arrive after a newer command, are not mistaken for the user's
+    EVENT_CONTEXT = comtypes.GUID.create_new()
+except ImportError as import_error:  # Core Audio only exists on Windows
+    CORE_AUDIO_IMPORT_ERROR = import_error
+    EVENT_CONTEXT = None
 
 logger = logging.getLogger(__name__)
 
+# Seconds a mute state this process set may take to show up in a poll
+COMMAND_ECHO_TIME = 2.0
+
+# (time.monotonic(), muted) of the recent mute commands of every controller
+# in this process. Polling sees no event context, so a polled change to one
+# of these states is taken to be our own, like one carrying EVENT_CONTEXT.
+_commands = collections.deque(maxlen=16)
+_commands_lock = threading.Lock()
+
+
+def record_mute_command(muted):
+    """Remember a mute state this process is about to set"""
+    with _commands_lock:
+        _commands.append((time.monotonic(), bool(muted)))
+
+
+def is_own_mute_change(muted):
+    """
+    Whether a polled mute state is one this process recently set
+
+    The oldest matching command and any before it are used up, so each
+    command explains at most one change.
+
+    Args:
+        muted (bool): Mute state the endpoint now reports
+
+    Returns:
+        bool: True if a command still in COMMAND_ECHO_TIME set this state
+    """
+    oldest = time.monotonic() - COMMAND_ECHO_TIME
+    with _commands_lock:
+        while _commands and _commands[0][0] < oldest:
+            _commands.popleft()
+        for index, (_, state) in enumerate(_commands):
+            if state == muted:
+                for _ in range(index + 1):
+                    _commands.popleft()
+                return True
+    return False
+
+
+def forget_mute_commands():
+    """Forget the recorded mute commands, e.g. between tests"""
+    with _commands_lock:
+        _commands.clear()
+
+
+def initialize_com_thread():
+    """
+    Initialize COM for the calling thread in the multithreaded apartment
+
+    Returns:
+        bool: True if COM was initialized and must be released with
+              uninitialize_com_thread()
+    """
+    if CORE_AUDIO_IMPORT_ERROR is not None:
+        return False
+    try:
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        return True
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Could not initialize COM for thread: %s", e)
+        return False
+
+
+def uninitialize_com_thread():
+    """Release COM for the calling thread"""
+    try:
+        comtypes.CoUninitialize()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Could not uninitialize COM for thread: %s", e)
+
+
+class PollingMuteNotifier:
+    """Fallback source of mute changes that polls the endpoint on its own thread"""
+
+    def __init__(self, read_state, interval=0.25):
+        """
+        Initialize the poller
+
+        Args:
+            read_state (callable): Returns the current mute state
+            interval (float): Seconds between polls
+        """
+        self.read_state = read_state
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_state = None
+
+    def start(self, callback):
+        """
+        Start polling, calling callback(muted, event_context) whenever the
+        state changes
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(callback,), name="MutePoller", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, callback):
+        """Polling thread main loop"""
+        com_initialized = initialize_com_thread()
+        self._last_state = None
+        try:
+            while not self._stop_event.is_set():
+                self.poll(callback)
+                self._stop_event.wait(self.interval)
+        finally:
+            if com_initialized:
+                uninitialize_com_thread()
+
+    def poll(self, callback):
+        """
+        Read the state once and report it if it changed
+
+        A change to a state this process just set is reported with
+        EVENT_CONTEXT, as an endpoint notification of our own command would
+        be. The first state read is never taken to be our own.
+
+        Args:
+            callback (callable): Called as callback(muted, event_context)
+        """
+        try:
+            state = self.read_state()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.debug("Error polling mute state: %s", e)
+            return
+        if state is None or state == self._last_state:
+            return
+        own = self._last_state is not None and is_own_mute_change(state)
+        self._last_state = state
+        callback(state, EVENT_CONTEXT if own else None)
+
+    def stop(self):
+        """Stop polling"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class EndpointVolumeNotifier:
+    """Source of mute changes driven by endpoint volume change notifications"""
+
+    def __init__(self, volume):
+        """
+        Initialize the notifier
+
+        Args:
+            volume: IAudioEndpointVolume interface to register with
+        """
+        self.volume = volume
+        self._registration = None
+
+    def start(self, callback):
+        """
+        Register for notifications, calling callback(muted, event_context) on
+        each one
+        """
+        registration = _MuteChangeCallback(callback)
+        self.volume.RegisterControlChangeNotify(registration)
+        self._registration = registration
+
+    def stop(self):
+        """Unregister from notifications"""
+        if self._registration is not None:
+            try:
+                self.volume.UnregisterControlChangeNotify(self._registration)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Error unregistering volume notifications: %s", e)
+            self._registration = None
+
+
+class DeviceChangeNotifier:
+    """Source of audio endpoint added, removed and state change notifications"""
+
+    def __init__(self):
+        """Initialize the notifier"""
+        self._enumerator = None
+        self._client = None
+
+    def start(self, callback):
+        """Register for notifications, calling callback() on each one"""
+        if CORE_AUDIO_IMPORT_ERROR is not None:
+            raise OSError(
+                f"Windows Core Audio is not available: {CORE_AUDIO_IMPORT_ERROR}"
+            )
+        enumerator = AudioUtilities.GetDeviceEnumerator()
+        client = _DeviceChangeClient(callback)
+        enumerator.RegisterEndpointNotificationCallback(client)
+        self._enumerator = enumerator
+        self._client = client
+
+    def stop(self):
+        """Unregister from notifications"""
+        if self._client is not None:
+            try:
+                self._enumerator.UnregisterEndpointNotificationCallback(self._client)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Error unregistering device notifications: %s", e)
+            self._enumerator = None
+            self._client = None
+
+
+if CORE_AUDIO_IMPORT_ERROR is None:
+
+    class _DeviceChangeClient(MMNotificationClient):
+        """Forwards IMMNotificationClient device changes to a function"""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def on_default_device_changed(  # pylint: disable=too-many-arguments
+            self, flow, flow_id, role, role_id, default_device_id
+        ):
+            """Called by Windows on a COM worker thread"""
+            self.callback()
+
+        def on_device_added(self, added_device_id):
+            """Called by Windows on a COM worker thread"""
+            self.callback()
+
+        def on_device_removed(self, removed_device_id):
+            """Called by Windows on a COM worker thread"""
+            self.callback()
+
+        def on_device_state_changed(self, device_id, new_state, new_state_id):
+            """Called by Windows on a COM worker thread"""
+            self.callback()
+
+    class _MuteChangeCallback(AudioEndpointVolumeCallback):
+        """Forwards IAudioEndpointVolumeCallback notifications to a function"""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def on_notify(  # pylint: disable=too-many-arguments
+            self, new_volume, new_mute, event_context, channels, channel_volumes
+        ):
+            """Called by Windows on a COM worker thread"""
+            del new_volume, channels, channel_volumes
+            self.callback(bool(new_mute), event_context)
+
 
 class AudioController:
     """Controls audio functions using Windows Core Audio API"""
 
-    def __init__(self):
-        """Initialize the audio controller"""
+    def __init__(self, notifier=None, poll_interval=0.25):
+        """
+        Initialize the audio controller
+
+        Args:
+            notifier: Source of mute change notifications, see
+                      watch_mute_changes()
+            poll_interval (float): Seconds between polls when notifications
+                                   are unavailable
+        """
         self.initialized = False
         self.output_monitor_initialized = False
+        self.poll_interval = poll_interval
+        # Write-through cache of the endpoint mute state, None when unknown
+        self._muted = None
+        self._mute_listeners = []
+        self._notifier = None
+
+        if CORE_AUDIO_IMPORT_ERROR is not None:
+            logger.warning(
+                "Windows Core Audio is not available: %s", CORE_AUDIO_IMPORT_ERROR
+            )
+            if notifier is not None:
+                self.watch_mute_changes(notifier)
+            return
 
         try:
             # Get default audio device
@@ -48,6 +334,69 @@ class AudioController:
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Failed to initialize audio controller: %s", e)
 
+        if self.initialized or notifier is not None:
+            self.watch_mute_changes(notifier)
+
+    def watch_mute_changes(self, notifier=None):
+        """
+        Keep the cached mute state fresh from a source of change notifications
+
+        Args:
+            notifier: Object with start(callback) and stop(). Defaults to
+                      endpoint volume notifications, falling back to polling
+                      the endpoint if those cannot be registered.
+        """
+        self.close()
+        if notifier is None:
+            notifier = EndpointVolumeNotifier(self.volume)
+        try:
+            notifier.start(self._on_mute_notification)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Volume notifications unavailable, polling: %s", e)
+            notifier = PollingMuteNotifier(
+                lambda: bool(self.volume.GetMute()), self.poll_interval
+            )
+            notifier.start(self._on_mute_notification)
+        self._notifier = notifier
+
+    def add_mute_listener(self, callback):
+        """
+        Call callback(muted) whenever the mute state changes outside this
+        controller, e.g. from the taskbar. Called on a notification thread.
+        """
+        self._mute_listeners.append(callback)
+
+    def remove_mute_listener(self, callback):
+        """Stop calling a listener added with add_mute_listener()"""
+        if callback in self._mute_listeners:
+            self._mute_listeners.remove(callback)
+
+    def _on_mute_notification(self, muted, event_context=None):
+        """
+        Update the cache from a notification and tell listeners of changes
+
+        Args:
+            muted (bool): Mute state reported by the notification
+            event_context: GUID passed to the SetMute that caused it, if known
+        """
+        changed = muted != self._muted
+        self._muted = muted
+        # Our own commands, from any controller in this process, are not
+        # external changes even when their notification arrives late
+        own = EVENT_CONTEXT is not None and event_context == EVENT_CONTEXT
+        if changed and not own:
+            for callback in list(self._mute_listeners):
+                try:
+                    callback(muted)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("Error in mute listener: %s", e)
+
+    def close(self):
+        """Stop receiving mute change notifications"""
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+
     def is_audio_playing(self):
         """
         Check if any audio is currently playing through the speakers
@@ -102,9 +451,12 @@ class AudioController:
             bool or None: Current mute state (True=muted, False=unmuted),
                           or None if state couldn't be determined
         """
+        if self._muted is not None:
+            return self._muted
         if self.initialized:
             try:
-                return bool(self.volume.GetMute())
+                self._muted = bool(self.volume.GetMute())
+                return self._muted
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.error("Error setting mute state: %s", e)
         return None  # Return None if we can't determine the state
@@ -121,7 +473,9 @@ class AudioController:
         """
         if self.initialized:
             try:
-                self.volume.SetMute(bool(should_mute), None)
+                record_mute_command(should_mute)
+                self.volume.SetMute(bool(should_mute), ctypes.byref(EVENT_CONTEXT))
+                self._muted = bool(should_mute)
                 return should_mute  # Return new mute state
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.error("Error setting mute state: %s", e)
@@ -133,9 +487,11 @@ class AudioController:
 
             # Only press mute key if needed
             if current_state is not None and current_state != should_mute:
+                record_mute_command(should_mute)
                 # VK_VOLUME_MUTE = 0xAD
                 ctypes.windll.user32.keybd_event(0xAD, 0, 0, 0)
                 ctypes.windll.user32.keybd_event(0xAD, 0, 2, 0)
+                self._muted = bool(should_mute)
                 return should_mute
             if current_state is not None:
                 # Already in desired state
@@ -157,8 +513,12 @@ class AudioController:
         """
         if self.initialized:
             try:
-                current_mute = self.volume.GetMute()
-                self.volume.SetMute(not current_mute, None)
+                current_mute = self.get_mute_state()
+                if current_mute is None:
+                    current_mute = bool(self.volume.GetMute())
+                record_mute_command(not current_mute)
+                self.volume.SetMute(not current_mute, ctypes.byref(EVENT_CONTEXT))
+                self._muted = not current_mute
                 return not current_mute  # Return new mute state
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.error("Error toggling mute with audio controller: %s", e)
@@ -168,7 +528,8 @@ class AudioController:
             # VK_VOLUME_MUTE = 0xAD
             ctypes.windll.user32.keybd_event(0xAD, 0, 0, 0)
             ctypes.windll.user32.keybd_event(0xAD, 0, 2, 0)
-            # Can't determine actual state, so return None
+            # Can't determine actual state until the next notification
+            self._muted = None
             return None
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error toggling mute with media keys: %s", e)
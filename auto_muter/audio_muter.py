@@ -1,56 +1,242 @@
 """Core auto-muting functionality handler."""
 
+# numpy, PyAudio and Core Audio are imported where they are first used so
+# that importing this module, and showing the GUI, does not wait for them
+# pylint: disable=import-outside-toplevel
+
 import logging
-import struct
 import threading
 import time
 
-import numpy as np
-import pyaudio
-
-from auto_muter.audio_controller import AudioController
-from auto_muter.utils import get_audio_devices
+from auto_muter import events
+from auto_muter.decision import MuteDecision
+from auto_muter.device_cache import DeviceCache
+from auto_muter.metrics import PipelineMetrics, SummaryReporter
+from auto_muter.noise_floor import NoiseFloorTracker
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DEVICE = {"name": "Default Microphone", "id": "default"}
+
+
+def create_audio_controller():
+    """Create the Windows AudioController, importing Core Audio on first use"""
+    from auto_muter import audio_controller
+
+    return audio_controller.AudioController()
+
+
+def list_input_devices():
+    """Enumerate input devices, importing PyAudio on first use"""
+    from auto_muter import utils
+
+    return utils.get_audio_devices()
+
+
+def current_host_api():
+    """Name of the host API the shared PortAudio host enumerates"""
+    from auto_muter.host import get_host_session
+
+    return get_host_session().host_api_name()
+
 
 class AudioMuter:
     """Core auto-muting functionality with voice detection"""
 
-    def __init__(self):
-        """Initialize the AudioMuter"""
+    def __init__(self, audio_controller=None, source=None, background_init=False):
+        """
+        Initialize the AudioMuter
+
+        Args:
+            audio_controller: Controller used to mute, defaults to the Windows
+                              AudioController
+            source (AudioSource): Input to monitor instead of the microphone
+                                  selected with input_device
+            background_init (bool): Leave device enumeration and controller
+                                    setup to initialize_in_background()
+        """
         self.running = False
         self.muted = True
         # Track the initial mute state for restoring when stopped
         # self.initial_mute_state = None
+        # Thresholds, minimum speech and hangover, see MuteDecision; the
+        # silence_timeout and release_threshold properties forward to it
+        self.decision = MuteDecision(attack_threshold=1000, silence_timeout=1.0)
         self.energy_threshold = 1000  # Adjust for sensitivity
-        self.silence_timeout = 1.0  # Seconds of silence before muting
-        self.last_sound_time = time.time()
+        # With adaptive_threshold, speech starts noise_margin_db above the
+        # tracked background noise instead of at energy_threshold
+        self.noise_tracker = NoiseFloorTracker()
+        self.adaptive_threshold = False
+        # How a window is measured: "rms" (broadband level) or "spectral"
+        # (voice-band level of frames that are not noise-like), see
+        # SpectralVad
+        self.detector = "rms"
+        # Keystrokes and other impulsive sounds up to max_transient_duration
+        # seconds are removed before the energy is measured, see
+        # TransientGate
+        self.transient_rejection = False
+        self.max_transient_duration = 0.04
         self.output_monitoring_enabled = True  # Default to enabled
+        # Output peak meter sampling rate in Hz and peak hold in seconds
+        self.output_sample_rate = 50.0
+        self.output_hold = 0.5
+        self.output_sampler = None
+        # Process names whose audio sessions count as output, e.g.
+        # ["spotify.exe"], or never count, e.g. our softphone. With both
+        # empty the whole speaker endpoint is metered.
+        self.output_include_processes = []
+        self.output_exclude_processes = []
+        # Creates a CoreAudioSessionManager when None
+        self.session_manager_factory = None
+
+        if audio_controller is None:
+            # The dispatcher creates its own controller on its own thread
+            self._controller_factory = create_audio_controller
+            self._owns_controller = True
+        else:
+            self._controller_factory = lambda: audio_controller
+            self._owns_controller = False
+        self.audio_controller = audio_controller
+        # Applies mute changes off the audio thread while running
+        self.dispatcher = None
+        # Stage timings and counters, recorded once metrics.enabled is set;
+        # a summary is logged every metrics_interval seconds while running
+        self.metrics = PipelineMetrics()
+        self.metrics_interval = 60.0
+        self._metrics_reporter = None
+        # Delivers state changes to the GUI and other subscribers on their
+        # own threads, see subscribe()
+        self.events = events.EventBus()
+        # Set once devices are listed and the controller is ready
+        self.ready = threading.Event()
+        # Devices from the last launch until the real list has been loaded
+        self.device_cache = DeviceCache()
+        self.devices = self.device_cache.load() or [dict(DEFAULT_DEVICE)]
+        self.device_watcher = None
+        self.initial_mute_state = None
 
-        # Initialize audio controller
-        self.audio_controller = AudioController()
+        self.input_device = "default"
+        # Device ids monitored together instead of input_device, their
+        # energies are combined with fusion_rule ("any", "majority" or
+        # "weighted" with fusion_weights), see EnergyFusion
+        self.input_devices = None
+        self.fusion_rule = "any"
+        self.fusion_weights = None
+        # Channels captured from a single device, reduced to one energy with
+        # channel_policy ("max", "mean" or "select" with channel_select), see
+        # ChannelPolicy
+        self.channels = 1
+        self.channel_policy = "max"
+        self.channel_select = None
+        # Seconds of audio per chunk; devices are opened at their native
+        # rate and resampled to 16 kHz for the analysis. chunk_size, frames
+        # per chunk at 16 kHz, takes precedence for older configs.
+        self.chunk_duration = 0.064
+        self.chunk_size = None
+        # "callback" hands chunks over from PortAudio's thread as soon as they
+        # are captured, "blocking" reads them synchronously on the audio thread
+        self.capture_mode = "callback"
+        # Analysis window and hop in samples, None means one chunk; a hop
+        # smaller than the window gives overlapping windows
+        self.analysis_window = None
+        self.analysis_hop = None
+        self.ring_buffer = None
+        self.source = source
+        self.audio_thread = None
+        self._active_source = None
+        self._last_output_check_time = time.monotonic()
+
+        if not background_init:
+            self._initialize_backends()
+
+    def initialize_in_background(self, on_ready=None):
+        """
+        List devices and create the controller without blocking the caller
 
-        # Get list of input devices for Windows
+        Lets the GUI appear before PyAudio and Core Audio are loaded. ready
+        is set when done and start() waits for it.
+
+        Args:
+            on_ready (callable): Called with no arguments on the background
+                                 thread once initialization has finished
+        """
+        thread = threading.Thread(
+            target=self._initialize_backends,
+            args=(on_ready,),
+            name="AudioMuterInit",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _initialize_backends(self, on_ready=None):
+        """List input devices, create the controller and read the mute state"""
+        started = time.perf_counter()
         try:
-            self.devices = get_audio_devices()
+            self._load_devices()
+            self._watch_devices()
+
+            try:
+                if self.audio_controller is None:
+                    self.audio_controller = self._controller_factory()
+                # Follow mute changes made outside AutoMuter, e.g. the taskbar
+                if hasattr(self.audio_controller, "add_mute_listener"):
+                    self.audio_controller.add_mute_listener(
+                        self._on_external_mute_change
+                    )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Error creating audio controller: %s", e)
+
+            # Get the initial mute state when the application starts
+            self._capture_initial_mute_state()
+        finally:
+            self.ready.set()
+            self._publish(
+                events.BackendsReady(self.initial_mute_state, time.monotonic())
+            )
+            logger.info(
+                "Audio backends ready in %.0f ms",
+                (time.perf_counter() - started) * 1e3,
+            )
+        if on_ready is not None:
+            on_ready()
+
+    def _load_devices(self):
+        """List input devices and cache them for the next launch"""
+        try:
+            devices = list_input_devices()
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error getting audio devices: %s", e)
-            self.devices = [{"name": "Default", "id": "default"}]
+            return
+        self.devices = devices
+        self._publish(events.DevicesChanged(devices, time.monotonic()))
 
-        self.input_device = "default"
-        self.chunk_size = 1024
-        self.audio_thread = None
+        try:
+            host_api = current_host_api()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Not caching devices, host API unknown: %s", e)
+            return
+        self.device_cache.save(host_api, devices)
+
+    def _watch_devices(self):
+        """Reload the devices whenever one is plugged in or removed"""
+        from auto_muter.audio_controller import DeviceChangeNotifier
+        from auto_muter.host import DeviceWatcher
 
-        # Get the initial mute state when the application starts
-        self._capture_initial_mute_state()
+        watcher = DeviceWatcher(self._load_devices)
+        try:
+            watcher.start(DeviceChangeNotifier())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.info("Device change notifications unavailable: %s", e)
+            return
+        self.device_watcher = watcher
 
     def _capture_initial_mute_state(self):
         """Capture the initial mute state of the system"""
         try:
             if self.audio_controller.initialized:
                 self.initial_mute_state = self.audio_controller.get_mute_state()
-                logger.error(
+                logger.info(
                     "Initial mute state captured: %s",
                     "Muted" if self.initial_mute_state else "Unmuted",
                 )
@@ -68,125 +254,508 @@ class AudioMuter:
     def _record_and_process_audio(self):
         """Record audio and process it for voice detection"""
         try:
-            self._record_with_pyaudio()
+            if self.source is not None:
+                self._process_source(self.source)
+                self.running = False
+            else:
+                self._record_with_pyaudio()
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error in audio processing: %s", e)
             self.running = False
-            self._update_gui_status(f"Error: {str(e)}")
+            self.metrics.count("errors")
+            self._publish_error(e)
 
     def _record_with_pyaudio(self):
         """Record and process audio using PyAudio"""
-
-        chunk = self.chunk_size
-        format = pyaudio.paInt16
-        channels = 1
-        rate = 16000
-
         try:
-            p = pyaudio.PyAudio()
-
-            # Get the device index if not using default
-            device_index = None
-            if self.input_device != "default" and self.input_device.isdigit():
-                device_index = int(self.input_device)
-
-            # Open the stream
-            stream = p.open(
-                format=format,
-                channels=channels,
-                rate=rate,
-                input=True,
-                frames_per_buffer=chunk,
-                input_device_index=device_index,
-            )
+            from auto_muter.sources import (DEFAULT_RATE, MicrophoneSource,
+                                            MultiDeviceSource)
+
+            devices = self.input_devices or [self.input_device]
+            chunk_duration = self.chunk_duration
+            if self.chunk_size:
+                chunk_duration = self.chunk_size / DEFAULT_RATE
+            # Several devices are fused per device, each captured in mono
+            channels = self.channels if len(devices) == 1 else 1
+            sources = [
+                MicrophoneSource(
+                    device,
+                    self.capture_mode,
+                    channels=channels,
+                    chunk_duration=chunk_duration,
+                    rate=DEFAULT_RATE,
+                )
+                for device in devices
+            ]
+            if len(sources) == 1:
+                source = sources[0]
+            else:
+                source = MultiDeviceSource(sources)
+            self._process_source(source)
 
-            logger.error("Started PyAudio stream on device: %s", self.input_device)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error in PyAudio processing: %s", e)
+            self.running = False
+            self.metrics.count("errors")
+            self._publish_error(e)
 
-            # Output monitoring interval
-            output_check_interval = 0.5  # Check output every half second
-            last_output_check_time = time.time()
+    def _process_source(self, source, transitions=None):
+        """
+        Read chunks from a source and run the detection until stopped
 
-            while self.running:
+        Args:
+            source (AudioSource): Input to read from
+            transitions (list): If given, (time, muted) is appended for every
+                                mute state change
+        """
+        from auto_muter.dsp import TransientGate
+        from auto_muter.ring_buffer import AudioRingBuffer
+
+        source.start()
+        self._active_source = source
+        logger.info(
+            "Started %s on device: %s",
+            type(source).__name__,
+            self.input_devices or self.input_device,
+        )
+
+        # Reused across chunks so the hot loop allocates no new arrays
+        window = self.analysis_window or source.chunk_size
+        window_energy = self._window_energy(source, window)
+        self.ring_buffer = AudioRingBuffer(
+            capacity=max(16 * source.chunk_size, 4 * window),
+            window_size=window,
+            hop_size=self.analysis_hop or window,
+            channels=source.channels,
+        )
+        # Created even when off, so it can be switched on while monitoring
+        gate = TransientGate(
+            source.rate, source.channels, max_duration=self.max_transient_duration
+        )
+        self.decision.reset(now=source.now())
+        self.noise_tracker.reset()
+        self._last_output_check_time = source.now()
+
+        metrics = self.metrics
+        clock = time.perf_counter
+        overruns = suppressed = 0
+        try:
+            while self.running and not source.finished:
                 try:
-                    # Read audio data
-                    data = stream.read(chunk, exception_on_overflow=False)
-
-                    # Calculate energy from microphone
-                    fmt = f"{len(data)//2}h"
-                    pcm_data = struct.unpack(fmt, data)
-                    energy = np.sqrt(np.mean(np.array(pcm_data) ** 2))
-
-                    # Current time
-                    current_time = time.time()
-
-                    # Check if output monitoring is enabled and it's time to check again
-                    audio_playing = False
-                    if (
-                        self.output_monitoring_enabled
-                        and (current_time - last_output_check_time)
-                        > output_check_interval
-                    ):
-                        audio_playing = self.audio_controller.is_audio_playing()
-                        last_output_check_time = current_time
-                        if audio_playing:
-                            logger.debug("Audio output detected")
-
-                    # If either speaking is detected OR audio is playing
-                    if energy > self.energy_threshold or audio_playing:
-                        self.last_sound_time = current_time
-                        if self.muted:
-                            self.toggle_mute()
-                    # If silence for longer than timeout
-                    elif (
-                        not self.muted
-                        and current_time - self.last_sound_time > self.silence_timeout
-                    ):
-                        self.toggle_mute()
+                    # Stages are only timed while metrics are enabled
+                    timing = metrics.enabled
+                    if timing:
+                        started = clock()
+                    # Wait for the next chunk, no extra sleep is needed since
+                    # every source blocks until audio is available, so the
+                    # read stage includes that wait
+                    data = source.read()
+                    if data is None:
+                        continue
+                    if timing:
+                        read_at = clock()
+                        metrics.stage("read").add(read_at - started)
+                        metrics.count("chunks")
+
+                    # Drop keystrokes before they reach the analysis windows
+                    if self.transient_rejection:
+                        data = gate.process(data)
+
+                    # Calculate energy from microphone for every complete
+                    # analysis window the new chunk makes available
+                    self.ring_buffer.write(data)
+                    if timing:
+                        started = clock()
+                        metrics.stage("decode").add(started - read_at)
+                        if self.ring_buffer.overruns != overruns:
+                            metrics.count(
+                                "overflows", self.ring_buffer.overruns - overruns
+                            )
+                            overruns = self.ring_buffer.overruns
+                        if gate.suppressed != suppressed:
+                            metrics.count("transients", gate.suppressed - suppressed)
+                            suppressed = gate.suppressed
+                    samples = self.ring_buffer.read_window()
+                    # Levels are only built when someone listens for them
+                    publish_levels = self.events.wants(events.LevelUpdate)
+                    while samples is not None:
+                        energy = window_energy(samples)
+                        if timing:
+                            metrics.stage("energy").add(clock() - started)
+                        muted = self.muted
+                        self._process_chunk(energy, source.now())
+                        if transitions is not None and self.muted != muted:
+                            transitions.append((source.now(), self.muted))
+                        if publish_levels:
+                            self._publish_level(energy)
+                        if timing:
+                            started = clock()
+                        samples = self.ring_buffer.read_window()
 
                 except IOError as e:
                     # Handle overflow errors
-                    logger.error("PyAudio read error (overflow): %s", e)
+                    logger.warning("PyAudio read error (overflow): %s", e)
+                    metrics.count("overflows")
+        finally:
+            # Clean up
+            self._active_source = None
+            source.stop()
+            if self.ring_buffer.overruns:
+                logger.warning(
+                    "Analysis fell behind capture %d times",
+                    self.ring_buffer.overruns,
+                )
+            if gate.suppressed:
+                logger.info("Ignored %d keystrokes or clicks", gate.suppressed)
+            logger.info("%s closed", type(source).__name__)
 
-                # Small sleep to prevent CPU hogging
-                time.sleep(0.01)
+    def _window_energy(self, source, window):
+        """
+        Create the function measuring one analysis window of a source
 
-            # Clean up
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-            logger.info("PyAudio stream closed")
+        Windows are measured with detector, all channels in one vectorized
+        pass; the devices of a MultiDeviceSource are combined with
+        fusion_rule, the channels of one device with channel_policy.
 
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Error in PyAudio processing: %s", e)
+        Args:
+            source (AudioSource): Source the windows come from
+            window (int): Frames per window
+
+        Returns:
+            callable: Returns the energy of a window as a float
+        """
+        from auto_muter.dsp import (DETECTORS, ChannelEnergy, FrameEnergy,
+                                    SpectralVad)
+        from auto_muter.fusion import ChannelPolicy, EnergyFusion
+
+        if self.detector not in DETECTORS:
+            raise ValueError(f"Unknown detector: {self.detector}")
+        if self.detector == "spectral":
+            vad = SpectralVad(window, source.rate)
+            mono_energy, channel_energies = vad.energy, vad.energies
+        else:
+            mono_energy = FrameEnergy(window).rms_samples
+            channel_energies = ChannelEnergy(window, source.channels).rms
+        if source.channels == 1:
+            return mono_energy
+
+        # Updated in place when a device fails
+        active = getattr(source, "active", None)
+        if active is None:
+            policy = ChannelPolicy(self.channel_policy, self.channel_select)
+
+            def channel_energy_of(samples):
+                return policy.reduce(channel_energies(samples))
+
+            return channel_energy_of
+
+        fusion = EnergyFusion(self.fusion_rule, self.fusion_weights)
+
+        def fused_energy(samples):
+            return fusion.fuse(channel_energies(samples), active)
+
+        return fused_energy
+
+    def replay(self, source):
+        """
+        Run the detection over a recorded or synthetic source on this thread
+
+        Meant for offline evaluation: with a non-realtime source a whole
+        recording is processed as fast as possible, timed by its audio
+        position. Use a SimulatedAudioController to avoid touching the
+        system mute state.
+
+        Args:
+            source (AudioSource): Input to process until it is exhausted
+
+        Returns:
+            list[tuple[float, bool]]: (time, muted) for each mute state change
+        """
+        transitions = []
+        self.running = True
+        try:
+            self._process_source(source, transitions)
+        finally:
             self.running = False
-            self._update_gui_status(f"Error: {str(e)}")
+        return transitions
+
+    def _process_chunk(self, energy, current_time):
+        """
+        Apply the mute/unmute decision for one captured chunk
+
+        Args:
+            energy (float): RMS energy of the chunk
+            current_time (float): Time the chunk was received
+        """
+        audio_playing = False
+        if self.output_monitoring_enabled:
+            audio_playing = self.metrics.call(
+                "output_check", self._is_output_playing, current_time
+            )
+
+        # The floor is tracked in both modes so switching is immediate
+        self.noise_tracker.update(energy, current_time)
+        decision = self.decision
+        decision.attack_threshold = self.effective_threshold
+        if self.metrics.enabled and self.noise_tracker.floor is not None:
+            self.metrics.gauge("noise_floor", self.noise_tracker.floor)
+            self.metrics.gauge("effective_threshold", decision.attack_threshold)
+        # Follow manual and external mute changes
+        decision.muted = self.muted
+        should_mute = decision.update(energy, current_time, audio_playing)
+        if should_mute is not None:
+            self._request_mute(should_mute)
+
+    def _is_output_playing(self, current_time):
+        """
+        Whether audio is playing through the speakers
+
+        While running this reads the background sampler's latest level,
+        which costs nothing on the audio thread. Otherwise (e.g. in replay())
+        the controller is queried directly every half second of audio.
+
+        Args:
+            current_time (float): Time of the chunk being processed
+        """
+        sampler = self.output_sampler
+        if sampler is not None and sampler.running:
+            return sampler.is_playing()
+
+        output_check_interval = 0.5  # Check output every half second
+        if (current_time - self._last_output_check_time) <= output_check_interval:
+            return False
+        self._last_output_check_time = current_time
+        audio_playing = self.metrics.call(
+            "controller", self.audio_controller.is_audio_playing
+        )
+        if audio_playing:
+            logger.debug("Audio output detected")
+        return audio_playing
+
+    def _create_output_meter(self):
+        """
+        Create what the output sampler reads, on the sampler's thread
+
+        Returns:
+            The controller for the endpoint peak, or a SessionLevelMonitor
+            when output is filtered by process
+        """
+        from auto_muter.sessions import (CoreAudioSessionManager,
+                                         SessionLevelMonitor)
+
+        if not (self.output_include_processes or self.output_exclude_processes):
+            return self._controller_factory()
+        manager_factory = self.session_manager_factory or CoreAudioSessionManager
+        monitor = SessionLevelMonitor(
+            manager_factory(),
+            include=self.output_include_processes,
+            exclude=self.output_exclude_processes,
+        )
+        return monitor.start()
+
+    def subscribe(
+        self, callback, event_types=None, max_queue=256, drop_policy="oldest"
+    ):
+        """
+        Receive state changes on a dedicated thread
+
+        Publishing never waits for subscribers, so a slow one cannot delay
+        capture; it loses events instead, per drop_policy.
+
+        Args:
+            callback (callable): Called with each event, e.g. MuteChanged
+            event_types (tuple): Classes from auto_muter.events to receive,
+                                 all if None
+            max_queue (int): Events kept waiting for the callback
+            drop_policy (str): "oldest" drops the oldest waiting event when
+                               the queue is full, "newest" the incoming one
+
+        Returns:
+            Subscription: Pass to unsubscribe() to stop
+        """
+        return self.events.subscribe(callback, event_types, max_queue, drop_policy)
+
+    def unsubscribe(self, subscription, timeout=1.0):
+        """
+        Stop a subscription made with subscribe()
+
+        Args:
+            subscription (Subscription): Returned by subscribe()
+            timeout (float): Seconds to wait for its thread to finish
+        """
+        self.events.unsubscribe(subscription, timeout)
+
+    def _publish(self, event):
+        """Hand an event to the subscribers"""
+        self.events.publish(event)
+
+    def _publish_mute(self, reason):
+        """Publish the current mute state"""
+        self._publish(events.MuteChanged(self.muted, reason, time.monotonic()))
+
+    def _publish_run_state(self, message):
+        """Publish whether monitoring is running"""
+        self._publish(events.RunStateChanged(self.running, message, time.monotonic()))
+
+    def _publish_error(self, error):
+        """Publish a monitoring error and the stopped state it caused"""
+        self._publish(events.ErrorOccurred(str(error), time.monotonic()))
+        self._publish_run_state(f"Error: {error}")
+
+    def _publish_level(self, energy):
+        """Publish the level of one analysis window"""
+        sampler = self.output_sampler
+        output_peak = sampler.latest.held_peak if sampler is not None else None
+        self._publish(
+            events.LevelUpdate(
+                energy,
+                self.effective_threshold,
+                output_peak,
+                time.monotonic(),
+                self.noise_tracker.floor,
+            )
+        )
 
-    def _update_gui_status(self, message):
-        """Update GUI status if available"""
-        if hasattr(self, "run_status_label") and self.run_status_label:
-            self.run_status_label.config(text=f"Status: {message}")
+    def _request_mute(self, should_mute, label="Auto"):
+        """
+        Change the mute state, through the dispatcher while it is running
+
+        With the dispatcher running this only enqueues the command, so it
+        never blocks the calling (audio) thread on the controller.
+
+        Args:
+            should_mute (bool): True to mute, False to unmute
+            label (str): Prefix for the log line
+        """
+        new_state = None
+        dispatcher = self.dispatcher
+        if dispatcher is not None and dispatcher.running:
+            dispatcher.request(should_mute)
+        else:
+            self.ready.wait(timeout=10.0)
+            new_state = self.metrics.call(
+                "controller", self.audio_controller.set_mute_state, should_mute
+            )
+
+        if should_mute != self.muted:
+            self.metrics.count("toggles")
+        self.muted = should_mute if new_state is None else new_state
+
+        status = "Muted" if self.muted else "Unmuted"
+        logger.info("%s: %s", label, status)
+        self._publish_mute(label)
+
+    def _on_mute_applied(self, requested, actual):
+        """Correct the mute state if the dispatcher could not apply a request"""
+        if actual is not None and actual != requested and self.muted == requested:
+            self.muted = actual
+            self._publish_mute("Controller")
+
+    def _on_external_mute_change(self, muted):
+        """Track a mute change reported by the controller's notifications"""
+        if muted == self.muted:
+            return
+        self.muted = muted
+        logger.info(
+            "Mute state changed externally: %s", "Muted" if muted else "Unmuted"
+        )
+        self._publish_mute("External")
 
     def toggle_mute(self):
         """Toggle mute status using audio controller"""
-        if self.running or True:  # Allow manual testing even when not running
-            # Use our audio controller
-            new_state = self.audio_controller.toggle_mute()
+        if self.dispatcher is not None and self.dispatcher.running:
+            # Serialize with the audio thread's commands
+            self._request_mute(not self.muted, "Toggled")
+            return
 
-            # If we got a specific state back, use it
-            if new_state is not None:
-                self.muted = new_state
-            else:
-                # Otherwise just toggle our internal state
-                self.muted = not self.muted
+        # Not monitoring, e.g. manual testing: use our audio controller
+        self.ready.wait(timeout=10.0)
+        new_state = self.metrics.call("controller", self.audio_controller.toggle_mute)
+        self.metrics.count("toggles")
+
+        # If we got a specific state back, use it
+        if new_state is not None:
+            self.muted = new_state
+        else:
+            # Otherwise just toggle our internal state
+            self.muted = not self.muted
 
-            # Print status update
-            status = "Muted" if self.muted else "Unmuted"
-            logger.error("Auto: %s", status)
+        # Print status update
+        status = "Muted" if self.muted else "Unmuted"
+        logger.info("Toggled: %s", status)
 
-            # Update GUI if it exists
-            if hasattr(self, "status_label") and self.status_label:
-                mute_text = "Muted" if self.muted else "Unmuted"
-                self.status_label.config(text=f"Current State: {mute_text}")
+        self._publish_mute("Toggled")
+
+    @property
+    def effective_threshold(self):
+        """
+        Energy that starts speech right now: energy_threshold, or the
+        adaptive threshold once the noise floor is known
+        """
+        if self.adaptive_threshold:
+            threshold = self.noise_tracker.threshold
+            if threshold is not None:
+                return threshold
+        return self.energy_threshold
+
+    @property
+    def noise_floor(self):
+        """Tracked background noise energy, None until known"""
+        return self.noise_tracker.floor
+
+    @property
+    def noise_margin_db(self):
+        """Adaptive threshold above the noise floor in dB"""
+        return self.noise_tracker.margin_db
+
+    @noise_margin_db.setter
+    def noise_margin_db(self, margin):
+        self.noise_tracker.margin_db = margin
+
+    @property
+    def release_threshold(self):
+        """Energy that keeps speech going, None for energy_threshold"""
+        return self.decision.release_threshold
+
+    @release_threshold.setter
+    def release_threshold(self, threshold):
+        self.decision.release_threshold = threshold
+
+    @property
+    def min_speech_duration(self):
+        """Seconds of speech before unmuting"""
+        return self.decision.min_speech_duration
+
+    @min_speech_duration.setter
+    def min_speech_duration(self, seconds):
+        self.decision.min_speech_duration = seconds
+
+    @property
+    def silence_timeout(self):
+        """Seconds of silence before muting"""
+        return self.decision.silence_timeout
+
+    @silence_timeout.setter
+    def silence_timeout(self, seconds):
+        self.decision.silence_timeout = seconds
+
+    @property
+    def last_sound_time(self):
+        """Time of the last frame that counted as sound"""
+        return self.decision.last_sound_time
+
+    @last_sound_time.setter
+    def last_sound_time(self, now):
+        self.decision.last_sound_time = now
+
+    @property
+    def metrics_enabled(self):
+        """Whether pipeline metrics are recorded, see metrics"""
+        return self.metrics.enabled
+
+    @metrics_enabled.setter
+    def metrics_enabled(self, enabled):
+        self.metrics.enabled = bool(enabled)
 
     def set_output_monitoring(self, enabled):
         """
@@ -205,39 +774,56 @@ class AudioMuter:
         Args:
             should_mute (bool): True to mute, False to unmute
         """
-        new_state = self.audio_controller.set_mute_state(should_mute)
-
-        if new_state is not None:
-            self.muted = new_state
-        else:
-            self.muted = should_mute
-
-        status = "Muted" if self.muted else "Unmuted"
-        logger.error("Manually set: %s", status)
-
-        # Update GUI if it exists
-        if hasattr(self, "status_label") and self.status_label:
-            mute_text = "Muted" if self.muted else "Unmuted"
-            self.status_label.config(text=f"Current State: {mute_text}")
+        self._request_mute(should_mute, "Manually set")
 
     def start(self):
         """Start monitoring and auto-muting"""
+        from auto_muter.dispatcher import MuteDispatcher
+        from auto_muter.output_meter import OutputLevelSampler
+
         if self.running:
             return
+        if not self.ready.wait(timeout=10.0):
+            logger.warning("Starting before audio backends finished initializing")
 
         # Always mute on startup regardless of current state
         self.set_mute_state(True)  # Force mute
         self.running = True
-        self.last_sound_time = time.time()
+        self.decision.reset(now=time.monotonic())
+
+        # Hand controller calls to a dedicated thread while monitoring
+        self.dispatcher = MuteDispatcher(
+            self._controller_factory,
+            on_result=self._on_mute_applied,
+            owns_controller=self._owns_controller,
+            metrics=self.metrics,
+        )
+        self.dispatcher.start()
+
+        # Sample the output level independently of when mic chunks arrive
+        per_session = bool(
+            self.output_include_processes or self.output_exclude_processes
+        )
+        self.output_sampler = OutputLevelSampler(
+            self._create_output_meter,
+            rate=self.output_sample_rate,
+            hold=self.output_hold,
+            owns_controller=self._owns_controller or per_session,
+        )
+        self.output_sampler.start()
 
         # Start audio monitoring in a separate thread
         self.audio_thread = threading.Thread(target=self._record_and_process_audio)
         self.audio_thread.daemon = True
         self.audio_thread.start()
 
-        # Update GUI if it exists
-        if hasattr(self, "run_status_label") and self.run_status_label:
-            self.run_status_label.config(text="Status: Running")
+        if self.metrics.enabled and self.metrics_interval:
+            self._metrics_reporter = SummaryReporter(
+                self.metrics, self.metrics_interval
+            )
+            self._metrics_reporter.start()
+
+        self._publish_run_state("Running")
 
         logger.info("Auto-Muter started!")
 
@@ -247,31 +833,41 @@ class AudioMuter:
             return
 
         self.running = False
+        source = self._active_source
+        if source is not None:
+            source.interrupt()
         if self.audio_thread and self.audio_thread.is_alive():
             self.audio_thread.join(timeout=1.0)
+        if self.output_sampler is not None:
+            self.output_sampler.stop()
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+        if self._metrics_reporter is not None:
+            self._metrics_reporter.stop()
+            self._metrics_reporter = None
 
         # Restore to initial mute state when stopping
         if self.initial_mute_state is not None:
-            logger.error(
+            logger.info(
                 "Restoring to initial mute state: %s",
                 "Muted" if self.initial_mute_state else "Unmuted",
             )
             self.set_mute_state(self.initial_mute_state)
 
-        # Update GUI if it exists
-        if hasattr(self, "run_status_label") and self.run_status_label:
-            self.run_status_label.config(text="Status: Stopped")
+        self._publish_run_state("Stopped")
 
         logger.info("Auto-Muter stopped!")
 
     def cleanup_before_exit(self):
         """Restore initial mute state before exiting the application"""
+        if self.device_watcher is not None:
+            self.device_watcher.stop()
         # Stop monitoring if still running
         if self.running:
             self.stop()
         elif self.initial_mute_state is not None:
             # If already stopped but need to restore mute state
-            logger.error(
+            logger.info(
                 "Restoring to initial mute state before exit: %s",
                 "Muted" if self.initial_mute_state else "Unmuted",
             )
@@ -0,0 +1,925 @@
+"""Benchmarks for the audio processing hot path and mute decisions."""
+
+import argparse
+import json
+import logging
+import platform
+import struct
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from auto_muter.audio_muter import AudioMuter
+from auto_muter.decision import MuteDecision
+from auto_muter.dispatcher import MuteDispatcher
+from auto_muter.dsp import (ChannelEnergy, FrameEnergy, Resampler, SpectralVad,
+                            TransientGate)
+from auto_muter.fusion import ChannelPolicy
+from auto_muter.simulation import SimulatedAudioController, SimulatedPyAudio
+from auto_muter.sources import MicrophoneSource, SyntheticSource
+from auto_muter.sweep import evaluate
+
+RATE = 16000
+CHUNK_SIZE = 1024
+
+# Time the spectral detector may take per chunk relative to the RMS path it
+# replaces. A ratio holds on any machine, unlike a share of a core; it
+# measures around 16, about 17 us per 64 ms chunk.
+VAD_MAX_COST_VS_RMS = 40
+
+# A desk session replayed to compare detectors: (kind, seconds, level, speech)
+VAD_SCENE = [
+    ("noise", 2.0, 50, False),
+    ("voice", 2.0, 1500, True),
+    ("clicks", 3.0, 3000, False),
+    ("noise", 1.0, 50, False),
+    ("rumble", 3.0, 3000, False),
+    ("voice", 1.5, 800, True),
+    ("noise", 2.0, 50, False),
+]
+
+# Typing between sentences: (kind, seconds, level)
+TYPING_SCENE = [
+    ("noise", 1.0, 50),
+    ("clicks", 3.0, 3000),
+    ("noise", 1.0, 50),
+    ("voice", 1.5, 1500),
+    ("noise", 1.5, 50),
+]
+
+# Modules the GUI should not wait for
+HEAVY_MODULES = ("numpy", "pyaudio", "comtypes", "pycaw")
+
+# Run in a fresh interpreter for each startup sample
+_STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import auto_muter.main
+result = {"import": time.perf_counter() - started}
+result["heavy"] = [name for name in sys.argv[1].split(",") if name in sys.modules]
+if sys.argv[2] == "window":
+    from auto_muter.audio_muter import AudioMuter
+    from auto_muter.gui import AutoMuterGUI
+    muter = AudioMuter(background_init=True)
+    muter.initialize_in_background()
+    gui = AutoMuterGUI(muter)
+    try:
+        gui.build_window()
+        gui.root.update()
+        result["window"] = time.perf_counter() - started
+        muter.ready.wait(30)
+        result["ready"] = time.perf_counter() - started
+        gui.root.destroy()
+    except Exception:  # No display to open a window on
+        pass
+print(json.dumps(result))
+"""
+
+
+def legacy_rms(data):
+    """Energy calculation used before FrameEnergy, kept as a baseline"""
+    fmt = f"{len(data)//2}h"
+    pcm_data = struct.unpack(fmt, data)
+    return np.sqrt(np.mean(np.array(pcm_data) ** 2))
+
+
+def make_chunks(count, chunk_size=CHUNK_SIZE, seed=0):
+    """
+    Generate random 16-bit PCM chunks
+
+    Args:
+        count (int): Number of chunks
+        chunk_size (int): Samples per chunk
+        seed (int): Seed for reproducible data
+
+    Returns:
+        list[bytes]: Raw PCM chunks as a stream would return them
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        rng.integers(-3000, 3000, chunk_size, dtype=np.int16).tobytes()
+        for _ in range(count)
+    ]
+
+
+def peak_bytes_per_chunk(func, chunks):
+    """
+    Measure the largest transient allocation made while processing one chunk
+
+    Args:
+        func (callable): Function called with each chunk
+        chunks (list[bytes]): Chunks to process
+
+    Returns:
+        int: Worst-case peak traced allocation in bytes for a single call
+    """
+    func(chunks[0])  # Warm up lazily created state
+    worst = 0
+    tracemalloc.start()
+    try:
+        for data in chunks:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func(data)
+            _, peak = tracemalloc.get_traced_memory()
+            worst = max(worst, peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return worst
+
+
+def cpu_per_audio_second(func, chunks, rate=RATE):
+    """
+    Measure CPU time spent per second of audio processed
+
+    Args:
+        func (callable): Function called with each chunk
+        chunks (list[bytes]): Chunks to process
+        rate (int): Sample rate the chunks represent
+
+    Returns:
+        float: CPU seconds per second of audio
+    """
+    start = time.process_time()
+    for data in chunks:
+        func(data)
+    elapsed = time.process_time() - start
+    audio_seconds = sum(len(data) // 2 for data in chunks) / rate
+    return elapsed / audio_seconds
+
+
+def bench_energy(count=2000, chunk_size=CHUNK_SIZE):
+    """
+    Compare the legacy struct-based energy path against FrameEnergy
+
+    Returns:
+        dict: Peak bytes per chunk and CPU per audio second for each path
+    """
+    chunks = make_chunks(count, chunk_size)
+    frame_energy = FrameEnergy(chunk_size)
+    paths = {"legacy": legacy_rms, "frame_energy": frame_energy.rms}
+    return {
+        name: {
+            "peak_bytes_per_chunk": peak_bytes_per_chunk(func, chunks[:200]),
+            "cpu_per_audio_second": cpu_per_audio_second(func, chunks),
+        }
+        for name, func in paths.items()
+    }
+
+
+def bench_channels(channel_counts=(1, 2, 4, 8, 16), count=500, repeat=3):
+    """
+    Cost of per-channel energy as the channel count grows
+
+    Each chunk is an interleaved (chunk, channels) view, measured with one
+    ChannelEnergy.rms call and reduced with the "max" ChannelPolicy.
+
+    Returns:
+        dict: Best CPU time per chunk and per channel in microseconds, keyed
+              by channel count
+    """
+    rng = np.random.default_rng(0)
+    policy = ChannelPolicy("max")
+    results = {}
+    for channels in channel_counts:
+        frames = rng.integers(
+            -3000, 3000, size=(count, CHUNK_SIZE, channels), dtype=np.int16
+        )
+        channel_energy = ChannelEnergy(CHUNK_SIZE, channels)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.process_time()
+            for chunk in frames:
+                policy.reduce(channel_energy.rms(chunk))
+            best = min(best, (time.process_time() - start) / count)
+        results[f"{channels}ch"] = {
+            "us_per_chunk": best * 1e6,
+            "us_per_channel": best * 1e6 / channels,
+        }
+    return results
+
+
+def bench_resampler(rates=(44100, 48000), chunk_duration=0.064, seconds=10):
+    """
+    Cost of resampling native-rate capture to the analysis rate
+
+    Returns:
+        dict: Best CPU time per chunk in microseconds and CPU seconds per
+              second of audio, keyed by native rate
+    """
+    results = {}
+    for rate in rates:
+        resampler = Resampler(rate, RATE)
+        chunk = resampler.period * max(
+            round(chunk_duration * rate / resampler.period), 1
+        )
+        rng = np.random.default_rng(0)
+        frames = rng.integers(-3000, 3000, size=int(rate * seconds), dtype=np.int16)
+        chunks = [frames[i : i + chunk] for i in range(0, len(frames) - chunk, chunk)]
+        start = time.process_time()
+        for data in chunks:
+            resampler.process(data)
+        elapsed = time.process_time() - start
+        results[str(rate)] = {
+            "us_per_chunk": elapsed / len(chunks) * 1e6,
+            "cpu_per_audio_second": elapsed / (len(chunks) * chunk / rate),
+        }
+    return results
+
+
+def bench_decision(hours=1.0, combinations=200):
+    """
+    Frame-by-frame versus vectorized mute decisions over precomputed energies
+
+    Returns:
+        dict: Seconds per pass over the energies of hours of audio for both
+              paths, parameter combinations per second in batch, and whether
+              both paths found the same transitions
+    """
+    rng = np.random.default_rng(0)
+    count = int(hours * 3600 * RATE / CHUNK_SIZE)
+    energies = rng.choice([50.0, 800.0, 3000.0], size=count, p=[0.6, 0.1, 0.3])
+    times = np.arange(count) * (CHUNK_SIZE / RATE)
+
+    decision = MuteDecision(1000, 600, 0.1, 0.5, clock=lambda: 0.0)
+    changes = []
+    start = time.process_time()
+    for index, (energy, now) in enumerate(zip(energies.tolist(), times.tolist())):
+        state = decision.update(energy, now)
+        if state is not None:
+            changes.append((index, state))
+    frame_by_frame = time.process_time() - start
+
+    decision = MuteDecision(1000, 600, 0.1, 0.5, clock=lambda: 0.0)
+    indices, states = decision.find_transitions(energies, times)
+    matches = changes == list(zip(indices.tolist(), states.tolist()))
+
+    thresholds = np.linspace(500, 2500, combinations)
+    start = time.process_time()
+    for threshold in thresholds:
+        decision = MuteDecision(threshold, 0.6 * threshold, 0.1, 0.5)
+        decision.reset(muted=True, now=0.0)
+        decision.find_transitions(energies, times)
+    batch = (time.process_time() - start) / combinations
+    return {
+        "frames": count,
+        "frame_by_frame_s": frame_by_frame,
+        "batch_s": batch,
+        "speedup": frame_by_frame / batch,
+        "combinations_per_s": 1 / batch,
+        "matches": matches,
+    }
+
+
+def vad_recording(repeats=10, chunk_size=CHUNK_SIZE):
+    """
+    Windows and speech labels of VAD_SCENE repeated
+
+    Returns:
+        tuple: (windows, times, speech) with one row of samples per window
+    """
+    segments = [segment[:3] for segment in VAD_SCENE] * repeats
+    samples = SyntheticSource(segments).samples
+    count = len(samples) // chunk_size
+    windows = samples[: count * chunk_size].reshape(count, chunk_size)
+    times = np.arange(1, count + 1) * (chunk_size / RATE)
+
+    labels = np.repeat(
+        [speech for *_, speech in VAD_SCENE] * repeats,
+        [round(seconds * RATE) for _, seconds, _, _ in VAD_SCENE] * repeats,
+    )
+    # A window is speech if most of it is
+    speech = labels[: count * chunk_size].reshape(count, chunk_size).mean(axis=1) > 0.5
+    return windows, times, speech
+
+
+def best_setting(energies, times, speech, silence_timeout=0.5, max_clipped=0.1):
+    """
+    Threshold that leaves the microphone open least without speech while
+    clipping little speech
+
+    Returns:
+        dict: The evaluate() result of the best threshold
+    """
+    recordings = [(energies, times, speech)]
+    results = [
+        evaluate(recordings, threshold, silence_timeout)
+        for threshold in np.geomspace(20, 20000, 60)
+    ]
+    usable = [
+        result for result in results if result["clipped_speech_rate"] <= max_clipped
+    ]
+    if usable:
+        return min(usable, key=lambda result: result["open_mic_rate"])
+    return min(results, key=lambda result: result["clipped_speech_rate"])
+
+
+def bench_vad(count=2000, repeat=3, repeats=10):
+    """
+    Broadband RMS versus the spectral detector, in CPU and accuracy
+
+    The CPU is the best time per 1024-sample chunk; the spectral detector's
+    cost relative to RMS is checked against VAD_MAX_COST_VS_RMS. For
+    accuracy, both detectors measure a replayed desk session of speech,
+    keystrokes, fan rumble and a quiet room, and the threshold sweep picks
+    each one's best setting.
+
+    Returns:
+        dict: Per detector the cost per chunk and the clipped speech, false
+              unmutes and toggles of its best threshold
+    """
+    rng = np.random.default_rng(0)
+    chunks = rng.integers(-3000, 3000, size=(count, CHUNK_SIZE), dtype=np.int16)
+    vad = SpectralVad(CHUNK_SIZE, RATE)
+    paths = {"rms": FrameEnergy(CHUNK_SIZE).rms_samples, "spectral": vad.energy}
+
+    windows, times, speech = vad_recording(repeats)
+    work = windows.astype(np.float64)
+    energies = {
+        "rms": np.sqrt(np.einsum("ij,ij->i", work, work) / CHUNK_SIZE),
+        "spectral": vad.score(windows),
+    }
+
+    results = {}
+    for name, func in paths.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.process_time()
+            for chunk in chunks:
+                func(chunk)
+            best = min(best, (time.process_time() - start) / count)
+        results[name] = {
+            "us_per_chunk": best * 1e6,
+            "cpu_per_audio_second": best * RATE / CHUNK_SIZE,
+            "best_setting": best_setting(energies[name], times, speech),
+        }
+    spectral = results["spectral"]
+    spectral["cost_vs_rms"] = spectral["us_per_chunk"] / results["rms"]["us_per_chunk"]
+    spectral["within_budget"] = spectral["cost_vs_rms"] <= VAD_MAX_COST_VS_RMS
+    return results
+
+
+def summarize(values, scale=1e3):
+    """
+    Reduce samples to p50/p99/mean, by default converting seconds to ms
+
+    Returns:
+        dict: p50, p99 and mean, or None values if there were no samples
+    """
+    if len(values) == 0:
+        return {"p50": None, "p99": None, "mean": None}
+    values = np.asarray(values, dtype=np.float64) * scale
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p99": float(np.percentile(values, 99)),
+        "mean": float(values.mean()),
+    }
+
+
+def speech_cycles(cycles, speech=0.5, silence=1.0, level=3000, noise=50):
+    """
+    Build alternating silence/speech segments for a SyntheticSource
+
+    Returns:
+        tuple: (segments, onsets, offsets) with speech start/end times in seconds
+    """
+    segments, onsets, offsets = [], [], []
+    position = 0.0
+    for _ in range(cycles):
+        segments += [("noise", silence, noise), ("tone", speech, level)]
+        onsets.append(position + silence)
+        offsets.append(position + silence + speech)
+        position += silence + speech
+    segments.append(("noise", silence, noise))
+    return segments, onsets, offsets
+
+
+def event_latencies(events, transitions, muted, offset=0.0):
+    """
+    Time from each event to the first following transition into a state
+
+    Args:
+        events (list[float]): Event times
+        transitions (list[tuple[float, bool]]): (time, muted) transitions
+        muted (bool): Transition state to look for
+        offset (float): Subtracted from every latency, e.g. silence_timeout
+
+    Returns:
+        list[float]: Latency per event that was followed by a transition
+    """
+    times = [t for t, state in transitions if state == muted]
+    latencies = []
+    for event in events:
+        following = [t for t in times if t >= event]
+        if following:
+            latencies.append(following[0] - event - offset)
+    return latencies
+
+
+def make_muter(controller, energy_threshold=1000, silence_timeout=0.5):
+    """Create an AudioMuter on a simulated controller with fixed settings"""
+    muter = AudioMuter(audio_controller=controller)
+    muter.output_monitoring_enabled = False
+    muter.energy_threshold = energy_threshold
+    muter.silence_timeout = silence_timeout
+    return muter
+
+
+class _TimedSource:
+    """Wraps a source and records when each chunk is requested"""
+
+    def __init__(self, source):
+        self.source = source
+        self.read_times = []
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def read(self):
+        """Read from the wrapped source, noting the time"""
+        self.read_times.append(time.perf_counter())
+        return self.source.read()
+
+
+def bench_transients(count=500, repeat=3, repeats=5):
+    """
+    Cost and effect of the keystroke filter
+
+    The cost is the best time per 1024-sample chunk of quiet room, speech
+    and typing, against the RMS energy of the same chunk. The effect is a
+    replay of typing between sentences with the filter off and on, at a
+    threshold the keystrokes cross.
+
+    Returns:
+        dict: Microseconds per chunk by content, unmutes while typing and
+              onset-to-unmute latency with the filter off and on
+    """
+    rms = FrameEnergy(CHUNK_SIZE).rms_samples
+    results = {}
+    for name, kind, level in (
+        ("quiet", "noise", 50),
+        ("speech", "voice", 1500),
+        ("typing", "clicks", 3000),
+    ):
+        seconds = count * CHUNK_SIZE / RATE
+        samples = SyntheticSource([("noise", 1.0, 50), (kind, seconds, level)]).samples
+        chunks = samples[RATE:][: count * CHUNK_SIZE].reshape(count, CHUNK_SIZE)
+        costs = {}
+        for path in ("gate", "rms"):
+            best = float("inf")
+            for _ in range(repeat):
+                gate = TransientGate(RATE)
+                gate.process(samples[:RATE])  # Learn the background first
+                func = gate.process if path == "gate" else rms
+                start = time.process_time()
+                for chunk in chunks:
+                    func(chunk)
+                best = min(best, (time.process_time() - start) / count)
+            costs[path] = best * 1e6
+        results[f"{name}_us_per_chunk"] = costs["gate"]
+        results[f"{name}_cost_vs_rms"] = costs["gate"] / costs["rms"]
+
+    segments = TYPING_SCENE * repeats
+    starts = np.cumsum([0.0] + [seconds for _, seconds, _ in segments])
+    typing = [
+        (starts[i], starts[i + 1]) for i, s in enumerate(segments) if s[0] == "clicks"
+    ]
+    onsets = [starts[i] for i, s in enumerate(segments) if s[0] == "voice"]
+    for enabled in (False, True):
+        muter = make_muter(SimulatedAudioController(muted=True), energy_threshold=300)
+        muter.transient_rejection = enabled
+        transitions = muter.replay(SyntheticSource(segments))
+        label = "on" if enabled else "off"
+        results[f"typing_unmutes_{label}"] = sum(
+            1
+            for t, muted in transitions
+            if not muted and any(begin <= t < end for begin, end in typing)
+        )
+        results[f"onset_to_unmute_ms_{label}"] = summarize(
+            event_latencies(onsets, transitions, False)
+        )
+    return results
+
+
+def bench_pipeline(seconds=120, silence_timeout=0.5):
+    """
+    Replay synthetic speech through AudioMuter as fast as possible
+
+    Returns:
+        dict: Per-chunk processing time, CPU per audio second, and
+              onset-to-unmute / silence-to-mute latency on the audio timeline
+              (the latter beyond silence_timeout)
+    """
+    segments, onsets, offsets = speech_cycles(max(1, int(seconds / 1.5)))
+    source = _TimedSource(SyntheticSource(segments))
+    muter = make_muter(
+        SimulatedAudioController(muted=True), silence_timeout=silence_timeout
+    )
+
+    cpu_start = time.process_time()
+    transitions = muter.replay(source)
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "chunk_ms": summarize(np.diff(source.read_times)),
+        "cpu_per_audio_second": cpu / source.duration,
+        "onset_to_unmute_ms": summarize(event_latencies(onsets, transitions, False)),
+        "silence_to_mute_ms": summarize(
+            event_latencies(offsets, transitions, True, silence_timeout)
+        ),
+    }
+
+
+def bench_metrics(seconds=60, repeat=3):
+    """
+    Cost of pipeline metrics, replaying the same audio with them off and on
+
+    Returns:
+        dict: Best CPU time per chunk in microseconds with metrics disabled
+              and enabled, the overhead per chunk and in percent, and the
+              stage summaries recorded while enabled
+    """
+    segments, _, _ = speech_cycles(max(1, int(seconds / 1.5)))
+    cpu = {}
+    for enabled in (False, True):
+        best = float("inf")
+        for _ in range(repeat):
+            source = SyntheticSource(segments)
+            muter = make_muter(SimulatedAudioController(muted=True))
+            muter.metrics_enabled = enabled
+            cpu_start = time.process_time()
+            muter.replay(source)
+            chunks = len(source.samples) // source.chunk_size
+            best = min(best, (time.process_time() - cpu_start) / chunks)
+        cpu[enabled] = best * 1e6
+    return {
+        "disabled_us_per_chunk": cpu[False],
+        "enabled_us_per_chunk": cpu[True],
+        "overhead_us_per_chunk": cpu[True] - cpu[False],
+        "overhead_percent": (cpu[True] - cpu[False]) / cpu[False] * 100,
+        "stages": muter.metrics.snapshot()["stages"],
+    }
+
+
+def bench_live_latency(capture_mode, cycles=4, silence_timeout=0.5):
+    """
+    Wall-clock decision latency with a simulated real-time input stream
+
+    Returns:
+        dict: onset-to-unmute and silence-to-mute (beyond silence_timeout)
+              latency, measured from when the audio was captured to when the
+              controller received the command
+    """
+    segments, onsets, offsets = speech_cycles(cycles)
+    signal = SyntheticSource(segments)
+    host = SimulatedPyAudio(signal.samples)
+    controller = SimulatedAudioController()
+    muter = make_muter(controller, silence_timeout=silence_timeout)
+    muter.source = MicrophoneSource(
+        capture_mode=capture_mode, host=lambda: host, chunk_size=signal.chunk_size
+    )
+
+    muter.start()
+    time.sleep(signal.duration)
+    muter.stop()
+
+    started_at = host.streams[0].started_at
+    transitions = [(t - started_at, muted) for t, muted in controller.history[1:]]
+    return {
+        "onset_to_unmute_ms": summarize(event_latencies(onsets, transitions, False)),
+        "silence_to_mute_ms": summarize(
+            event_latencies(offsets, transitions, True, silence_timeout)
+        ),
+    }
+
+
+def bench_controller(count=200, latency=0.001):
+    """
+    Cost of a mute command issued by AudioMuter through a simulated controller
+
+    Returns:
+        dict: Per-command time for set_mute_state and toggle_mute called
+              synchronously, the caller's cost of a dispatched command, and
+              the dispatcher's own stats
+    """
+    muter = make_muter(SimulatedAudioController(latency=latency))
+    results = {}
+    for name, command in (
+        ("set_mute_state_ms", lambda i: muter.set_mute_state(i % 2 == 0)),
+        ("toggle_mute_ms", lambda i: muter.toggle_mute()),
+    ):
+        durations = []
+        for i in range(count):
+            start = time.perf_counter()
+            command(i)
+            durations.append(time.perf_counter() - start)
+        results[name] = summarize(durations)
+
+    # The same commands issued while monitoring only enqueue to the dispatcher
+    dispatcher = MuteDispatcher(lambda: muter.audio_controller)
+    dispatcher.start()
+    muter.dispatcher = dispatcher
+    durations = []
+    for i in range(count):
+        start = time.perf_counter()
+        muter.set_mute_state(i % 2 == 0)
+        durations.append(time.perf_counter() - start)
+        # Give the command time to complete so every one is applied
+        time.sleep(latency * 2)
+    dispatcher.stop()
+    results["dispatched_request_ms"] = summarize(durations)
+    results["dispatcher"] = dispatcher.stats()
+    results["simulated_latency_ms"] = latency * 1e3
+    return results
+
+
+# Runs AutoMuter idle on simulated audio in a fresh interpreter
+_FOOTPRINT_SCRIPT = """
+import json, sys, threading, time
+import psutil
+from auto_muter.audio_muter import AudioMuter
+from auto_muter.simulation import SimulatedAudioController
+from auto_muter.sources import SyntheticSource
+mode, seconds = sys.argv[1], float(sys.argv[2])
+source = SyntheticSource([("noise", seconds + 5, 50)], realtime=True)
+muter = AudioMuter(SimulatedAudioController(), source=source)
+if mode == "headless":
+    from auto_muter.daemon import run_daemon
+    stop = threading.Event()
+    threading.Timer(seconds, stop.set).start()
+    started = time.process_time()
+    run_daemon({}, muter, stop)
+else:
+    from auto_muter.gui import AutoMuterGUI
+    gui = AutoMuterGUI(muter)
+    try:
+        gui.build_window()
+    except Exception:  # No display to open a window on
+        print(json.dumps(None))
+        sys.exit()
+    muter.start()
+    gui.root.after(int(seconds * 1000), gui.root.quit)
+    started = time.process_time()
+    gui.root.mainloop()
+    muter.cleanup_before_exit()
+print(json.dumps({
+    "rss": psutil.Process().memory_info().rss,
+    "cpu": (time.process_time() - started) / seconds,
+    "tkinter": "tkinter" in sys.modules,
+}))
+"""
+
+
+def bench_footprint(seconds=5.0):
+    """
+    Compare resident memory and idle CPU of headless and GUI mode
+
+    Each mode runs in a fresh interpreter, monitoring quiet simulated audio
+    in real time with a simulated controller.
+
+    Args:
+        seconds (float): How long each mode runs
+
+    Returns:
+        dict: rss_mb and idle_cpu_percent (of one core) per mode, None for
+              the GUI without a display, and whether headless mode imported
+              tkinter (0 or 1)
+    """
+    results = {}
+    tkinter_loaded = None
+    for mode in ("headless", "gui"):
+        completed = subprocess.run(
+            [sys.executable, "-c", _FOOTPRINT_SCRIPT, mode, str(seconds)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        if result is None:
+            results[mode] = {"rss_mb": None, "idle_cpu_percent": None}
+            continue
+        results[mode] = {
+            "rss_mb": result["rss"] / 2**20,
+            "idle_cpu_percent": result["cpu"] * 100,
+        }
+        if mode == "headless":
+            tkinter_loaded = int(result["tkinter"])
+    results["headless_imports_tkinter"] = tkinter_loaded
+    return results
+
+
+def bench_startup(repeat=5, window=True):
+    """
+    Measure cold start in fresh interpreters
+
+    Args:
+        repeat (int): Interpreters to start
+        window (bool): Also open the GUI, skipped without a display
+
+    Returns:
+        dict: import_ms to import auto_muter.main, first_window_ms until the
+              window is drawn, backends_ready_ms until devices and the
+              controller are ready, and how many of HEAVY_MODULES the import
+              loaded eagerly
+    """
+    samples = {"import": [], "window": [], "ready": []}
+    heavy = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _STARTUP_SCRIPT,
+                ",".join(HEAVY_MODULES),
+                "window" if window else "import",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        heavy.update(result.pop("heavy"))
+        for name, value in result.items():
+            samples[name].append(value)
+    return {
+        "import_ms": summarize(samples["import"]),
+        "first_window_ms": summarize(samples["window"]),
+        "backends_ready_ms": summarize(samples["ready"]),
+        "eager_heavy_modules": len(heavy),
+    }
+
+
+def run_suite(chunks=2000, seconds=120, live=True):
+    """
+    Run every benchmark
+
+    Args:
+        chunks (int): Chunks for the energy micro-benchmark
+        seconds (int): Seconds of synthetic audio replayed through the pipeline
+        live (bool): Include the real-time capture latency benchmarks, which
+                     take a few seconds each
+
+    Returns:
+        dict: Results keyed by benchmark name
+    """
+    results = {
+        "energy": bench_energy(chunks),
+        "channels": bench_channels(count=chunks // 4),
+        "resampler": bench_resampler(),
+        "decision": bench_decision(),
+        "vad": bench_vad(chunks),
+        "transients": bench_transients(chunks // 4),
+        "pipeline": bench_pipeline(seconds),
+        "metrics": bench_metrics(seconds / 2),
+        "controller": bench_controller(),
+        "startup": bench_startup(window=live),
+    }
+    if live:
+        results["footprint"] = bench_footprint()
+        for mode in ("callback", "blocking"):
+            results[f"live_{mode}"] = bench_live_latency(mode)
+    return results
+
+
+def flatten(results, prefix=""):
+    """Flatten nested results into {"a.b.c": value}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def save_results(results, output_dir):
+    """
+    Save results with run metadata as a timestamped JSON file
+
+    Returns:
+        Path: File written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = output_dir / f"benchmark-{stamp}.json"
+    payload = {
+        "timestamp": stamp,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def check_budgets(results):
+    """
+    Check the relative CPU costs the benchmarks exist to keep in line
+
+    Timings of small workloads are too noisy for unit tests, so these are
+    checked on full benchmark runs instead.
+
+    Args:
+        results (dict): Output of run_suite(), possibly partial
+
+    Returns:
+        list[str]: One line per broken budget
+    """
+    checks = [
+        (
+            "energy",
+            "frame energy uses less CPU than the legacy RMS",
+            lambda energy: energy["frame_energy"]["cpu_per_audio_second"]
+            < energy["legacy"]["cpu_per_audio_second"],
+        ),
+        (
+            "decision",
+            "batch decisions are faster than frame by frame",
+            lambda decision: decision["batch_s"] < decision["frame_by_frame_s"],
+        ),
+        (
+            "vad",
+            f"spectral detector costs at most {VAD_MAX_COST_VS_RMS}x RMS",
+            lambda vad: vad["spectral"]["within_budget"],
+        ),
+    ]
+    return [
+        f"Over budget: {description}"
+        for name, description, check in checks
+        if name in results and not check(results[name])
+    ]
+
+
+def compare_results(current, previous=None):
+    """
+    Describe how each metric changed relative to a previous run, and which
+    CPU budgets the current run breaks
+
+    Returns:
+        list[str]: One line per broken budget, then one per metric present
+                   in both runs
+    """
+    lines = check_budgets(current)
+    old = flatten(previous or {})
+    for name, value in flatten(current).items():
+        before = old.get(name)
+        if value is None or before is None:
+            continue
+        change = (value - before) / before * 100 if before else 0.0
+        lines.append(f"{name:<50} {before:>12.4f} -> {value:>12.4f} ({change:+.1f}%)")
+    return lines
+
+
+def main():
+    """Run the benchmark suite, save the results and compare to the last run"""
+    parser = argparse.ArgumentParser(description="Benchmark the AutoMuter hot path.")
+    parser.add_argument(
+        "--chunks", type=int, default=2000, help="Number of chunks to process"
+    )
+    parser.add_argument(
+        "--seconds", type=int, default=120, help="Seconds of audio to replay"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Skip the real-time latency benchmarks"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="benchmark_results",
+        help="Directory the JSON results are written to",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Results file to compare against (default: latest in --output-dir)",
+    )
+    args = parser.parse_args()
+
+    baseline = args.compare
+    if baseline is None:
+        previous = sorted(Path(args.output_dir).glob("benchmark-*.json"))
+        baseline = previous[-1] if previous else None
+
+    # Keep log output (and its cost) out of the measurements
+    logging.disable(logging.CRITICAL)
+    results = run_suite(args.chunks, args.seconds, live=not args.quick)
+    logging.disable(logging.NOTSET)
+
+    for name, value in flatten(results).items():
+        print(f"{name:<50} {value}")
+    print(f"Saved results to {save_results(results, args.output_dir)}")
+
+    previous = None
+    print()
+    if baseline is not None:
+        previous = json.loads(Path(baseline).read_text(encoding="utf-8"))["results"]
+        print(f"Compared to {baseline}:")
+    for line in compare_results(results, previous):
+        print(line)
+    # A non-zero exit status lets CI fail a run that breaks a budget
+    return 1 if check_budgets(results) else 0
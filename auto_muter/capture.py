@@ -0,0 +1,193 @@
+"""Capture engines that deliver microphone chunks to the decision loop."""
+
+import collections
+import logging
+import threading
+
+import pyaudio
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("callback", "blocking")
+
+
+class FrameHandoff:
+    """Bounded hand-off of audio chunks from the capture callback to a consumer"""
+
+    def __init__(self, capacity=8):
+        """
+        Initialize the hand-off
+
+        Args:
+            capacity (int): Chunks kept before the oldest one is dropped
+        """
+        self._frames = collections.deque(maxlen=capacity)
+        self._ready = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def __len__(self):
+        """Number of chunks waiting"""
+        return len(self._frames)
+
+    def put(self, data):
+        """Queue a chunk without blocking, dropping the oldest one if full"""
+        with self._ready:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(data)
+            self._ready.notify()
+
+    def get(self, timeout=None):
+        """
+        Wait for the next chunk
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            bytes or None: Next chunk, or None on timeout or once closed
+        """
+        with self._ready:
+            if not self._frames and not self._closed:
+                self._ready.wait(timeout)
+            if self._frames:
+                return self._frames.popleft()
+            return None
+
+    def close(self):
+        """Wake up any waiting consumer and stop blocking on get()"""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+
+class BlockingCapture:
+    """Reads chunks synchronously with stream.read() on the caller's thread"""
+
+    def __init__(self, pa, chunk_size, **stream_kwargs):
+        """
+        Initialize the capture
+
+        Args:
+            pa (pyaudio.PyAudio): Host used to open the stream
+            chunk_size (int): Frames per read
+            stream_kwargs: Extra arguments passed to pa.open()
+        """
+        self.pa = pa
+        self.chunk_size = chunk_size
+        self.stream_kwargs = stream_kwargs
+        self.stream = None
+
+    def start(self):
+        """Open the input stream"""
+        self.stream = self.pa.open(
+            input=True, frames_per_buffer=self.chunk_size, **self.stream_kwargs
+        )
+
+    def read(self, timeout=None):
+        """Block until the next chunk has been captured and return it"""
+        del timeout  # stream.read() cannot give up early
+        return self.stream.read(self.chunk_size, exception_on_overflow=False)
+
+    @property
+    def backlog(self):
+        """Captured chunks waiting to be read"""
+        return self.stream.get_read_available() // self.chunk_size
+
+    def interrupt(self):
+        """Blocking reads return on their own once the chunk is filled"""
+
+    def stop(self):
+        """Stop and close the input stream"""
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+
+class CallbackCapture(BlockingCapture):
+    """Receives chunks from PortAudio's callback thread through a FrameHandoff"""
+
+    def __init__(self, pa, chunk_size, capacity=8, **stream_kwargs):
+        """
+        Initialize the capture
+
+        Args:
+            pa (pyaudio.PyAudio): Host used to open the stream
+            chunk_size (int): Frames per callback
+            capacity (int): Chunks buffered for a slow consumer
+            stream_kwargs: Extra arguments passed to pa.open()
+        """
+        super().__init__(pa, chunk_size, **stream_kwargs)
+        self.handoff = FrameHandoff(capacity)
+        self.overflows = 0
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PortAudio stream callback, only hands the chunk over"""
+        del frame_count, time_info  # Unused, part of the callback signature
+        if status & pyaudio.paInputOverflow:
+            self.overflows += 1
+        self.handoff.put(in_data)
+        return (None, pyaudio.paContinue)
+
+    def start(self):
+        """Open the input stream in callback mode"""
+        self.stream = self.pa.open(
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._callback,
+            **self.stream_kwargs,
+        )
+
+    def read(self, timeout=1.0):
+        """
+        Wait for the next chunk delivered by the callback
+
+        Args:
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            bytes or None: Next chunk, or None if interrupted or timed out
+        """
+        return self.handoff.get(timeout)
+
+    @property
+    def backlog(self):
+        """Captured chunks waiting to be read"""
+        return len(self.handoff)
+
+    def interrupt(self):
+        """Wake up a consumer waiting in read()"""
+        self.handoff.close()
+
+    def stop(self):
+        """Stop the stream and release any waiting consumer"""
+        self.handoff.close()
+        if self.handoff.dropped or self.overflows:
+            logger.warning(
+                "Capture dropped %d chunks, %d input overflows",
+                self.handoff.dropped,
+                self.overflows,
+            )
+        super().stop()
+
+
+def create_capture(mode, pa, chunk_size, **stream_kwargs):
+    """
+    Create a capture engine for the given mode
+
+    Args:
+        mode (str): One of CAPTURE_MODES
+        pa (pyaudio.PyAudio): Host used to open the stream
+        chunk_size (int): Frames per chunk
+        stream_kwargs: Extra arguments passed to pa.open()
+
+    Returns:
+        BlockingCapture: Capture engine, not yet started
+    """
+    if mode == "callback":
+        return CallbackCapture(pa, chunk_size, **stream_kwargs)
+    if mode == "blocking":
+        return BlockingCapture(pa, chunk_size, **stream_kwargs)
+    raise ValueError(f"Unknown capture mode: {mode}")
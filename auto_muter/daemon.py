@@ -0,0 +1,202 @@
+"""Headless entry point that runs AutoMuter from a config file without a GUI."""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+import toml
+
+from auto_muter.audio_muter import AudioMuter
+from auto_muter.logger import setup_logger
+
+logger = logging.getLogger(__name__)
+
+# Settings accepted in the [auto_muter] table of the config file, and the
+# AudioMuter attribute each one sets
+CONFIG_ATTRIBUTES = {
+    "input_device": "input_device",
+    "input_devices": "input_devices",
+    "fusion_rule": "fusion_rule",
+    "fusion_weights": "fusion_weights",
+    "channels": "channels",
+    "channel_policy": "channel_policy",
+    "channel_select": "channel_select",
+    "energy_threshold": "energy_threshold",
+    "adaptive_threshold": "adaptive_threshold",
+    "noise_margin_db": "noise_margin_db",
+    "detector": "detector",
+    "transient_rejection": "transient_rejection",
+    "max_transient_duration": "max_transient_duration",
+    "release_threshold": "release_threshold",
+    "min_speech_duration": "min_speech_duration",
+    "silence_timeout": "silence_timeout",
+    "output_monitoring": "output_monitoring_enabled",
+    "capture_mode": "capture_mode",
+    "chunk_duration": "chunk_duration",
+    "chunk_size": "chunk_size",
+    "output_include_processes": "output_include_processes",
+    "output_exclude_processes": "output_exclude_processes",
+    "metrics": "metrics_enabled",
+    "metrics_interval": "metrics_interval",
+}
+
+# Seconds between checks for a stop request. Waiting without a timeout would
+# keep Ctrl+C from being delivered on Windows.
+POLL_INTERVAL = 1.0
+
+
+def default_config_path():
+    """
+    Config file next to the logs directory
+
+    Returns:
+        str or None: %LOCALAPPDATA%\\AutoMuter\\config.toml, or None if
+                     LOCALAPPDATA is not set
+    """
+    local_appdata = os.getenv("LOCALAPPDATA")
+    if not local_appdata:
+        return None
+    return os.path.join(local_appdata, "AutoMuter", "config.toml")
+
+
+def load_config(path=None):
+    """
+    Read the [auto_muter] table of a TOML config file
+
+    Args:
+        path (str): Config file, default_config_path() by default. A missing
+                    default file means all settings keep their defaults.
+
+    Returns:
+        dict: Settings found in the file
+
+    Raises:
+        ValueError: If the file contains an unknown setting
+    """
+    if path is None:
+        path = default_config_path()
+        if path is None or not os.path.exists(path):
+            return {}
+
+    config = toml.load(path).get("auto_muter", {})
+    unknown = sorted(set(config) - set(CONFIG_ATTRIBUTES))
+    if unknown:
+        raise ValueError(f"{path}: unknown settings: {', '.join(unknown)}")
+    return config
+
+
+def apply_config(audio_muter, config):
+    """
+    Set AudioMuter attributes from config settings
+
+    Args:
+        audio_muter (AudioMuter): Instance to configure
+        config (dict): Settings from load_config()
+    """
+    for key, value in config.items():
+        setattr(audio_muter, CONFIG_ATTRIBUTES[key], value)
+
+    audio_muter.input_device = resolve_device(
+        audio_muter, config.get("input_device", audio_muter.input_device)
+    )
+    if audio_muter.input_devices:
+        audio_muter.input_devices = [
+            resolve_device(audio_muter, device) for device in audio_muter.input_devices
+        ]
+
+
+def resolve_device(audio_muter, device):
+    """
+    Accept a device name as well as a PyAudio index
+
+    Args:
+        audio_muter (AudioMuter): Instance whose devices are searched
+        device (str or int): Name or index
+
+    Returns:
+        str: Device id, "default" if the device is not found
+    """
+    device = str(device)
+    for candidate in audio_muter.devices:
+        if device in (candidate["name"], candidate["id"]):
+            return candidate["id"]
+    logger.warning("Input device %s not found, using default", device)
+    return "default"
+
+
+def install_signal_handlers(stop_event):
+    """Set stop_event on SIGINT, SIGTERM and, on Windows, SIGBREAK"""
+
+    def request_stop(signum, frame):
+        del frame
+        logger.info("Received signal %s, shutting down", signum)
+        stop_event.set()
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), request_stop)
+
+
+def run_daemon(config, audio_muter=None, stop_event=None):
+    """
+    Run AutoMuter until stop_event is set or monitoring fails
+
+    Args:
+        config (dict): Settings from load_config()
+        audio_muter (AudioMuter): Instance to run, a new one by default
+        stop_event (threading.Event): Set to shut down
+
+    Returns:
+        int: 0 after a requested shutdown, 1 if monitoring stopped by itself
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    if audio_muter is None:
+        audio_muter = AudioMuter()
+
+    exit_code = 0
+    try:
+        apply_config(audio_muter, config)
+        audio_muter.start()
+        while not stop_event.wait(POLL_INTERVAL):
+            if not audio_muter.running:
+                logger.error("Auto-Muter stopped unexpectedly")
+                exit_code = 1
+                break
+    finally:
+        audio_muter.cleanup_before_exit()
+    return exit_code
+
+
+def main():
+    """Headless entrypoint for the application."""
+    parser = argparse.ArgumentParser(description="Run AutoMuter without a GUI.")
+    parser.add_argument(
+        "--config",
+        help="TOML config file (default: %%LOCALAPPDATA%%\\AutoMuter\\config.toml)",
+    )
+    args = parser.parse_args()
+
+    setup_logger()
+    logger.info("Starting Auto Muter in headless mode")
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        logger.error("Could not load config: %s", e)
+        return 2
+
+    stop_event = threading.Event()
+    install_signal_handlers(stop_event)
+    try:
+        return run_daemon(config, stop_event=stop_event)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("Error in headless application: %s", e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
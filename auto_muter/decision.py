@@ -0,0 +1,232 @@
+"""Mute decision state machine, free of audio I/O and controller calls."""
+
+import time
+
+
+class MuteDecision:
+    """
+    Decides when to mute and unmute from a stream of frame energies
+
+    - Speech starts when the energy rises above attack_threshold and
+      continues while it stays above release_threshold, so a level hovering
+      around one threshold does not flap.
+    - A muted microphone is unmuted once speech has lasted
+      min_speech_duration seconds, which ignores short clicks.
+    - An unmuted microphone is muted once nothing above release_threshold
+      has been heard for silence_timeout seconds (the hangover).
+    - Output playing counts as speech of any length.
+
+    Time only comes from the now arguments or the injected clock, so the
+    machine is deterministic for recorded audio. find_transitions() runs
+    the same machine over whole arrays at once.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        attack_threshold=1000,
+        release_threshold=None,
+        min_speech_duration=0.0,
+        silence_timeout=1.0,
+        muted=True,
+        clock=time.monotonic,
+    ):
+        """
+        Initialize the machine
+
+        Args:
+            attack_threshold (float): Energy that starts speech
+            release_threshold (float): Energy that keeps speech going,
+                                       attack_threshold by default
+            min_speech_duration (float): Seconds of speech before unmuting
+            silence_timeout (float): Seconds of silence before muting
+            muted (bool): Initial state
+            clock (callable): Monotonic clock used when no time is given
+        """
+        self.attack_threshold = attack_threshold
+        self.release_threshold = release_threshold
+        self.min_speech_duration = min_speech_duration
+        self.silence_timeout = silence_timeout
+        self.clock = clock
+        self.muted = muted
+        self.last_sound_time = clock()
+        self.speech_start = None
+
+    @property
+    def release_level(self):
+        """Energy that keeps speech going"""
+        if self.release_threshold is None:
+            return self.attack_threshold
+        return min(self.release_threshold, self.attack_threshold)
+
+    def reset(self, muted=None, now=None):
+        """
+        Forget the speech and silence timers
+
+        Args:
+            muted (bool): New state, unchanged by default
+            now (float): Current time, read from the clock by default
+        """
+        if muted is not None:
+            self.muted = muted
+        self.last_sound_time = self.clock() if now is None else now
+        self.speech_start = None
+
+    def update(self, energy, now=None, playing=False):
+        """
+        Advance the machine by one frame
+
+        Args:
+            energy (float): Energy of the frame
+            now (float): Time of the frame, read from the clock by default
+            playing (bool): Whether output audio is playing
+
+        Returns:
+            bool or None: The new mute state if it changed, else None
+        """
+        if now is None:
+            now = self.clock()
+        if playing or energy > self.release_level:
+            self.last_sound_time = now
+            if self.speech_start is None and (
+                playing or energy > self.attack_threshold
+            ):
+                self.speech_start = now
+        else:
+            self.speech_start = None
+
+        if self.muted:
+            if self.speech_start is not None and (
+                playing or now - self.speech_start >= self.min_speech_duration
+            ):
+                self.muted = False
+                return False
+        elif now - self.last_sound_time > self.silence_timeout:
+            self.muted = True
+            return True
+        return None
+
+    def find_transitions(self, energies, times, playing=None):
+        """
+        Run the machine over arrays of frames, see find_transitions()
+
+        Starts from the current state and leaves the machine in the state
+        after the last frame, as if update() had been called for each.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Frame indices where the
+                                                 state changed and the new
+                                                 mute state at each
+        """
+        indices, states, final = find_transitions(
+            energies,
+            times,
+            self.attack_threshold,
+            self.release_level,
+            self.min_speech_duration,
+            self.silence_timeout,
+            playing=playing,
+            muted=self.muted,
+            last_sound_time=self.last_sound_time,
+            speech_start=self.speech_start,
+        )
+        self.muted, self.last_sound_time, self.speech_start = final
+        return indices, states
+
+
+def find_transitions(  # pylint: disable=too-many-arguments,too-many-locals
+    energies,
+    times,
+    attack_threshold,
+    release_threshold=None,
+    min_speech_duration=0.0,
+    silence_timeout=1.0,
+    playing=None,
+    muted=True,
+    last_sound_time=None,
+    speech_start=None,
+):
+    """
+    Vectorized MuteDecision over whole arrays of frames
+
+    Whether a frame is ready to unmute (speech long enough) or ready to mute
+    (silence long enough) does not depend on the state, only on the frames
+    before it, so both are computed for every frame with prefix scans. The
+    state after a frame is then the readiness of the last ready frame, and
+    the transitions are where it changes. The cost is a few passes over the
+    arrays, independent of how often the state changes.
+
+    Args:
+        energies (numpy.ndarray): Energy per frame
+        times (numpy.ndarray): Increasing time per frame in seconds
+        attack_threshold (float): See MuteDecision
+        release_threshold (float): See MuteDecision
+        min_speech_duration (float): See MuteDecision
+        silence_timeout (float): See MuteDecision
+        playing (numpy.ndarray): Optional boolean output playing per frame
+        muted (bool): State before the first frame
+        last_sound_time (float): Time of the last sound before the first
+                                 frame, the first frame's time by default
+        speech_start (float): Start of speech still going on before the
+                              first frame, None if there is none
+
+    Returns:
+        tuple: Frame indices where the state changed, the new mute state at
+               each, and (muted, last_sound_time, speech_start) after the
+               last frame
+    """
+    # Imported here so the per-frame machine can be used before numpy loads
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    energies = np.asarray(energies, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    count = len(energies)
+    if count == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, np.empty(0, dtype=bool), (muted, last_sound_time, speech_start)
+    if release_threshold is None:
+        release_threshold = attack_threshold
+    if last_sound_time is None:
+        last_sound_time = times[0]
+    index = np.arange(count)
+
+    speech = energies > attack_threshold
+    sound = energies > min(release_threshold, attack_threshold)
+    if playing is not None:
+        playing = np.asarray(playing, dtype=bool)
+        speech |= playing
+        sound |= playing
+
+    # Speech runs are stretches of consecutive sound frames; run 0 is the
+    # one already going on before the first frame, if any
+    run = np.cumsum(~sound)
+    speech_index = np.flatnonzero(speech)
+    first = np.ones(len(speech_index), dtype=bool)
+    first[1:] = run[speech_index[1:]] != run[speech_index[:-1]]
+    onsets = np.full(count, -1)
+    onsets[speech_index[first]] = speech_index[first]
+    onsets = np.maximum.accumulate(onsets)
+    in_speech = sound & (onsets >= 0) & (run[np.maximum(onsets, 0)] == run)
+    onset_times = times[np.maximum(onsets, 0)]
+    if speech_start is not None:
+        carried = sound & (run == 0)
+        in_speech |= carried
+        onset_times = np.where(carried, speech_start, onset_times)
+    ready_unmute = in_speech & (times - onset_times >= min_speech_duration)
+    if playing is not None:
+        ready_unmute |= playing
+
+    sounds = np.maximum.accumulate(np.where(sound, index, -1))
+    sound_times = np.where(sounds >= 0, times[np.maximum(sounds, 0)], last_sound_time)
+    ready_mute = times - sound_times > silence_timeout
+
+    # A frame can't be ready for both: ready to unmute means sound now
+    ready = np.maximum.accumulate(np.where(ready_unmute | ready_mute, index, -1))
+    states = np.where(ready >= 0, ready_mute[np.maximum(ready, 0)], muted)
+    previous = np.empty(count, dtype=bool)
+    previous[0] = muted
+    previous[1:] = states[:-1]
+    changes = np.flatnonzero(states != previous)
+
+    final_start = float(onset_times[-1]) if in_speech[-1] else None
+    final = (bool(states[-1]), float(sound_times[-1]), final_start)
+    return changes, states[changes], final
@@ -0,0 +1,92 @@
+"""On-disk cache of input devices so the GUI can list them at launch."""
+
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_path():
+    """
+    Cache file next to the logs directory
+
+    Returns:
+        str or None: %LOCALAPPDATA%\\AutoMuter\\devices.json, or None if
+                     LOCALAPPDATA is not set
+    """
+    local_appdata = os.getenv("LOCALAPPDATA")
+    if not local_appdata:
+        return None
+    return os.path.join(local_appdata, "AutoMuter", "devices.json")
+
+
+class DeviceCache:
+    """
+    Input device lists keyed by PortAudio host API
+
+    Device indices depend on the host API, so a list saved for one is never
+    shown for another. The file also records the host API used last, which
+    is what load() returns before PortAudio has been initialized.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize the cache
+
+        Args:
+            path (str): Cache file, default_cache_path() by default
+        """
+        self.path = path or default_cache_path()
+
+    def _read(self):
+        """Return the cache file contents, empty if missing or unreadable"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable device cache: %s", e)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def load(self, host_api=None):
+        """
+        Cached devices for a host API
+
+        Args:
+            host_api (str): Host API name, the last one saved by default
+
+        Returns:
+            list[dict] or None: name/id per device, None if nothing is cached
+        """
+        data = self._read()
+        host_api = host_api or data.get("last_host_api")
+        devices = data.get("host_apis", {}).get(host_api)
+        return list(devices) if devices else None
+
+    def save(self, host_api, devices):
+        """
+        Store the devices of a host API and mark it as the last one used
+
+        Args:
+            host_api (str): Host API name
+            devices (list[dict]): name/id per device
+        """
+        if not self.path:
+            return
+        data = self._read()
+        host_apis = data.get("host_apis", {})
+        if host_apis.get(host_api) == devices and data.get("last_host_api") == host_api:
+            return
+        host_apis[host_api] = devices
+        data = {"last_host_api": host_api, "host_apis": host_apis}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as cache_file:
+                json.dump(data, cache_file, indent=2)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save device cache: %s", e)
@@ -0,0 +1,198 @@
+"""Serialized, off-thread dispatch of mute commands to the audio controller."""
+
+import collections
+import logging
+import queue
+import threading
+import time
+
+from auto_muter.audio_controller import (initialize_com_thread,
+                                         uninitialize_com_thread)
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MuteDispatcher:
+    """
+    Applies desired mute states on a dedicated thread
+
+    The dispatcher thread creates the controller (and its COM apartment)
+    and is the only thread that talks to it while running. Callers only
+    enqueue the state they want; when several requests are waiting only
+    the newest is applied, and requests for the state already applied are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        controller_factory,
+        on_result=None,
+        history=256,
+        owns_controller=False,
+        metrics=None,
+    ):
+        """
+        Initialize the dispatcher
+
+        Args:
+            controller_factory (callable): Creates the controller on the
+                                           dispatcher thread
+            on_result (callable): Called as on_result(requested, actual) on the
+                                  dispatcher thread after each applied command
+            history (int): Number of command latencies kept for stats()
+            owns_controller (bool): Close the controller when the dispatcher
+                                    stops
+            metrics (PipelineMetrics): Times controller calls as the
+                                       "controller" stage and counts errors
+        """
+        self.controller_factory = controller_factory
+        self.on_result = on_result
+        self.owns_controller = owns_controller
+        self.metrics = metrics
+        self.controller = None
+        self._commands = queue.SimpleQueue()
+        self._thread = None
+        self._ready = threading.Event()
+        self._latencies = collections.deque(maxlen=history)
+        self.applied = 0
+        self.coalesced = 0
+        self.redundant = 0
+        self.errors = 0
+
+    @property
+    def running(self):
+        """Whether the dispatcher thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def queue_depth(self):
+        """Number of commands waiting to be processed"""
+        return self._commands.qsize()
+
+    def start(self, timeout=5.0):
+        """
+        Start the dispatcher thread and wait for the controller to be created
+
+        Args:
+            timeout (float): Seconds to wait for the controller
+        """
+        if self.running:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="MuteDispatcher", daemon=True
+        )
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            logger.warning("Mute dispatcher did not become ready in %.1fs", timeout)
+
+    def request(self, muted):
+        """
+        Ask for a mute state without blocking
+
+        Args:
+            muted (bool): Desired mute state
+        """
+        self._commands.put((bool(muted), time.perf_counter()))
+
+    def stop(self, timeout=2.0):
+        """Apply any pending command and stop the dispatcher thread"""
+        if self._thread is None:
+            return
+        self._commands.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        """
+        Dispatcher counters and command latency
+
+        Returns:
+            dict: queue_depth, applied, coalesced, redundant and errors
+                  counts, plus latency_ms with last/p50/max of the command
+                  latency from request() to the controller returning
+        """
+        latencies = sorted(self._latencies)
+        latency = {"last": None, "p50": None, "max": None}
+        if latencies:
+            latency = {
+                "last": self._latencies[-1] * 1e3,
+                "p50": latencies[len(latencies) // 2] * 1e3,
+                "max": latencies[-1] * 1e3,
+            }
+        return {
+            "queue_depth": self.queue_depth,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "redundant": self.redundant,
+            "errors": self.errors,
+            "latency_ms": latency,
+        }
+
+    def _run(self):
+        """Dispatcher thread main loop"""
+        com_initialized = initialize_com_thread()
+        try:
+            self.controller = self.controller_factory()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Mute dispatcher could not create controller: %s", e)
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            stopping = False
+            while not stopping:
+                command = self._commands.get()
+                if command is _STOP:
+                    stopping, command = True, None
+                # Collapse everything queued behind it to the newest request,
+                # still stopping if a request arrived after stop()
+                while True:
+                    try:
+                        newer = self._commands.get_nowait()
+                    except queue.Empty:
+                        break
+                    if newer is _STOP:
+                        stopping = True
+                        continue
+                    if command is not None:
+                        self.coalesced += 1
+                    command = newer
+                if command is not None:
+                    self._apply(*command)
+        finally:
+            if self.owns_controller and hasattr(self.controller, "close"):
+                self.controller.close()
+            self.controller = None
+            if com_initialized:
+                uninitialize_com_thread()
+
+    def _apply(self, muted, requested_at):
+        """Apply one desired state unless it is already in effect"""
+        # The controller's cached state also reflects changes made elsewhere,
+        # e.g. from the taskbar, which a locally tracked state would miss
+        if muted == self.controller.get_mute_state():
+            self.redundant += 1
+            return
+
+        try:
+            if self.metrics is None:
+                actual = self.controller.set_mute_state(muted)
+            else:
+                actual = self.metrics.call(
+                    "controller", self.controller.set_mute_state, muted
+                )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.errors += 1
+            if self.metrics is not None:
+                self.metrics.count("errors")
+            logger.error("Mute dispatcher failed to apply state: %s", e)
+            return
+
+        self._latencies.append(time.perf_counter() - requested_at)
+        self.applied += 1
+        if self.on_result is not None:
+            self.on_result(muted, actual)
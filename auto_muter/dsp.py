@@ -0,0 +1,593 @@
+"""Signal processing helpers for the capture pipeline."""
+
+import math
+
+import numpy as np
+
+SAMPLE_WIDTH = 2  # Bytes per paInt16 sample
+
+# Ways to measure an analysis window: broadband RMS or SpectralVad
+DETECTORS = ("rms", "spectral")
+
+
+class FrameEnergy:
+    """Computes the RMS energy of 16-bit PCM chunks using preallocated buffers"""
+
+    def __init__(self, chunk_size):
+        """
+        Initialize the buffers for a fixed chunk size
+
+        Args:
+            chunk_size (int): Number of samples per chunk
+        """
+        self._allocate(chunk_size)
+
+    def _allocate(self, chunk_size):
+        """Allocate the reusable buffers for the given chunk size"""
+        self.chunk_size = chunk_size
+        # Raw bytes are copied in place into this buffer; the int16 view over
+        # it and the float64 work buffer are created once and reused.
+        self._raw = bytearray(chunk_size * SAMPLE_WIDTH)
+        self._raw_view = memoryview(self._raw)
+        self._samples = np.frombuffer(self._raw, dtype=np.int16)
+        self._work = np.empty(chunk_size, dtype=np.float64)
+
+    def rms(self, data):
+        """
+        Calculate the RMS energy of a chunk of raw PCM data
+
+        Args:
+            data (bytes): Little-endian 16-bit PCM samples as read from the stream
+
+        Returns:
+            float: Root-mean-square amplitude of the chunk
+        """
+        nbytes = len(data) - len(data) % SAMPLE_WIDTH
+        count = nbytes // SAMPLE_WIDTH
+        if count == 0:
+            return 0.0
+
+        if count == self.chunk_size:
+            self._raw_view[:] = data
+            samples, work = self._samples, self._work
+        else:
+            # Short or oversized reads are rare, only these pay for a view
+            if count > self.chunk_size:
+                self._allocate(count)
+            self._raw_view[:nbytes] = memoryview(data)[:nbytes]
+            samples, work = self._samples[:count], self._work[:count]
+
+        np.copyto(work, samples)
+        # dot() accumulates the sum of squares without a squared temporary
+        return math.sqrt(np.dot(work, work) / count)
+
+    def rms_samples(self, samples):
+        """
+        Calculate the RMS energy of an array of int16 samples
+
+        Args:
+            samples (numpy.ndarray): Samples, e.g. a view from AudioRingBuffer
+
+        Returns:
+            float: Root-mean-square amplitude of the samples
+        """
+        count = len(samples)
+        if count == 0:
+            return 0.0
+        if count > self.chunk_size:
+            self._allocate(count)
+        work = self._work if count == self.chunk_size else self._work[:count]
+        np.copyto(work, samples)
+        return math.sqrt(np.dot(work, work) / count)
+
+
+class ChannelEnergy:
+    """Computes the RMS energy of every channel of a window in one pass"""
+
+    def __init__(self, window_size, channels):
+        """
+        Initialize the buffers for a fixed window shape
+
+        Args:
+            window_size (int): Frames per window
+            channels (int): Channels per frame
+        """
+        self.channels = channels
+        self._allocate(window_size)
+        self._energies = np.empty(channels, dtype=np.float64)
+
+    def _allocate(self, window_size):
+        """Allocate the reusable work buffer for the given window size"""
+        self.window_size = window_size
+        self._work = np.empty((window_size, self.channels), dtype=np.float64)
+
+    def rms(self, frames):
+        """
+        Calculate the RMS energy of each channel
+
+        Args:
+            frames (numpy.ndarray): (frames, channels) int16 samples, e.g. a
+                                    window from AudioRingBuffer
+
+        Returns:
+            numpy.ndarray: RMS per channel. The array is reused by the next
+                           call, copy it to keep it.
+        """
+        count = len(frames)
+        if count == 0:
+            self._energies.fill(0.0)
+            return self._energies
+        if count > self.window_size:
+            self._allocate(count)
+        work = self._work if count == self.window_size else self._work[:count]
+        np.copyto(work, frames)
+        # Column-wise sum of squares without a squared temporary
+        np.einsum("ij,ij->j", work, work, out=self._energies)
+        self._energies /= count
+        return np.sqrt(self._energies, out=self._energies)
+
+
+class SpectralVad:
+    """
+    Scores speech in an analysis window from its voice-band spectrum
+
+    The window is cut into frames, Hann-windowed and transformed with one
+    batched real FFT. Per frame, the energy between 300 and 3400 Hz leaves
+    out fan rumble and desk thumps below the band, and the spectral flatness
+    of the band (geometric over arithmetic mean of the power) tells voiced
+    speech, whose power sits in harmonics, from flat noise like keystrokes
+    and hiss. Frames flatter than max_flatness count as silence. The score
+    is the RMS of the remaining band energy: a tone in the band scores its
+    RMS, a voice less than its broadband RMS by the energy of its pitch
+    below 300 Hz. All frames of all windows go through one FFT call.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        window_size,
+        rate=16000,
+        frame_size=512,
+        band=(300.0, 3400.0),
+        max_flatness=0.3,
+    ):
+        """
+        Precompute the window, band and buffers for a fixed window size
+
+        Args:
+            window_size (int): Frames per analysis window
+            rate (int): Sample rate in Hz
+            frame_size (int): Samples per FFT, at most window_size; the
+                              window's last whole frames are scored
+            band (tuple[float, float]): Voice band in Hz
+            max_flatness (float): Flatness above which a frame is noise,
+                                  between 0 (pure tones) and 1 (white noise)
+        """
+        self.window_size = window_size
+        self.rate = rate
+        self.frame_size = min(frame_size, window_size)
+        self.frames = window_size // self.frame_size
+        self.band = band
+        self.max_flatness = max_flatness
+
+        self._window = np.hanning(self.frame_size)
+        frequencies = np.fft.rfftfreq(self.frame_size, 1 / rate)
+        # The band is a contiguous run of bins, sliced rather than masked
+        inside = np.flatnonzero((frequencies >= band[0]) & (frequencies <= band[1]))
+        self._bins = slice(inside[0], inside[-1] + 1)
+        # One-sided band power of a windowed frame to mean square per sample
+        self._scale = 2.0 / (self.frame_size * np.dot(self._window, self._window))
+        self._work = np.empty((self.frames, self.frame_size), dtype=np.float64)
+
+    def score(self, windows):
+        """
+        Score several analysis windows in one pass
+
+        Args:
+            windows (numpy.ndarray): (count, window_size) samples
+
+        Returns:
+            numpy.ndarray: Voice-band RMS of each window
+        """
+        windows = np.asarray(windows)
+        count = len(windows)
+        used = self.frames * self.frame_size
+        frames = windows[:, windows.shape[1] - used :].reshape(-1, self.frame_size)
+        if count == 1:
+            work = np.multiply(frames, self._window, out=self._work)
+        else:
+            work = frames * self._window
+        band = np.fft.rfft(work, axis=1)[:, self._bins]
+        power = band.real**2
+        power += band.imag**2
+
+        mean = power.mean(axis=1)
+        power += 1e-12  # Digital silence is flat, not undefined
+        flatness = np.exp(np.log(power).mean(axis=1)) / (mean + 1e-12)
+        mean[flatness > self.max_flatness] = 0.0
+        per_window = mean.reshape(count, self.frames).mean(axis=1)
+        bins = self._bins.stop - self._bins.start
+        return np.sqrt(per_window * (bins * self._scale))
+
+    def energy(self, samples):
+        """
+        Score one mono window
+
+        Args:
+            samples (numpy.ndarray): window_size int16 samples, e.g. a view
+                                     from AudioRingBuffer
+
+        Returns:
+            float: Voice-band RMS of the window
+        """
+        return float(self.score(samples[np.newaxis])[0])
+
+    def energies(self, frames):
+        """
+        Score every channel of one window
+
+        Args:
+            frames (numpy.ndarray): (window_size, channels) int16 samples
+
+        Returns:
+            numpy.ndarray: Voice-band RMS per channel
+        """
+        return self.score(frames.T)
+
+
+class TransientGate:
+    """
+    Removes keystrokes and other short impulsive sounds from captured chunks
+
+    Each chunk is cut into short sub-frames and their energies form the
+    envelope. Sub-frames more than rise_db above the tracked background are
+    loud, and loud sub-frames less than hold apart belong to one sound, so a
+    low voice stays one sound between its glottal pulses. A sound is removed
+    when it is no longer than max_duration and impulsive on the envelope:
+    its loudest sub-frame comes within attack of its start and stands
+    envelope_crest above its mean level, i.e. it hits and dies away, as
+    keystrokes and desk taps do. Voices and fricatives rise and hold, so
+    they pass untouched.
+
+    A sound still going at the end of a chunk is judged on what has been
+    captured, since nothing is held back and the stage adds no latency: it
+    is removed for now while it is younger than attack, as an attack alone
+    looks the same for a keystroke and a voice, or once it has decayed
+    decay_db below its peak without rising again. Its state carries into
+    the next chunk, where it is judged again, and it only counts as a
+    transient if it ends as one. A voice starting at the very end of a chunk
+    therefore loses at most attack, or one pitch period if the chunk ends
+    between its first two glottal pulses, and is heard from the next chunk
+    on.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rate=16000,
+        channels=1,
+        max_duration=0.04,
+        sub_frame=0.004,
+        rise_db=12.0,
+        hold=0.012,
+        attack=0.008,
+        envelope_crest=3.0,
+        decay_db=5.0,
+        background_time=1.0,
+        background_creep_db=3.0,
+    ):
+        """
+        Initialize the gate
+
+        Args:
+            rate (int): Sample rate in Hz
+            channels (int): Interleaved channels per frame, each gated on
+                            its own
+            max_duration (float): Seconds an impulsive sound may last to be
+                                  removed
+            sub_frame (float): Seconds per sub-frame of the energy envelope
+            rise_db (float): Level above the background that makes a sound
+            hold (float): Longest quiet gap in seconds within one sound
+            attack (float): Seconds from the start of a sound within which
+                            an impulsive one peaks
+            envelope_crest (float): Peak over mean sub-frame energy from
+                                    which a finished sound is impulsive
+            decay_db (float): Fall from the peak that shows a sound still in
+                              progress is dying away
+            background_time (float): Time constant in seconds of the
+                                     background level
+            background_creep_db (float): Rise in dB per second of the
+                                         background while nothing is quiet
+        """
+        self.rate = rate
+        self.channels = channels
+        self.max_duration = max_duration
+        self.sub_frame = max(int(round(sub_frame * rate)), 1)
+        self.rise = 10 ** (rise_db / 10)
+        self.hold = int(round(hold * rate / self.sub_frame))
+        self.attack = max(int(round(attack * rate / self.sub_frame)), 1)
+        self.envelope_crest = envelope_crest
+        self.decay = 10 ** (decay_db / 10)
+        self.background_time = background_time
+        self.background_creep_db = background_creep_db
+        # Transient sounds removed so far
+        self.suppressed = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the background and any sound in progress"""
+        self._states = [_GateState() for _ in range(self.channels)]
+
+    def process(self, data):
+        """
+        Gate one chunk
+
+        Args:
+            data (bytes or numpy.ndarray): Interleaved int16 frames
+
+        Returns:
+            The chunk itself if nothing was removed, else an int16
+            numpy.ndarray copy with the transients zeroed
+        """
+        samples = data
+        if not isinstance(samples, np.ndarray):
+            samples = np.frombuffer(data, dtype=np.int16)
+        frames = samples.reshape(-1, self.channels)
+        if len(frames) == 0:
+            return data
+        starts = np.arange(0, len(frames), self.sub_frame)
+        lengths = np.diff(np.append(starts, len(frames)))
+        output = None
+        for channel, state in enumerate(self._states):
+            remove = self._gate(frames[:, channel], starts, lengths, state)
+            if remove is not None:
+                if output is None:
+                    output = frames.copy()
+                output[np.repeat(remove, lengths), channel] = 0
+        if output is None:
+            return data
+        return output.reshape(samples.shape)
+
+    def _gate(self, column, starts, lengths, state):  # pylint: disable=too-many-locals
+        """Update one channel's state, returning the sub-frames to zero"""
+        work = column.astype(np.float64)
+        level = np.add.reduceat(work * work, starts) / lengths
+        count = len(level)
+        # Sub-frames are numbered from the start of the stream so positions
+        # carry across chunks
+        index = state.position + np.arange(count)
+        state.position += count
+
+        if state.background is None:
+            state.background = max(float(np.median(level)), 1.0)
+        raw = level > state.background * self.rise
+        last_raw = np.maximum.accumulate(np.where(raw, index, state.last_loud))
+        state.last_loud = int(last_raw[-1])
+        loud = index - last_raw <= self.hold
+        quiet = level[~loud]
+        seconds = len(column) / self.rate
+        if len(quiet):
+            weight = 1.0 - math.exp(-seconds / self.background_time)
+            state.background += weight * (float(quiet.mean()) - state.background)
+        else:
+            # Creep up a few dB a second towards the quietest sub-frame, so a
+            # background that sank in digital silence recovers once room
+            # noise returns, while a long syllable barely moves it
+            growth = 10 ** (self.background_creep_db * seconds / 10)
+            floor = float(level.min())
+            state.background = min(
+                state.background * growth, max(floor, state.background)
+            )
+        state.background = max(state.background, 1.0)
+        continuing = state.start is not None and loud[0]
+        if not continuing:
+            self._finish(state)
+        if not loud.any():
+            return None
+
+        # Number the sounds; sound 0 continues the one in progress at the
+        # end of the previous chunk, if any
+        onsets = loud.copy()
+        onsets[1:] &= ~loud[:-1]
+        onsets[0] &= not continuing
+        run = np.cumsum(onsets)[loud] - (0 if continuing else 1)
+        runs = run[-1] + 1
+        loud_index, loud_level = index[loud], level[loud]
+
+        start = index[onsets]
+        samples = np.bincount(run, lengths[loud], runs)
+        total = np.bincount(run, loud_level, runs)
+        subframes = np.bincount(run, minlength=runs)
+        peak = np.zeros(runs)
+        np.maximum.at(peak, run, loud_level)
+        # First sub-frame at the peak, and last loud one, of each sound
+        never = np.iinfo(np.int64).max
+        peak_at = np.full(runs, never)
+        np.minimum.at(
+            peak_at, run, np.where(loud_level == peak[run], loud_index, never)
+        )
+        last_at = np.full(runs, -1)
+        np.maximum.at(last_at, run, np.where(raw[loud], loud_index, -1))
+        if continuing:
+            start = np.concatenate(([state.start], start))
+            samples[0] += state.samples
+            total[0] += state.total
+            subframes[0] += state.subframes
+            if state.peak >= peak[0]:
+                peak[0], peak_at[0] = state.peak, state.peak_at
+            last_at[0] = max(last_at[0], state.last_at)
+
+        sharp = (peak_at - start < self.attack) & (
+            samples <= self.max_duration * self.rate
+        )
+        transient = sharp & (peak >= self.envelope_crest * total / subframes)
+        is_open = bool(loud[-1])
+        if is_open and sharp[-1]:
+            # Only part of the last sound is known, judge its shape so far
+            new = subframes[-1] <= self.attack
+            dying = (
+                level[-1] * self.decay <= peak[-1] and last_at[-1] <= peak_at[-1] + 1
+            )
+            transient[-1] = new or dying
+
+        closed = runs - 1 if is_open else runs
+        self.suppressed += int(np.count_nonzero(transient[:closed]))
+        if is_open:
+            state.start = int(start[-1])
+            state.samples = samples[-1]
+            state.total = total[-1]
+            state.subframes = int(subframes[-1])
+            state.peak = peak[-1]
+            state.peak_at = int(peak_at[-1])
+            state.last_at = int(last_at[-1])
+        else:
+            state.close()
+        if not transient.any():
+            return None
+        remove = np.zeros(count, dtype=bool)
+        remove[loud] = transient[run]
+        return remove
+
+    def _finish(self, state):
+        """Count the sound that was in progress if it ended as a transient"""
+        if state.start is None:
+            return
+        if (
+            state.peak_at - state.start < self.attack
+            and state.samples <= self.max_duration * self.rate
+            and state.peak >= self.envelope_crest * state.total / state.subframes
+        ):
+            self.suppressed += 1
+        state.close()
+
+
+class _GateState:
+    """Background level and sound in progress of one TransientGate channel"""
+
+    def __init__(self):
+        self.background = None
+        self.position = 0
+        self.last_loud = -(2**62)
+        self.close()
+
+    def close(self):
+        """Forget the sound in progress"""
+        self.start = None
+        self.samples = 0
+        self.total = 0.0
+        self.subframes = 0
+        self.peak = 0.0
+        self.peak_at = 0
+        self.last_at = -1
+
+
+class Resampler:
+    """
+    Converts int16 audio from a device's native rate to the analysis rate
+
+    A polyphase windowed-sinc filter does the anti-aliasing and the rate
+    change in one step, for integer (48 kHz to 16 kHz) and rational
+    (44.1 kHz to 16 kHz) ratios alike. The filter history and the output
+    phase are carried from chunk to chunk, so a stream processed in chunks
+    gives the same samples as processed in one go. Every output sample of a
+    chunk is computed in one vectorized call.
+    """
+
+    def __init__(self, in_rate, out_rate, channels=1, zero_crossings=8):
+        """
+        Design the filter for a rate pair
+
+        Args:
+            in_rate (int): Native rate of the device in Hz
+            out_rate (int): Analysis rate in Hz
+            channels (int): Interleaved channels per frame
+            zero_crossings (int): Sinc zero crossings on each side of the
+                                  filter center, longer is sharper and slower
+        """
+        divisor = math.gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // divisor
+        self.down = self.in_rate // divisor
+        self.channels = channels
+
+        # Prototype low-pass at the upsampled rate, cut off a little below
+        # the lower of the two Nyquist frequencies
+        factor = max(self.up, self.down)
+        half = zero_crossings * factor
+        taps = np.arange(-half, half + self.up) / factor
+        prototype = np.sinc(0.9 * taps) * np.kaiser(len(taps), 6.0)
+        # Phase p of the bank weights input samples i, i-1, ... for outputs
+        # at upsampled time i * up + p; stored oldest first for dot products
+        self.taps_per_phase = -(-len(prototype) // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up)
+        padded[: len(prototype)] = prototype
+        self._bank = padded.reshape(self.taps_per_phase, self.up).T[:, ::-1].copy()
+        self._bank /= self._bank.sum(axis=1, keepdims=True)
+
+        shape = (self.taps_per_phase - 1,)
+        if channels > 1:
+            shape += (channels,)
+        self._history = np.zeros(shape, dtype=np.float64)
+        self._phase = 0  # Upsampled time of the next output sample
+        self._plan = None
+
+    @property
+    def passthrough(self):
+        """Whether the rates are equal and nothing needs to be done"""
+        return self.up == self.down
+
+    @property
+    def period(self):
+        """Input frames after which the output phase repeats"""
+        return self.down
+
+    def output_frames(self, frames):
+        """Output frames a chunk of frames produces from the current phase"""
+        remaining = frames * self.up - self._phase
+        return 0 if remaining <= 0 else -(-remaining // self.down)
+
+    def _plan_for(self, frames):
+        """Window starts and filter phases for a chunk, cached per shape"""
+        key = (frames, self._phase)
+        if self._plan is None or self._plan[0] != key:
+            count = self.output_frames(frames)
+            times = self._phase + np.arange(count) * self.down
+            self._plan = (key, times // self.up, self._bank[times % self.up], count)
+        return self._plan[1:]
+
+    def process(self, data):
+        """
+        Resample one chunk
+
+        Args:
+            data (bytes or numpy.ndarray): Interleaved int16 frames
+
+        Returns:
+            numpy.ndarray: int16 frames at the analysis rate, (frames,
+                           channels) with several channels
+        """
+        samples = np.frombuffer(data, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels)
+        if self.passthrough:
+            return samples
+        frames = len(samples)
+        starts, weights, count = self._plan_for(frames)
+
+        buffer = np.concatenate((self._history, samples))
+        windows = np.lib.stride_tricks.sliding_window_view(
+            buffer, self.taps_per_phase, axis=0
+        )[starts]
+        if self.channels > 1:
+            output = np.einsum("mct,mt->mc", windows, weights)
+        else:
+            output = np.einsum("mt,mt->m", windows, weights)
+
+        self._phase += count * self.down - frames * self.up
+        self._history = buffer[frames:]
+        np.rint(output, out=output)
+        return np.clip(output, -32768, 32767).astype(np.int16)
+
+    def reset(self):
+        """Forget the filter history, e.g. after a gap in the stream"""
+        self._history[:] = 0
+        self._phase = 0
@@ -0,0 +1,188 @@
+"""Typed events published by AudioMuter and delivered to subscribers.
+
+Every event carries the time.monotonic() value of when it was published.
+"""
+
+import collections
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+MuteChanged = collections.namedtuple("MuteChanged", ["muted", "reason", "time"])
+MuteChanged.__doc__ = """
+The mute state AutoMuter wants or observed changed
+
+reason is "Auto", "Manually set", "Toggled", "Controller" (the controller
+applied a different state than requested) or "External" (changed outside
+AutoMuter, e.g. from the taskbar).
+"""
+
+RunStateChanged = collections.namedtuple(
+    "RunStateChanged", ["running", "message", "time"]
+)
+RunStateChanged.__doc__ = """
+Monitoring started or stopped, message is shown as the status
+"""
+
+LevelUpdate = collections.namedtuple(
+    "LevelUpdate",
+    ["energy", "threshold", "output_peak", "time", "noise_floor"],
+    defaults=(None,),
+)
+LevelUpdate.__doc__ = """
+Microphone RMS of one analysis window with the threshold in effect, the
+held output peak (None when the output is not being sampled) and the
+tracked noise floor (None until known)
+"""
+
+ErrorOccurred = collections.namedtuple("ErrorOccurred", ["message", "time"])
+ErrorOccurred.__doc__ = """
+Monitoring hit an error
+"""
+
+DevicesChanged = collections.namedtuple("DevicesChanged", ["devices", "time"])
+DevicesChanged.__doc__ = """
+The list of input devices was loaded or changed after a hotplug
+"""
+
+BackendsReady = collections.namedtuple("BackendsReady", ["initial_mute_state", "time"])
+BackendsReady.__doc__ = """
+Devices are listed and the controller is ready, see AudioMuter.ready
+"""
+
+DROP_POLICIES = ("oldest", "newest")
+
+
+class Subscription:
+    """
+    Delivers events to one callback on its own thread
+
+    Events wait in a bounded queue. When it is full, drop_policy "oldest"
+    discards the oldest waiting event (for consumers that only care about
+    the latest state, like a level meter) and "newest" discards the
+    incoming one (for consumers that want an unbroken prefix). Either way
+    the publisher never waits on a slow subscriber.
+    """
+
+    def __init__(self, callback, event_types=None, max_queue=256, drop_policy="oldest"):
+        """
+        Initialize the subscription
+
+        Args:
+            callback (callable): Called with each event
+            event_types (tuple): Event classes to receive, all if None
+            max_queue (int): Events kept waiting before dropping
+            drop_policy (str): "oldest" or "newest", see above
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.callback = callback
+        self.event_types = tuple(event_types) if event_types else None
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+        self.delivered = 0
+        self.dropped = 0
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="EventSubscriber", daemon=True
+        )
+        self._thread.start()
+
+    def wants(self, event_type):
+        """Whether events of a class are delivered to this subscription"""
+        return self.event_types is None or event_type in self.event_types
+
+    def put(self, event):
+        """Queue an event without blocking"""
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.drop_policy == "newest":
+                    return
+                self._queue.popleft()
+            self._queue.append(event)
+            self._condition.notify()
+
+    def close(self, timeout=1.0):
+        """
+        Deliver the events already queued, then stop the thread
+
+        Args:
+            timeout (float): Seconds to wait for the thread to finish, 0 to
+                             let it finish on its own
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        """Subscriber thread main loop"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+            try:
+                self.callback(event)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Error in event subscriber: %s", e)
+            self.delivered += 1
+
+
+class EventBus:
+    """Fans published events out to subscriptions"""
+
+    def __init__(self):
+        """Initialize the bus"""
+        # Replaced rather than modified so publish() needs no lock
+        self._subscriptions = ()
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self, callback, event_types=None, max_queue=256, drop_policy="oldest"
+    ):
+        """
+        Start delivering events to a callback, see Subscription
+
+        Returns:
+            Subscription: Pass to unsubscribe() to stop
+        """
+        subscription = Subscription(callback, event_types, max_queue, drop_policy)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription, timeout=1.0):
+        """
+        Stop delivering events to a subscription
+
+        Args:
+            subscription (Subscription): Returned by subscribe()
+            timeout (float): Seconds to wait for its thread, see
+                             Subscription.close()
+        """
+        with self._lock:
+            self._subscriptions = tuple(
+                known for known in self._subscriptions if known is not subscription
+            )
+        subscription.close(timeout)
+
+    def wants(self, event_type):
+        """Whether anyone subscribes to an event class, to skip building it"""
+        return any(sub.wants(event_type) for sub in self._subscriptions)
+
+    def publish(self, event):
+        """Hand an event to every interested subscription without blocking"""
+        event_type = type(event)
+        for subscription in self._subscriptions:
+            if subscription.wants(event_type):
+                subscription.put(event)
@@ -0,0 +1,124 @@
+"""Fusion of per-device and per-channel energies into one decision energy."""
+
+import numpy as np
+
+FUSION_RULES = ("any", "majority", "weighted")
+
+CHANNEL_POLICIES = ("max", "mean", "select")
+
+
+class EnergyFusion:
+    """
+    Reduces the energies of several inputs to a single energy
+
+    The result is an order statistic of the energies, chosen so that
+    comparing it with the threshold applies the rule:
+
+    - "any": the loudest input, so speech on any input counts
+    - "majority": the energy more than half the inputs reach, so speech
+      needs a strict majority of inputs above the threshold
+    - "weighted": the energy reached by inputs holding at least quorum of
+      the total weight, a weighted vote
+
+    Inputs that are not active, e.g. a device that stopped delivering
+    audio, are left out, so the others keep deciding on their own.
+    """
+
+    def __init__(self, rule="any", weights=None, quorum=0.5):
+        """
+        Initialize the fusion
+
+        Args:
+            rule (str): One of FUSION_RULES
+            weights (list[float]): Weight per input for "weighted", equal
+                                   weights by default
+            quorum (float): Share of the weight that must be above the
+                            threshold for "weighted"
+        """
+        if rule not in FUSION_RULES:
+            raise ValueError(f"Unknown fusion rule: {rule}")
+        self.rule = rule
+        self.weights = None if weights is None else np.asarray(weights, np.float64)
+        self.quorum = quorum
+
+    def fuse(self, energies, active=None):
+        """
+        Fuse the energies of one window
+
+        Args:
+            energies (numpy.ndarray): Energy per input
+            active (numpy.ndarray): Boolean mask of inputs to consider, all
+                                    by default
+
+        Returns:
+            float: Fused energy, 0.0 if no input is active
+        """
+        weights = self.weights
+        if active is not None and not active.all():
+            energies = energies[active]
+            if weights is not None:
+                weights = weights[active]
+        count = len(energies)
+        if count == 0:
+            return 0.0
+        if self.rule == "any":
+            return float(energies.max())
+        if self.rule == "majority":
+            # The (count // 2 + 1)-th largest energy
+            rank = count - count // 2 - 1
+            return float(np.partition(energies, rank)[rank])
+
+        order = np.argsort(energies)[::-1]
+        if weights is None:
+            cumulative = np.arange(1, count + 1, dtype=np.float64)
+            total = float(count)
+        else:
+            cumulative = np.cumsum(weights[order])
+            total = cumulative[-1]
+        index = int(np.searchsorted(cumulative, self.quorum * total))
+        return float(energies[order[min(index, count - 1)]])
+
+
+class ChannelPolicy:
+    """
+    Reduces the energies of the channels of one device to a single energy
+
+    "max" follows the loudest channel, "mean" averages the channel energies
+    and "select" uses one channel only, e.g. the capsule facing the user.
+    """
+
+    def __init__(self, policy="max", channels=None):
+        """
+        Initialize the policy
+
+        Args:
+            policy (str): One of CHANNEL_POLICIES
+            channels (int or list[int]): Channels considered, all by
+                                         default; "select" needs exactly one
+        """
+        if policy not in CHANNEL_POLICIES:
+            raise ValueError(f"Unknown channel policy: {policy}")
+        if channels is not None:
+            channels = np.atleast_1d(np.asarray(channels, dtype=np.intp))
+        if policy == "select" and (channels is None or len(channels) != 1):
+            raise ValueError('The "select" channel policy needs one channel')
+        self.policy = policy
+        self.channels = channels
+
+    def reduce(self, energies):
+        """
+        Reduce the channel energies of one window
+
+        Args:
+            energies (numpy.ndarray): Energy per channel
+
+        Returns:
+            float: Energy the decision uses
+        """
+        if self.policy == "select":
+            return float(energies[self.channels[0]])
+        if self.channels is not None:
+            energies = energies[self.channels]
+        if self.policy == "max":
+            return float(energies.max())
+        return float(energies.mean())
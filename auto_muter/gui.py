@@ -1,11 +1,220 @@
 """GUI for the AutoMuter."""
 
 import logging
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
 
+from auto_muter import events
+from auto_muter.level_meter import (MIC_FULL_SCALE, OUTPUT_FULL_SCALE,
+                                    LevelDecimator, LevelHistory, RenderBudget,
+                                    level_fraction)
+
 logger = logging.getLogger(__name__)
 
+# Virtual event that wakes the Tk loop to drain a GuiEventQueue
+WAKEUP_EVENT = "<<AutoMuterUpdate>>"
+
+
+class GuiEventQueue:
+    """
+    Hands state changes from worker threads to the Tk thread
+
+    post() may be called from any thread. It queues the change and, unless
+    a wakeup is already pending, generates one virtual event, which Tk
+    delivers to drain() on its own thread. Nothing runs while no state
+    changes, so an idle GUI has no timers.
+    """
+
+    def __init__(self, root, handlers):
+        """
+        Initialize the queue
+
+        Args:
+            root (tk.Tk): Window whose loop drains the queue
+            handlers (dict): Maps an event kind to a function called with
+                             the event value on the Tk thread
+        """
+        self.root = root
+        self.handlers = handlers
+        self._events = queue.SimpleQueue()
+        self._wakeup_pending = threading.Event()
+        self._closed = False
+        root.bind(WAKEUP_EVENT, self.drain)
+
+    def post(self, kind, value=None):
+        """
+        Queue a state change for the Tk thread
+
+        Args:
+            kind: Key of the handler to call, e.g. an event class
+            value: Argument for the handler
+        """
+        if self._closed:
+            return
+        self._events.put((kind, value))
+        if self._wakeup_pending.is_set():
+            return
+        self._wakeup_pending.set()
+        try:
+            self.root.event_generate(WAKEUP_EVENT, when="tail")
+        except (RuntimeError, tk.TclError) as e:
+            # The loop is not running (yet or any more); the change is
+            # picked up by the next drain
+            self._wakeup_pending.clear()
+            logger.debug("Could not wake up the GUI: %s", e)
+
+    def close(self):
+        """Drop later changes instead of waking a window being destroyed"""
+        self._closed = True
+
+    def drain(self, event=None):
+        """Apply every queued change on the Tk thread"""
+        del event
+        # Cleared first so a change posted while draining wakes Tk again
+        self._wakeup_pending.clear()
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                return
+            handler = self.handlers.get(kind)
+            if handler is not None:
+                handler(value)
+
+
+class LevelMeterView:
+    """
+    Canvas with microphone and output level bars and a scrolling history
+
+    The microphone RMS is drawn in green against the threshold in orange
+    and the tracked noise floor in gray, the output peak in blue, and mute
+    transitions as red (muted) or green (unmuted) markers. Redraws are
+    requested as levels arrive, limited by a RenderBudget, and move the
+    existing canvas items instead of recreating them.
+    """
+
+    BAR_WIDTH = 14
+    GAP = 6
+
+    def __init__(self, parent, history, width=460, height=110, budget=None):
+        """
+        Initialize the view
+
+        Args:
+            parent: Tk container for the canvas
+            history (LevelHistory): Levels and transitions to draw
+            width (int): Canvas width in pixels
+            height (int): Canvas height in pixels
+            budget (RenderBudget): Redraw limit, 30 Hz and 2% of a core by
+                                   default
+        """
+        self.history = history
+        self.budget = budget or RenderBudget()
+        self.width = width
+        self.height = height
+        self.plot_width = width - 2 * (self.BAR_WIDTH + self.GAP)
+        self._render_scheduled = False
+
+        self.canvas = tk.Canvas(
+            parent,
+            width=width,
+            height=height,
+            background="black",
+            highlightthickness=0,
+        )
+        canvas = self.canvas
+        self.output_line = canvas.create_line(0, 0, 0, 0, fill="deep sky blue")
+        self.mic_line = canvas.create_line(0, 0, 0, 0, fill="lime green")
+        self.threshold_line = canvas.create_line(0, 0, 0, 0, fill="orange", dash=(4, 2))
+        self.floor_line = canvas.create_line(0, 0, 0, 0, fill="gray", dash=(2, 4))
+        self.mic_bar = canvas.create_rectangle(0, 0, 0, 0, fill="lime green", width=0)
+        self.output_bar = canvas.create_rectangle(
+            0, 0, 0, 0, fill="deep sky blue", width=0
+        )
+
+    def _y(self, fraction):
+        """Canvas y coordinate of a meter fraction"""
+        return (self.height - 1) * (1.0 - fraction)
+
+    def request_render(self):
+        """Redraw once the render budget allows, coalescing requests"""
+        if self._render_scheduled:
+            return
+        self._render_scheduled = True
+        delay = self.budget.delay(time.perf_counter())
+        self.canvas.after(int(delay * 1000), self.render)
+
+    def render(self):
+        """Redraw the bars, the history and the transition markers"""
+        self._render_scheduled = False
+        latest = self.history.latest
+        if latest is None:
+            return
+        started = time.perf_counter()
+        canvas = self.canvas
+        seconds = self.history.seconds
+        scale = self.plot_width / seconds
+
+        mic_points = []
+        output_points = []
+        for level in self.history.levels:
+            x = self.plot_width - (latest.time - level.time) * scale
+            mic_points += (x, self._y(level_fraction(level.energy, MIC_FULL_SCALE)))
+            output_points += (
+                x,
+                self._y(level_fraction(level.output_peak, OUTPUT_FULL_SCALE)),
+            )
+        if len(mic_points) < 4:
+            mic_points = output_points = [0, 0, 0, 0]
+        canvas.coords(self.mic_line, *mic_points)
+        canvas.coords(self.output_line, *output_points)
+
+        threshold_y = self._y(level_fraction(latest.threshold, MIC_FULL_SCALE))
+        mic_left = self.plot_width + self.GAP
+        output_left = mic_left + self.BAR_WIDTH + self.GAP
+        canvas.coords(
+            self.threshold_line, 0, threshold_y, mic_left + self.BAR_WIDTH, threshold_y
+        )
+        if latest.noise_floor is None:
+            canvas.coords(self.floor_line, 0, 0, 0, 0)
+        else:
+            floor_y = self._y(level_fraction(latest.noise_floor, MIC_FULL_SCALE))
+            canvas.coords(self.floor_line, 0, floor_y, self.plot_width, floor_y)
+        canvas.coords(
+            self.mic_bar,
+            mic_left,
+            self._y(level_fraction(latest.energy, MIC_FULL_SCALE)),
+            mic_left + self.BAR_WIDTH,
+            self.height,
+        )
+        canvas.coords(
+            self.output_bar,
+            output_left,
+            self._y(level_fraction(latest.output_peak, OUTPUT_FULL_SCALE)),
+            output_left + self.BAR_WIDTH,
+            self.height,
+        )
+
+        # Only a handful of transitions fit in the history, so the markers
+        # are simply recreated
+        canvas.delete("transition")
+        for transition_time, muted in self.history.transitions:
+            x = self.plot_width - (latest.time - transition_time) * scale
+            if x >= 0:
+                canvas.create_line(
+                    x,
+                    0,
+                    x,
+                    self.height,
+                    fill="red" if muted else "lime green",
+                    tags="transition",
+                )
+
+        self.budget.record(started, time.perf_counter())
+
 
 class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-public-methods
     """GUI for the Auto Muter application"""
@@ -14,12 +223,32 @@ class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-pub
         """Initialize the GUI with a reference to the AudioMuter instance"""
         self.audio_muter = audio_muter
         self.root = None
+        # Devices and the mute state may still be loading in the background,
+        # and the device list is replaced when devices are plugged in
+        self._shown_devices = None
+        self._mute_state_shown = False
+        self._subscription = None
+        # Buttons that would block the Tk thread until the backends are ready
+        self._backend_buttons = []
+        # Levels are reduced on the subscriber thread so the Tk loop only
+        # sees about 30 updates per second, however short the windows are
+        self._level_decimator = LevelDecimator()
+        self.level_history = LevelHistory()
+        self.level_meter = None
+        self._last_transition = None
 
     def create_gui(self):
-        """Create the Tkinter GUI"""
+        """Create the Tkinter GUI and run its main loop"""
+        self.build_window()
+
+        # Start the GUI main loop
+        self.root.mainloop()
+
+    def build_window(self):
+        """Create the window and widgets without entering the main loop"""
         self.root = tk.Tk()
         self.root.title("Auto Muter")
-        self.root.geometry("500x500")  # Increased height for new controls
+        self.root.geometry("500x715")  # Increased height for new controls
         self.root.resizable(True, True)
 
         # Create a frame with padding
@@ -41,17 +270,43 @@ class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-pub
             main_frame, textvariable=self.device_var, values=device_names, width=50
         )
         device_combo.pack(fill=tk.X, pady=5)
+        self.device_combo = (
+            device_combo  # pylint: disable=attribute-defined-outside-init
+        )
 
         # Energy threshold
         ttk.Label(main_frame, text="Energy Threshold:").pack(anchor="w")
         self.threshold_var = tk.IntVar(
             value=self.audio_muter.energy_threshold
         )  # pylint: disable=attribute-defined-outside-init
+        # Applied immediately so the level meter shows the effect
         threshold_scale = ttk.Scale(
-            main_frame, from_=100, to=2000, variable=self.threshold_var
+            main_frame,
+            from_=100,
+            to=2000,
+            variable=self.threshold_var,
+            command=self._set_threshold,
         )
         threshold_scale.pack(fill=tk.X, pady=5)
         ttk.Label(main_frame, textvariable=self.threshold_var).pack()
+        self.adaptive_var = tk.BooleanVar(
+            value=self.audio_muter.adaptive_threshold
+        )  # pylint: disable=attribute-defined-outside-init
+        ttk.Checkbutton(
+            main_frame,
+            text="Adapt to background noise (threshold follows the noise floor)",
+            variable=self.adaptive_var,
+            command=self._toggle_adaptive_threshold,
+        ).pack(anchor="w")
+        self.transient_var = tk.BooleanVar(
+            value=self.audio_muter.transient_rejection
+        )  # pylint: disable=attribute-defined-outside-init
+        ttk.Checkbutton(
+            main_frame,
+            text="Ignore keystrokes and clicks",
+            variable=self.transient_var,
+            command=self._toggle_transient_rejection,
+        ).pack(anchor="w")
 
         # Silence timeout
         ttk.Label(main_frame, text="Silence Timeout (seconds):").pack(anchor="w")
@@ -92,15 +347,26 @@ class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-pub
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=10)
 
-        ttk.Button(button_frame, text="Start", command=self._start_from_gui).pack(
-            side=tk.LEFT, padx=5
+        # Start and Test Mute wait for the controller, so they stay disabled
+        # until BackendsReady instead of freezing the window
+        start_button = ttk.Button(
+            button_frame,
+            text="Start",
+            command=self._start_from_gui,
+            state=tk.DISABLED,
         )
+        start_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Stop", command=self.audio_muter.stop).pack(
             side=tk.LEFT, padx=5
         )
-        ttk.Button(
-            button_frame, text="Test Mute", command=self.audio_muter.toggle_mute
-        ).pack(side=tk.LEFT, padx=5)
+        test_button = ttk.Button(
+            button_frame,
+            text="Test Mute",
+            command=self.audio_muter.toggle_mute,
+            state=tk.DISABLED,
+        )
+        test_button.pack(side=tk.LEFT, padx=5)
+        self._backend_buttons = [start_button, test_button]
 
         self.exit_button = ttk.Button(  # pylint: disable=attribute-defined-outside-init
             button_frame, text="Exit", command=self._exit_application
@@ -112,39 +378,122 @@ class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-pub
             main_frame, text="Status: Stopped"
         )  # pylint: disable=attribute-defined-outside-init
         self.run_status_label.pack(pady=5)
-        self.audio_muter.run_status_label = self.run_status_label
 
-        initial_mute_state = (
-            "Muted" if self.audio_muter.initial_mute_state else "Unmuted"
-        )
         self.status_label = ttk.Label(  # pylint: disable=attribute-defined-outside-init
-            main_frame, text=f"Current State: {initial_mute_state}"
+            main_frame, text="Current State: Detecting..."
         )
         self.status_label.pack(pady=5)
-        self.audio_muter.status_label = self.status_label
+
+        levels_frame = ttk.LabelFrame(main_frame, text="Levels")
+        levels_frame.pack(fill=tk.X, pady=5)
+        self.level_meter = LevelMeterView(levels_frame, self.level_history)
+        self.level_meter.canvas.pack(padx=5, pady=5)
 
         # Add dependency status
         dependencies_frame = ttk.LabelFrame(main_frame, text="Dependencies")
         dependencies_frame.pack(fill=tk.X, pady=5)
 
-        # Setup update loop for GUI
-        def update_gui():
-            if self.audio_muter.running:
-                mute_text = "Muted" if self.audio_muter.muted else "Unmuted"
-                self.status_label.config(text=f"Current State: {mute_text}")
-            self.root.after(100, update_gui)
-
-        update_gui()
+        # The AudioMuter publishes state changes from its threads; the
+        # window is only updated when one arrives
+        self.events = GuiEventQueue(  # pylint: disable=attribute-defined-outside-init
+            self.root,
+            {
+                events.MuteChanged: self._show_mute_state,
+                events.RunStateChanged: self._show_status,
+                events.DevicesChanged: self._show_devices,
+                events.BackendsReady: self._show_backends,
+                events.LevelUpdate: self._show_level,
+            },
+        )
+        self._subscription = self.audio_muter.subscribe(
+            self._forward_event, event_types=tuple(self.events.handlers)
+        )
+        # Backends that finished before the subscription, and changes
+        # posted before the main loop started
+        if self.audio_muter.ready.is_set():
+            self._show_backends()
+        self.root.after_idle(self.events.drain)
 
         # When closing window
         def on_close():
+            self._unsubscribe()
             self.audio_muter.stop()
             self.root.destroy()
 
         self.root.protocol("WM_DELETE_WINDOW", on_close)
 
-        # Start the GUI main loop
-        self.root.mainloop()
+    def _unsubscribe(self):
+        """Stop receiving AudioMuter events"""
+        if self._subscription is not None:
+            # The subscriber thread may be waiting for this (Tk) thread in
+            # event_generate(), so let it finish on its own instead of
+            # joining it
+            self.events.close()
+            self.audio_muter.unsubscribe(self._subscription, timeout=0)
+            self._subscription = None
+
+    def _forward_event(self, event):
+        """Pass an AudioMuter event to the Tk thread, decimating levels"""
+        if isinstance(event, events.LevelUpdate):
+            event = self._level_decimator.add(event)
+            if event is None:
+                return
+        self.events.post(type(event), event)
+
+    def _show_level(self, event):
+        """Add a decimated level to the meter"""
+        self.level_history.add_level(event)
+        self.level_meter.request_render()
+
+    def _show_backends(self, event=None):
+        """Show the loaded devices and mute state once the AudioMuter is ready"""
+        del event
+        for button in self._backend_buttons:
+            button.config(state=tk.NORMAL)
+        self._show_devices()
+        if not self._mute_state_shown:
+            self._show_mute_state()
+
+    def _show_devices(self, event=None):
+        """Fill the device combobox"""
+        devices = event.devices if event is not None else self.audio_muter.devices
+        if devices is self._shown_devices:
+            return
+        self._shown_devices = devices
+        device_names = [f"{dev['name']}" for dev in devices]
+        self.device_combo.config(values=device_names)
+        if device_names and self.device_var.get() not in device_names:
+            self.device_var.set(device_names[0])
+
+    def _show_mute_state(self, event=None):
+        """Update the mute state label"""
+        self._mute_state_shown = True
+        if event is not None:
+            muted = event.muted
+            if muted != self._last_transition:
+                self._last_transition = muted
+                self.level_history.add_transition(event.time, muted)
+        else:
+            muted = self.audio_muter.initial_mute_state
+        mute_text = "Muted" if muted else "Unmuted"
+        self.status_label.config(text=f"Current State: {mute_text}")
+
+    def _show_status(self, event):
+        """Update the run status label"""
+        self.run_status_label.config(text=f"Status: {event.message}")
+
+    def _set_threshold(self, value):
+        """Apply the threshold slider while monitoring"""
+        del value
+        self.audio_muter.energy_threshold = self.threshold_var.get()
+
+    def _toggle_adaptive_threshold(self):
+        """Switch between the slider threshold and the adaptive one"""
+        self.audio_muter.adaptive_threshold = self.adaptive_var.get()
+
+    def _toggle_transient_rejection(self):
+        """Switch the keystroke filter on or off while monitoring"""
+        self.audio_muter.transient_rejection = self.transient_var.get()
 
     def _toggle_output_monitoring(self):
         """Toggle output monitoring based on checkbox"""
@@ -174,6 +523,7 @@ class AutoMuterGUI:  # pylint: disable=too-many-instance-attributes, too-few-pub
         """Clean up and exit application"""
         # Make sure to restore initial mute state before exit
         self.audio_muter.cleanup_before_exit()
+        self._unsubscribe()
 
         # Then destroy the window
         if self.root:
@@ -0,0 +1,208 @@
+"""Process-wide PortAudio host shared by device enumeration and streams."""
+
+import atexit
+import logging
+import threading
+
+import pyaudio
+
+logger = logging.getLogger(__name__)
+
+
+class HostSession:
+    """
+    One PyAudio instance for the whole process
+
+    Initializing PortAudio is slow, so the host is created on first use and
+    kept until the process exits instead of once per enumeration or stream.
+    PortAudio only sees devices that were present when it was initialized,
+    so picking up hotplugged devices needs reinitialize(), which waits until
+    no stream is using the host.
+    """
+
+    def __init__(self, factory=None):
+        """
+        Initialize the session
+
+        Args:
+            factory (callable): Creates the host, pyaudio.PyAudio by default
+        """
+        self.factory = factory
+        self._pa = None
+        self._users = 0
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self):
+        """Whether PortAudio is currently initialized"""
+        return self._pa is not None
+
+    def _host(self):
+        """Return the host, initializing PortAudio if needed; lock held"""
+        if self._pa is None:
+            factory = self.factory or pyaudio.PyAudio
+            self._pa = factory()
+        return self._pa
+
+    def acquire(self):
+        """
+        Borrow the host for a stream, see release()
+
+        Returns:
+            pyaudio.PyAudio: The shared host
+        """
+        with self._lock:
+            pa = self._host()
+            self._users += 1
+            return pa
+
+    def release(self):
+        """Return a host borrowed with acquire()"""
+        with self._lock:
+            self._users = max(self._users - 1, 0)
+
+    def input_devices(self):
+        """
+        List the input devices the host knows about
+
+        Returns:
+            list[dict]: name and id (device index as a string) per device
+        """
+        with self._lock:
+            pa = self._host()
+            devices = []
+            for index in range(pa.get_device_count()):
+                device_info = pa.get_device_info_by_index(index)
+                if device_info["maxInputChannels"] > 0:  # It's an input device
+                    devices.append({"name": device_info["name"], "id": str(index)})
+            return devices
+
+    def host_api_name(self):
+        """Name of the default host API, e.g. "MME" or "Windows WASAPI" """
+        with self._lock:
+            return str(self._host().get_default_host_api_info()["name"])
+
+    def reinitialize(self):
+        """
+        Restart PortAudio so it sees devices added or removed since
+
+        Returns:
+            bool: False if a stream is using the host, try again later
+        """
+        with self._lock:
+            if self._users:
+                return False
+            self._terminate()
+            return True
+
+    def terminate(self):
+        """Release PortAudio"""
+        with self._lock:
+            self._terminate()
+
+    def _terminate(self):
+        """Release PortAudio; lock held"""
+        if self._pa is not None:
+            try:
+                self._pa.terminate()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Error terminating PyAudio: %s", e)
+            self._pa = None
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_host_session():
+    """Return the process-wide HostSession, terminated at exit"""
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is None:
+            _session = HostSession()
+            atexit.register(_session.terminate)
+        return _session
+
+
+def reset_host_session():
+    """Terminate the process-wide HostSession so the next use starts afresh"""
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is not None:
+            atexit.unregister(_session.terminate)
+            _session.terminate()
+            _session = None
+
+
+class DeviceWatcher:
+    """
+    Reloads the input device list after hotplug notifications
+
+    Notifications tend to arrive in bursts (added, state changed, default
+    changed), so they are debounced into one host reinitialization.
+    """
+
+    def __init__(self, on_change, session=None, debounce=1.0, retry=2.0):
+        """
+        Initialize the watcher
+
+        Args:
+            on_change (callable): Called with no arguments on a timer thread
+                                  once the host sees the new devices
+            session (HostSession): Host to reinitialize, the shared one by
+                                   default
+            debounce (float): Seconds to wait for a burst of events to end
+            retry (float): Seconds between attempts while a stream is open
+        """
+        self.on_change = on_change
+        self.session = session
+        self.debounce = debounce
+        self.retry = retry
+        self._notifier = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def start(self, notifier):
+        """
+        Subscribe to device changes
+
+        Args:
+            notifier: Object with start(callback) and stop(), e.g.
+                      DeviceChangeNotifier
+        """
+        notifier.start(self.notify)
+        self._notifier = notifier
+
+    def stop(self):
+        """Unsubscribe and cancel any pending reload"""
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+        self._schedule(None)
+
+    def notify(self):
+        """Record a device change, reloading once events stop arriving"""
+        self._schedule(self.debounce)
+
+    def _schedule(self, delay):
+        """Restart the reload timer, or cancel it when delay is None"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if delay is not None:
+                self._timer = threading.Timer(delay, self._reload)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _reload(self):
+        """Reinitialize the host and report the change"""
+        session = self.session or get_host_session()
+        if not session.reinitialize():
+            logger.info("Input stream open, retrying device refresh later")
+            self._schedule(self.retry)
+            return
+        try:
+            self.on_change()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error reloading input devices: %s", e)
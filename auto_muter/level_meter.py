@@ -0,0 +1,158 @@
+"""Decimated level stream and history behind the GUI level meter."""
+
+import collections
+import math
+
+# Full scale of the microphone RMS (int16 samples) and of the output peak
+MIC_FULL_SCALE = 32768.0
+OUTPUT_FULL_SCALE = 1.0
+
+# Lowest level the meter shows, in dB below full scale
+METER_FLOOR_DB = -60.0
+
+
+def level_fraction(value, full_scale, floor_db=METER_FLOOR_DB):
+    """
+    Position of a level on a dB meter
+
+    Args:
+        value (float): Level, None counts as silence
+        full_scale (float): Level shown at the top of the meter
+        floor_db (float): Level in dB shown at the bottom
+
+    Returns:
+        float: 0.0 at or below floor_db, 1.0 at or above full scale
+    """
+    if not value or value <= 0:
+        return 0.0
+    db = 20.0 * math.log10(value / full_scale)
+    return min(max(1.0 - db / floor_db, 0.0), 1.0)
+
+
+class LevelDecimator:
+    """
+    Reduces per-window LevelUpdates to a fixed rate
+
+    Each emitted update carries the maximum energy and output peak seen
+    during its interval, so short sounds still reach the meter, and the
+    threshold that was in effect last.
+    """
+
+    def __init__(self, rate=30.0):
+        """
+        Initialize the decimator
+
+        Args:
+            rate (float): Updates emitted per second
+        """
+        self.interval = 1.0 / rate
+        self._pending = None
+        self._due = float("-inf")
+
+    def add(self, level):
+        """
+        Fold one update into the current interval
+
+        Args:
+            level (LevelUpdate): Update of one analysis window
+
+        Returns:
+            LevelUpdate or None: The reduced update once an interval is over
+        """
+        pending = self._pending
+        if pending is not None:
+            output_peak = pending.output_peak
+            if level.output_peak is not None:
+                output_peak = max(output_peak or 0.0, level.output_peak)
+            level = level._replace(
+                energy=max(pending.energy, level.energy), output_peak=output_peak
+            )
+        # The tolerance keeps windows that evenly divide the interval from
+        # missing their deadline by a rounding error
+        if level.time < self._due - self.interval * 1e-3:
+            self._pending = level
+            return None
+        self._pending = None
+        # Keep a steady cadence, unless updates stopped for a while
+        self._due += self.interval
+        if self._due <= level.time:
+            self._due = level.time + self.interval
+        return level
+
+
+class LevelHistory:
+    """Recent levels and mute transitions for a scrolling plot"""
+
+    def __init__(self, seconds=10.0, rate=30.0):
+        """
+        Initialize the history
+
+        Args:
+            seconds (float): Time span kept
+            rate (float): Expected updates per second, which bounds the
+                          number of points kept
+        """
+        self.seconds = seconds
+        self.levels = collections.deque(maxlen=int(seconds * rate) + 1)
+        self.transitions = collections.deque()
+
+    @property
+    def latest(self):
+        """Most recent LevelUpdate, None before the first"""
+        return self.levels[-1] if self.levels else None
+
+    def add_level(self, level):
+        """Append a (decimated) LevelUpdate"""
+        self.levels.append(level)
+        self._expire(level.time)
+
+    def add_transition(self, time, muted):
+        """Record a mute state change at a time.monotonic() value"""
+        self.transitions.append((time, muted))
+        self._expire(time)
+
+    def _expire(self, now):
+        """Drop transitions older than the time span"""
+        oldest = now - self.seconds
+        while self.transitions and self.transitions[0][0] < oldest:
+            self.transitions.popleft()
+
+
+class RenderBudget:
+    """
+    Limits how often a view redraws to stay within a share of one core
+
+    The cost of recent redraws is averaged; the next redraw is allowed once
+    enough time has passed for that cost to fit in the budget, and never
+    sooner than max_rate allows.
+    """
+
+    def __init__(self, max_rate=30.0, budget=0.02, smoothing=0.2):
+        """
+        Initialize the budget
+
+        Args:
+            max_rate (float): Redraws per second when they are cheap
+            budget (float): Share of one core redraws may use, e.g. 0.02
+            smoothing (float): Weight of the latest cost in the average
+        """
+        self.min_interval = 1.0 / max_rate
+        self.budget = budget
+        self.smoothing = smoothing
+        self.average_cost = 0.0
+        self._last_render = float("-inf")
+
+    @property
+    def interval(self):
+        """Seconds between redraws at the current cost"""
+        return max(self.min_interval, self.average_cost / self.budget)
+
+    def delay(self, now):
+        """Seconds from a perf_counter() value until the next redraw may run"""
+        return max(self._last_render + self.interval - now, 0.0)
+
+    def record(self, started, finished):
+        """Account for a redraw that ran between two perf_counter() values"""
+        cost = finished - started
+        self.average_cost += self.smoothing * (cost - self.average_cost)
+        self._last_render = started
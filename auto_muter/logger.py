@@ -1,34 +1,182 @@
 """Custom application logger."""
 
+import atexit
+import datetime
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(filename)s:%(lineno)d - %(message)s"
 
-def setup_logger():
-    """Configure the logger with file and line number information"""
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
 
+
+class RotatingTimedFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotates the log file at midnight or once it exceeds a size
+
+    Rotated files are numbered like RotatingFileHandler's (AutoMuter.log.1
+    is the newest), so several rollovers on one day keep every file.
+    """
+
+    def __init__(self, filename, max_bytes=1024 * 1024, backup_count=5, daily=True):
+        """
+        Initialize the handler
+
+        Args:
+            filename (str): Log file
+            max_bytes (int): Size that triggers a rollover, 0 for none
+            backup_count (int): Rotated files kept
+            daily (bool): Also roll over at the first record after midnight
+        """
+        super().__init__(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self.daily = daily
+        # A file left over from an earlier day is rotated on the first record
+        last_write = (
+            os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        )
+        self.rollover_at = _next_midnight(last_write)
+
+    def shouldRollover(self, record):
+        """Roll over after midnight or when the file would get too large"""
+        if self.daily and record.created >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        """Rotate the files and schedule the next daily rollover"""
+        super().doRollover()
+        self.rollover_at = _next_midnight(time.time())
+
+
+def _next_midnight(timestamp):
+    """Timestamp of the first local midnight after a timestamp"""
+    day = datetime.date.fromtimestamp(timestamp) + datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, datetime.time()).timestamp()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the writer thread without ever waiting
+
+    When the writer falls far behind, e.g. while the disk is stalled,
+    records are dropped and counted instead of blocking the thread that
+    logs, which may be the audio thread.
+    """
+
+    def __init__(self, record_queue):
+        """Initialize the handler"""
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        """Queue a record, dropping it if the queue is full"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def default_log_dir():
+    """
+    Logs directory
+
+    Returns:
+        str or None: %LOCALAPPDATA%\\AutoMuter\\logs, or None if LOCALAPPDATA
+                     is not set
+    """
     local_appdata = os.getenv("LOCALAPPDATA")  # C:\Users\<User>\AppData\Local
-    log_dir = os.path.join(local_appdata, "AutoMuter", "logs")
+    if not local_appdata:
+        return None
+    return os.path.join(local_appdata, "AutoMuter", "logs")
+
 
-    # Create logs directory if it doesn't exist
-    os.makedirs(log_dir, exist_ok=True)
+def setup_logger(  # pylint: disable=too-many-arguments
+    log_dir=None,
+    level=logging.INFO,
+    max_bytes=1024 * 1024,
+    backup_count=5,
+    daily=True,
+    console=True,
+    max_queue=10000,
+):
+    """
+    Configure the root logger to write through a background thread
 
-    log_file = os.path.join(log_dir, "AutoMuter.log")
+    Loggers only put records on a queue; a QueueListener thread writes them
+    to a rotating file and the console, so slow disk writes never block the
+    audio thread. Calling this again returns the logger already configured.
 
-    log_format = "%(asctime)s [%(levelname)s] %(filename)s:%(lineno)d - %(message)s"
+    Args:
+        log_dir (str): Directory of AutoMuter.log, default_log_dir() by
+                       default; without one only the console is used
+        level (int): Root logger level
+        max_bytes (int): Log file size that triggers a rollover
+        backup_count (int): Rotated files kept
+        daily (bool): Also start a new log file every day
+        console (bool): Also write to stdout, when there is one
+        max_queue (int): Records waiting for the writer before dropping
 
+    Returns:
+        logging.Logger: The root logger
+    """
+    global _listener, _queue_handler  # pylint: disable=global-statement
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    with _setup_lock:
+        if _listener is not None:
+            return logger
 
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter(log_format))
-    logger.addHandler(file_handler)
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = []
+        log_dir = log_dir or default_log_dir()
+        if log_dir:
+            # Create logs directory if it doesn't exist
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = RotatingTimedFileHandler(
+                os.path.join(log_dir, "AutoMuter.log"),
+                max_bytes=max_bytes,
+                backup_count=backup_count,
+                daily=daily,
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        # A windowed executable has no stdout
+        if console and sys.stdout is not None:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(log_format))
-    logger.addHandler(console_handler)
+        record_queue = queue.Queue(max_queue)
+        _queue_handler = DroppingQueueHandler(record_queue)
+        _listener = logging.handlers.QueueListener(
+            record_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logger)
 
+        logger.setLevel(level)
+        logger.addHandler(_queue_handler)
     return logger
+
+
+def shutdown_logger():
+    """Write the queued records and detach the handlers setup_logger() added"""
+    global _listener, _queue_handler  # pylint: disable=global-statement
+    with _setup_lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        atexit.unregister(shutdown_logger)
+        _listener = None
+        _queue_handler = None
@@ -16,8 +16,10 @@ def main():
     logger.info("Starting Auto Muter")
 
     try:
-        # Create audio muter instance
-        audio_muter = AudioMuter()
+        # Create audio muter instance, the devices and controller are set up
+        # in the background so the window appears without waiting for them
+        audio_muter = AudioMuter(background_init=True)
+        audio_muter.initialize_in_background()
 
         # Create and start GUI
         gui = AutoMuterGUI(audio_muter)
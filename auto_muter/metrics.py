@@ -0,0 +1,223 @@
+"""Per-stage timings and counters for the capture and decision pipeline."""
+
+import bisect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Stages timed by AudioMuter, in pipeline order
+STAGES = ("read", "decode", "energy", "output_check", "controller")
+
+# Histogram bucket upper bounds in seconds, four per decade from 1us to 10s
+BUCKET_BOUNDS = tuple(10 ** (exponent / 4) * 1e-6 for exponent in range(29))
+
+
+class StageHistogram:
+    """
+    Durations of one pipeline stage in log-spaced buckets
+
+    Recording is a bisect and a few additions, with no allocation and no
+    lock: a stage is normally timed by one thread, and a count lost to a
+    rare concurrent update does not matter for a summary.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram"""
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """Record one duration"""
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile from the buckets
+
+        Args:
+            fraction (float): e.g. 0.99
+
+        Returns:
+            float or None: Upper bound in seconds of the bucket holding the
+                           percentile, capped at the maximum; None if empty
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else None
+                return self.max if bound is None else min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, mean_ms, p50_ms, p99_ms and max_ms
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3,
+            "p50_ms": self.percentile(0.5) * 1e3,
+            "p99_ms": self.percentile(0.99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class PipelineMetrics:
+    """
+    Stage histograms, event counters and gauges, off unless enabled
+
+    Callers check enabled before reading the clock, so disabled metrics
+    cost one attribute load per chunk. Counters and gauges are ignored
+    while disabled too.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize the metrics
+
+        Args:
+            enabled (bool): Start recording immediately
+        """
+        self.enabled = enabled
+        self.stages = {name: StageHistogram() for name in STAGES}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.monotonic()
+
+    def stage(self, name):
+        """Histogram of a stage, created on first use"""
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages.setdefault(name, StageHistogram())
+        return histogram
+
+    def count(self, name, amount=1):
+        """Add to a counter while enabled"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """Record the latest value of a level, e.g. the noise floor, while enabled"""
+        if self.enabled:
+            self.gauges[name] = value
+
+    def call(self, name, func, *args):
+        """
+        Call a function, timing it as a stage while enabled
+
+        Args:
+            name (str): Stage name, e.g. "controller"
+            func (callable): Function to call with args
+
+        Returns:
+            Whatever func returns
+        """
+        if not self.enabled:
+            return func(*args)
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stage(name).add(time.perf_counter() - started)
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        self.stages = {name: StageHistogram() for name in STAGES}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.monotonic()
+
+    def snapshot(self):
+        """
+        Current values
+
+        Returns:
+            dict: seconds recorded, stages with a summary per stage (see
+                  StageHistogram.summary), counters and gauges
+        """
+        return {
+            "seconds": time.monotonic() - self.started,
+            "stages": {
+                name: histogram.summary()
+                for name, histogram in list(self.stages.items())
+            },
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
+
+    def summary(self):
+        """One line with the p50/p99 of each timed stage and the counters"""
+        snapshot = self.snapshot()
+        parts = [
+            f"{name} p50={stage['p50_ms']:.3f}ms p99={stage['p99_ms']:.3f}ms"
+            f" max={stage['max_ms']:.3f}ms n={stage['count']}"
+            for name, stage in snapshot["stages"].items()
+            if stage["count"]
+        ]
+        parts += [
+            f"{name}={value}" for name, value in sorted(snapshot["counters"].items())
+        ]
+        parts += [
+            f"{name}={value:.0f}" for name, value in sorted(snapshot["gauges"].items())
+        ]
+        return f"over {snapshot['seconds']:.0f}s: " + ("; ".join(parts) or "no data")
+
+
+class SummaryReporter:
+    """Logs PipelineMetrics.summary() periodically on its own thread"""
+
+    def __init__(self, metrics, interval=60.0):
+        """
+        Initialize the reporter
+
+        Args:
+            metrics (PipelineMetrics): Metrics to summarize
+            interval (float): Seconds between summary lines
+        """
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start logging summaries"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="MetricsReporter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop logging summaries, logging a final one"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self.report()
+
+    def report(self):
+        """Log one summary line if metrics are enabled"""
+        if self.metrics.enabled:
+            logger.info("Pipeline metrics %s", self.metrics.summary())
+
+    def _run(self):
+        """Reporter thread main loop"""
+        while not self._stop.wait(self.interval):
+            self.report()
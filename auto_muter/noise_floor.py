@@ -0,0 +1,104 @@
+"""Background noise level tracking for an adaptive energy threshold."""
+
+import math
+
+
+class NoiseFloorTracker:
+    """
+    Follows the background noise level with minimum statistics
+
+    Speech only ever adds energy, so the quietest moments of the last few
+    seconds are the noise. The frame energies are smoothed and the minimum
+    is kept per sub-window; the floor is the lowest of the last few
+    sub-window minima, scaled up by bias because a minimum sits below the
+    average noise level. Memory is a fixed number of sub-windows and each
+    frame costs a comparison, so the floor follows an HVAC switching on
+    within one window and a quieter room at once, at constant cost.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        window=10.0,
+        subwindows=8,
+        smoothing=0.2,
+        bias=1.25,
+        margin_db=10.0,
+        min_threshold=100.0,
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            window (float): Seconds the minimum is taken over; longer than
+                            the longest stretch of continuous speech
+            subwindows (int): Sub-windows the window is split into
+            smoothing (float): Time constant in seconds of the smoothing
+                               applied before taking the minimum
+            bias (float): Factor from the minimum to the average noise level
+            margin_db (float): Threshold above the floor in dB
+            min_threshold (float): Lowest threshold, for digital silence
+        """
+        self.window = window
+        self.subwindows = subwindows
+        self.smoothing = smoothing
+        self.bias = bias
+        self.margin_db = margin_db
+        self.min_threshold = min_threshold
+        self.reset()
+
+    def reset(self):
+        """Forget the noise seen so far"""
+        self._minima = [math.inf] * self.subwindows
+        self._slot = 0
+        self._window_min = math.inf
+        self._current_min = math.inf
+        self._current_start = None
+        self._smoothed = None
+        self._last_time = None
+        self.floor = None
+
+    @property
+    def threshold(self):
+        """Energy threshold margin_db above the floor, None while warming up"""
+        if self.floor is None:
+            return None
+        return max(self.floor * 10 ** (self.margin_db / 20), self.min_threshold)
+
+    def update(self, energy, now):
+        """
+        Track one frame
+
+        Args:
+            energy (float): RMS energy of the frame
+            now (float): Time of the frame in seconds
+
+        Returns:
+            float or None: Noise floor, None until a first sub-window is
+                           complete
+        """
+        if self._smoothed is None:
+            self._smoothed = energy
+            self._current_start = now
+        else:
+            elapsed = max(now - self._last_time, 0.0)
+            weight = 1.0 - math.exp(-elapsed / self.smoothing)
+            self._smoothed += weight * (energy - self._smoothed)
+        self._last_time = now
+        if self._smoothed < self._current_min:
+            self._current_min = self._smoothed
+
+        duration = self.window / self.subwindows
+        if now - self._current_start >= duration:
+            # After a long gap at most every sub-window needs replacing
+            passed = min(int((now - self._current_start) / duration), self.subwindows)
+            for _ in range(passed):
+                self._minima[self._slot] = self._current_min
+                self._slot = (self._slot + 1) % self.subwindows
+                self._current_min = math.inf
+            self._current_min = self._smoothed
+            self._current_start = now
+            self._window_min = min(self._minima)
+
+        if self._window_min != math.inf:
+            self.floor = min(self._window_min, self._current_min) * self.bias
+        return self.floor
@@ -0,0 +1,153 @@
+"""Background sampling of the speaker output level."""
+
+import collections
+import logging
+import threading
+import time
+
+from auto_muter.audio_controller import (initialize_com_thread,
+                                         uninitialize_com_thread)
+
+logger = logging.getLogger(__name__)
+
+# Peak level above which output counts as playing, approximately -60dB
+PLAYING_THRESHOLD = 0.001
+
+OutputLevel = collections.namedtuple("OutputLevel", ["peak", "held_peak", "time"])
+OutputLevel.__doc__ = """
+Latest output level reading
+
+peak is the most recent meter value, held_peak the maximum over the hold
+window and time the time.monotonic() value of the reading.
+"""
+
+_SILENT = OutputLevel(0.0, 0.0, float("-inf"))
+
+
+class OutputLevelSampler:
+    """
+    Samples the output peak meter on its own thread
+
+    Like the MuteDispatcher, the sampler creates its controller on its own
+    thread. Each reading replaces a single OutputLevel tuple, so readers
+    get a consistent value with one attribute load and never wait on the
+    meter.
+    """
+
+    def __init__(
+        self,
+        controller_factory,
+        rate=50.0,
+        hold=0.5,
+        threshold=PLAYING_THRESHOLD,
+        owns_controller=False,
+    ):
+        """
+        Initialize the sampler
+
+        Args:
+            controller_factory (callable): Creates the controller whose
+                                           get_peak_meter_value() is sampled
+            rate (float): Samples per second
+            hold (float): Seconds a peak is held, so sounds shorter than
+                          the reader's interval are not missed
+            threshold (float): Held peak above which output counts as playing
+            owns_controller (bool): Close the controller when the sampler stops
+        """
+        self.controller_factory = controller_factory
+        self.rate = rate
+        self.hold = hold
+        self.threshold = threshold
+        self.owns_controller = owns_controller
+        self.latest = _SILENT
+        # (time, peak) with decreasing peaks, the front is the held maximum
+        self._window = collections.deque()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """Whether the sampler thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="OutputLevelSampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop sampling and reset the level"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._window.clear()
+        self.latest = _SILENT
+
+    def record(self, peak, now):
+        """
+        Add one meter reading and publish the new level
+
+        Args:
+            peak (float): Meter value, negative values mean no reading
+            now (float): time.monotonic() value of the reading
+        """
+        peak = max(peak, 0.0)
+        window = self._window
+        while window and window[-1][1] <= peak:
+            window.pop()
+        window.append((now, peak))
+        while window[0][0] < now - self.hold:
+            window.popleft()
+        self.latest = OutputLevel(peak, window[0][1], now)
+
+    def is_playing(self, now=None):
+        """
+        Whether output was playing within the hold window
+
+        A reading older than the hold window, e.g. because the sampler has
+        stopped, counts as silence.
+
+        Args:
+            now (float): time.monotonic() value, defaults to the current time
+        """
+        level = self.latest
+        if now is None:
+            now = time.monotonic()
+        return level.held_peak > self.threshold and now - level.time <= self.hold
+
+    def _run(self):
+        """Sampler thread main loop"""
+        com_initialized = initialize_com_thread()
+        controller = None
+        try:
+            controller = self.controller_factory()
+            interval = 1.0 / self.rate
+            next_time = time.monotonic()
+            while not self._stop_event.is_set():
+                try:
+                    peak = controller.get_peak_meter_value()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.debug("Error sampling output level: %s", e)
+                    peak = -1
+                self.record(peak, time.monotonic())
+
+                # Keep a steady rate without drifting by the call's latency
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay < 0:
+                    next_time = time.monotonic()
+                    delay = 0
+                self._stop_event.wait(delay)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Output level sampler failed: %s", e)
+        finally:
+            if self.owns_controller and hasattr(controller, "close"):
+                controller.close()
+            if com_initialized:
+                uninitialize_com_thread()
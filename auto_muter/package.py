@@ -69,7 +69,7 @@ def package_exe():
     if exe_path.exists():
         with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
             zipf.write(exe_path, arcname="AutoMuter.exe")
-        logger.error("Packaged: %s", zip_path)
+        logger.info("Packaged: %s", zip_path)
 
         output_file = os.environ.get("GITHUB_OUTPUT")
         if output_file:
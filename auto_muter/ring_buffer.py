@@ -0,0 +1,157 @@
+"""Fixed-capacity audio ring buffer with overlapping analysis windows."""
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Single-producer/single-consumer ring of PCM samples
+
+    The first ``window_size - 1`` slots are mirrored past the end of the
+    storage, so every analysis window is a contiguous view even when it
+    wraps around. The producer never waits for the consumer: if the
+    consumer falls more than a full buffer behind, the lost windows are
+    skipped and counted in ``overruns``.
+
+    With several channels the unit is an interleaved frame: counts are in
+    frames and windows are (window_size, channels) views.
+    """
+
+    def __init__(
+        self, capacity, window_size, hop_size=None, dtype=np.int16, channels=1
+    ):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity (int): Number of samples (frames) retained
+            window_size (int): Samples per analysis window
+            hop_size (int): Samples between window starts, defaults to
+                            window_size (no overlap)
+            dtype: Sample type stored in the buffer
+            channels (int): Interleaved channels per frame
+        """
+        hop_size = window_size if hop_size is None else hop_size
+        if window_size <= 0 or hop_size <= 0:
+            raise ValueError("window_size and hop_size must be positive")
+        if capacity < window_size + hop_size:
+            raise ValueError("capacity must hold at least one window plus one hop")
+
+        self.capacity = capacity
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self._mirror = window_size - 1
+        self.channels = channels
+        shape = capacity + self._mirror
+        if channels > 1:
+            shape = (shape, channels)
+        self._storage = np.zeros(shape, dtype=dtype)
+        self._bytes = memoryview(self._storage).cast("B")
+        # Bytes per frame, the unit all counters are in
+        self._itemsize = self._storage.itemsize * channels
+
+        # Monotonic sample counters, each only written by one side
+        self._written = 0
+        self._next_window = 0
+        self.overruns = 0
+
+    @property
+    def overlap(self):
+        """Samples shared by two consecutive windows"""
+        return max(self.window_size - self.hop_size, 0)
+
+    @property
+    def available(self):
+        """Number of complete windows ready to be read"""
+        pending = self._written - self._next_window - self.window_size
+        return 0 if pending < 0 else pending // self.hop_size + 1
+
+    def write(self, data):
+        """
+        Append samples, overwriting the oldest ones once full
+
+        Args:
+            data (bytes or numpy.ndarray): Raw PCM bytes or an array of samples
+        """
+        if isinstance(data, np.ndarray):
+            data = memoryview(np.ascontiguousarray(data, self._storage.dtype))
+            data = data.cast("B")
+        count = len(data) // self._itemsize
+        if count > self.capacity:
+            # Only the newest samples can be kept
+            skip = count - self.capacity
+            data = memoryview(data)[skip * self._itemsize :]
+            self._written += skip
+            count = self.capacity
+
+        start = self._written % self.capacity
+        first = min(count, self.capacity - start)
+        self._copy_in(start, data, 0, first)
+        if first < count:
+            self._copy_in(0, data, first, count - first)
+        self._written += count
+
+    def _copy_in(self, position, data, offset, count):
+        """Copy count samples to position, keeping the mirrored tail in sync"""
+        size = self._itemsize
+        src = memoryview(data)[offset * size : (offset + count) * size]
+        self._bytes[position * size : (position + count) * size] = src
+        if position < self._mirror:
+            mirrored = min(count, self._mirror - position)
+            end = position + self.capacity
+            self._bytes[end * size : (end + mirrored) * size] = src[: mirrored * size]
+
+    def read_window(self):
+        """
+        Return the next analysis window and advance by one hop
+
+        Returns:
+            numpy.ndarray or None: Read-only view of window_size samples, or
+                                   None if no complete window is available.
+                                   The view is only valid until the producer
+                                   laps it, so consume it before the next
+                                   capacity - window_size samples arrive.
+        """
+        written = self._written
+        oldest = written - self.capacity
+        if self._next_window < oldest:
+            # Consumer fell behind, jump to the oldest window still intact
+            lag = oldest - self._next_window
+            self._next_window += -(-lag // self.hop_size) * self.hop_size
+            self.overruns += 1
+
+        if written - self._next_window < self.window_size:
+            return None
+
+        start = self._next_window % self.capacity
+        self._next_window += self.hop_size
+        window = self._storage[start : start + self.window_size]
+        window.flags.writeable = False
+        return window
+
+    def latest(self, count):
+        """
+        Return a copy of the most recent samples, for look-back analysis
+
+        Args:
+            count (int): Number of samples, at most the capacity
+
+        Returns:
+            numpy.ndarray: Up to count of the newest samples, oldest first
+        """
+        count = min(count, self._written, self.capacity)
+        end = self._written % self.capacity
+        if count <= end:
+            return self._storage[end - count : end].copy()
+        return np.concatenate(
+            (
+                self._storage[self.capacity - (count - end) : self.capacity],
+                self._storage[:end],
+            )
+        )
+
+    def reset(self):
+        """Discard all buffered samples and counters"""
+        self._written = 0
+        self._next_window = 0
+        self.overruns = 0
@@ -0,0 +1,257 @@
+"""Per-application output level metering through audio sessions."""
+
+import logging
+import threading
+
+try:
+    from pycaw.callbacks import AudioSessionEvents, AudioSessionNotification
+    from pycaw.pycaw import (AudioSession, AudioUtilities,
+                             IAudioMeterInformation, IAudioSessionControl2)
+
+    CORE_AUDIO_IMPORT_ERROR = None
+except ImportError as import_error:  # Core Audio only exists on Windows
+    CORE_AUDIO_IMPORT_ERROR = import_error
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLevelMonitor:
+    """
+    Output peak of the audio sessions of selected applications
+
+    Sessions are enumerated once by start() and then kept up to date from
+    the session manager's created/expired notifications, so sweeping the
+    meters never re-enumerates. The list of meters is replaced rather than
+    modified on each notification, which lets sweep() run without a lock.
+
+    A monitor has get_peak_meter_value() and close() like AudioController,
+    so it can be sampled by an OutputLevelSampler in its place.
+    """
+
+    def __init__(self, manager, include=None, exclude=None):
+        """
+        Initialize the monitor
+
+        Args:
+            manager: Session manager with sessions(), watch(on_created,
+                     on_expired) and unwatch(), e.g. CoreAudioSessionManager
+            include (list[str]): Process names to meter, all if empty
+            exclude (list[str]): Process names never metered
+        """
+        self.manager = manager
+        self.include = {name.lower() for name in include or ()}
+        self.exclude = {name.lower() for name in exclude or ()}
+        # Per-session peaks from the last sweep, keyed by session key
+        self.peaks = {}
+        self._sessions = ()
+        self._lock = threading.Lock()
+
+    @property
+    def sessions(self):
+        """Sessions currently being metered"""
+        return self._sessions
+
+    def allows(self, process_name):
+        """
+        Whether sessions of a process are metered
+
+        Args:
+            process_name (str): Executable name, e.g. "Teams.exe"
+        """
+        name = (process_name or "").lower()
+        if name in self.exclude:
+            return False
+        return not self.include or name in self.include
+
+    def start(self):
+        """Subscribe to session changes and enumerate the existing sessions"""
+        # Subscribe first so a session created during enumeration is not lost
+        self.manager.watch(self._on_session_created, self._on_session_expired)
+        for session in self.manager.sessions():
+            self._on_session_created(session)
+        logger.info("Metering %d audio sessions", len(self._sessions))
+        return self
+
+    def close(self):
+        """Stop following session changes"""
+        self.manager.unwatch()
+        with self._lock:
+            self._sessions = ()
+        self.peaks = {}
+
+    def _on_session_created(self, session):
+        """Start metering a new session if its process is selected"""
+        if not self.allows(session.process_name):
+            return
+        with self._lock:
+            if any(known.key == session.key for known in self._sessions):
+                return
+            self._sessions = self._sessions + (session,)
+        logger.debug("Metering session of %s", session.process_name)
+
+    def _on_session_expired(self, key):
+        """Stop metering a session that has ended"""
+        with self._lock:
+            self._sessions = tuple(
+                session for session in self._sessions if session.key != key
+            )
+
+    def sweep(self):
+        """
+        Read every metered session's peak in one pass
+
+        Returns:
+            float: Highest peak across the sessions, 0.0 if there are none
+        """
+        peaks = {}
+        for session in self._sessions:
+            try:
+                peaks[session.key] = session.read_peak()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.debug("Error reading session meter: %s", e)
+                peaks[session.key] = 0.0
+        self.peaks = peaks
+        return max(peaks.values(), default=0.0)
+
+    def get_peak_meter_value(self):
+        """Highest session peak, see sweep()"""
+        return self.sweep()
+
+
+class CoreAudioSession:
+    """One Windows audio session with its peak meter"""
+
+    def __init__(self, audio_session):
+        """
+        Initialize the session
+
+        Args:
+            audio_session (pycaw.utils.AudioSession): Session to meter
+        """
+        self.audio_session = audio_session
+        self.key = audio_session.InstanceIdentifier
+        process = audio_session.Process
+        self.process_name = process.name() if process is not None else ""
+        # pylint: disable-next=protected-access
+        self._meter = audio_session._ctl.QueryInterface(IAudioMeterInformation)
+        self._events = None
+
+    def read_peak(self):
+        """Current peak level of the session"""
+        return self._meter.GetPeakValue()
+
+    def watch(self, on_expired):
+        """Call on_expired(key) when the session expires or disconnects"""
+        self._events = _SessionEvents(lambda: on_expired(self.key))
+        self.audio_session.register_notification(self._events)
+
+    def unwatch(self):
+        """Stop watching for expiry"""
+        if self._events is not None:
+            self.audio_session.unregister_notification()
+            self._events = None
+
+
+class CoreAudioSessionManager:
+    """Sessions of the default speakers through IAudioSessionManager2"""
+
+    def __init__(self):
+        """Initialize the manager"""
+        if CORE_AUDIO_IMPORT_ERROR is not None:
+            raise OSError(
+                f"Windows Core Audio is not available: {CORE_AUDIO_IMPORT_ERROR}"
+            )
+        self._manager = AudioUtilities.GetAudioSessionManager()
+        self._notification = None
+        self._on_expired = None
+        # Sessions watched for expiry, keyed by session key
+        self._watched = {}
+
+    def sessions(self):
+        """
+        Enumerate the current sessions
+
+        Returns:
+            list[CoreAudioSession]: One entry per session
+        """
+        sessions = []
+        enumerator = self._manager.GetSessionEnumerator()
+        for index in range(enumerator.GetCount()):
+            control = enumerator.GetSession(index)
+            if control is None:
+                continue
+            sessions.append(self._wrap(control.QueryInterface(IAudioSessionControl2)))
+        return sessions
+
+    def watch(self, on_created, on_expired):
+        """
+        Report session changes
+
+        Args:
+            on_created (callable): Called with each new CoreAudioSession
+            on_expired (callable): Called with the key of each ended session
+        """
+        self._on_expired = on_expired
+        self._notification = _SessionCreated(
+            lambda audio_session: on_created(self._wrap_control(audio_session))
+        )
+        self._manager.RegisterSessionNotification(self._notification)
+
+    def unwatch(self):
+        """Stop reporting session changes"""
+        if self._notification is not None:
+            self._manager.UnregisterSessionNotification(self._notification)
+            self._notification = None
+        for session in self._watched.values():
+            session.unwatch()
+        self._watched = {}
+        self._on_expired = None
+
+    def _wrap(self, control):
+        """Wrap an IAudioSessionControl2 as a CoreAudioSession"""
+        return self._wrap_control(AudioSession(control))
+
+    def _wrap_control(self, audio_session):
+        """Wrap a pycaw AudioSession and watch it for expiry"""
+        session = CoreAudioSession(audio_session)
+        if self._on_expired is not None and session.key not in self._watched:
+            session.watch(self._session_expired)
+            self._watched[session.key] = session
+        return session
+
+    def _session_expired(self, key):
+        """Forget an expired session and report it"""
+        self._watched.pop(key, None)
+        on_expired = self._on_expired
+        if on_expired is not None:
+            on_expired(key)
+
+
+if CORE_AUDIO_IMPORT_ERROR is None:
+
+    class _SessionCreated(AudioSessionNotification):
+        """Forwards IAudioSessionNotification callbacks to a function"""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def on_session_created(self, new_session):
+            """Called by Windows on a COM worker thread"""
+            self.callback(new_session)
+
+    class _SessionEvents(AudioSessionEvents):
+        """Calls a function when its session expires or is disconnected"""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def on_state_changed(self, new_state, new_state_id):
+            """Called by Windows on a COM worker thread"""
+            if new_state == "Expired":
+                self.callback()
+
+        def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+            """Called by Windows on a COM worker thread"""
+            self.callback()
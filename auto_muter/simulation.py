@@ -0,0 +1,305 @@
+"""Simulated backends for running AutoMuter without Windows audio hardware."""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedAudioController:
+    """Drop-in replacement for AudioController that keeps the state in memory"""
+
+    def __init__(self, muted=False, audio_playing=False, latency=0.0):
+        """
+        Initialize the simulated controller
+
+        Args:
+            muted (bool): Initial mute state
+            audio_playing (bool): Value reported by is_audio_playing()
+            latency (float): Seconds each mute command takes, to mimic a slow
+                             endpoint
+        """
+        self.initialized = True
+        self.output_monitor_initialized = True
+        self.muted = muted
+        self.audio_playing = audio_playing
+        self.latency = latency
+        self.calls = 0
+        # (time.perf_counter(), muted) for every mute command
+        self.history = []
+        self._lock = threading.Lock()
+        self._mute_listeners = []
+
+    def _apply(self, muted):
+        """Apply a mute command after the configured latency"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            self.muted = muted
+            self.history.append((time.perf_counter(), muted))
+            return muted
+
+    def is_audio_playing(self):
+        """Return the configured output state"""
+        return self.audio_playing
+
+    def get_peak_meter_value(self):
+        """Return a peak value consistent with is_audio_playing()"""
+        return 0.5 if self.audio_playing else 0.0
+
+    def get_mute_state(self):
+        """Return the simulated mute state"""
+        return self.muted
+
+    def set_mute_state(self, should_mute):
+        """Set the simulated mute state"""
+        return self._apply(bool(should_mute))
+
+    def toggle_mute(self):
+        """Toggle the simulated mute state"""
+        return self._apply(not self.muted)
+
+    def add_mute_listener(self, callback):
+        """Call callback(muted) on external_mute_change()"""
+        self._mute_listeners.append(callback)
+
+    def remove_mute_listener(self, callback):
+        """Stop calling a listener added with add_mute_listener()"""
+        if callback in self._mute_listeners:
+            self._mute_listeners.remove(callback)
+
+    def external_mute_change(self, muted):
+        """Change the state as if the user muted from the taskbar"""
+        with self._lock:
+            changed = self.muted != muted
+            self.muted = muted
+        if changed:
+            for callback in list(self._mute_listeners):
+                callback(muted)
+
+    def close(self):
+        """Nothing to release"""
+
+
+class FakeMuteNotifier:
+    """
+    Mute change source for AudioController.watch_mute_changes() that tests
+    drive by hand with emit()
+    """
+
+    def __init__(self):
+        """Initialize the notifier"""
+        self.callback = None
+
+    @property
+    def started(self):
+        """Whether a controller is subscribed"""
+        return self.callback is not None
+
+    def start(self, callback):
+        """Subscribe the controller"""
+        self.callback = callback
+
+    def stop(self):
+        """Unsubscribe the controller"""
+        self.callback = None
+
+    def emit(self, muted, event_context=None):
+        """
+        Deliver a notification as Windows would
+
+        Args:
+            muted (bool): New mute state
+            event_context: GUID the change was made with, e.g.
+                           audio_controller.EVENT_CONTEXT for our own commands
+        """
+        if self.callback is not None:
+            self.callback(bool(muted), event_context)
+
+
+class SimulatedSession:
+    """Audio session of one application with a settable peak level"""
+
+    def __init__(self, key, process_name, peak=0.0):
+        """
+        Initialize the session
+
+        Args:
+            key (str): Unique session identifier
+            process_name (str): Executable name, e.g. "Teams.exe"
+            peak (float): Value returned by read_peak()
+        """
+        self.key = key
+        self.process_name = process_name
+        self.peak = peak
+        self.reads = 0
+
+    def read_peak(self):
+        """Return the configured peak level"""
+        self.reads += 1
+        return self.peak
+
+
+class SimulatedSessionManager:
+    """
+    Stand-in for CoreAudioSessionManager
+
+    Tests add and remove sessions with create_session() and
+    expire_session(), which notify the watcher like Windows would.
+    """
+
+    def __init__(self, sessions=()):
+        """
+        Initialize the manager
+
+        Args:
+            sessions (list[SimulatedSession]): Sessions that already exist
+        """
+        self._sessions = {session.key: session for session in sessions}
+        self.enumerations = 0
+        self._on_created = None
+        self._on_expired = None
+
+    def sessions(self):
+        """Enumerate the current sessions"""
+        self.enumerations += 1
+        return list(self._sessions.values())
+
+    def watch(self, on_created, on_expired):
+        """Report session changes to the given callbacks"""
+        self._on_created = on_created
+        self._on_expired = on_expired
+
+    def unwatch(self):
+        """Stop reporting session changes"""
+        self._on_created = None
+        self._on_expired = None
+
+    def create_session(self, key, process_name, peak=0.0):
+        """Add a session as if an application started playing"""
+        session = SimulatedSession(key, process_name, peak)
+        self._sessions[key] = session
+        if self._on_created is not None:
+            self._on_created(session)
+        return session
+
+    def expire_session(self, key):
+        """Remove a session as if its application closed it"""
+        self._sessions.pop(key, None)
+        if self._on_expired is not None:
+            self._on_expired(key)
+
+
+class SimulatedPyAudio:
+    """Stand-in for pyaudio.PyAudio whose input streams play samples in real time"""
+
+    def __init__(self, samples, rate=16000):
+        """
+        Initialize the simulated host
+
+        Args:
+            samples (numpy.ndarray): Mono int16 samples every stream plays back
+            rate (int): Native rate of the simulated device, the rate the
+                        samples were recorded at
+        """
+        self.samples = np.ascontiguousarray(samples, np.int16)
+        self.rate = rate
+        self.streams = []
+
+    def get_default_input_device_info(self):
+        """Describe the one simulated input device"""
+        return {
+            "index": 0,
+            "name": "Simulated Microphone",
+            "maxInputChannels": 1,
+            "defaultSampleRate": float(self.rate),
+        }
+
+    def get_device_info_by_index(self, index):
+        """Describe a device, every index is the simulated one"""
+        del index
+        return self.get_default_input_device_info()
+
+    def open(self, rate, frames_per_buffer, stream_callback=None, **kwargs):
+        """Open a stream with the subset of pyaudio.PyAudio.open() used here"""
+        del kwargs  # format, channels, input and device index are ignored
+        stream = SimulatedInputStream(
+            self.samples, rate, frames_per_buffer, stream_callback
+        )
+        self.streams.append(stream)
+        return stream
+
+    def terminate(self):
+        """Close any stream still open"""
+        for stream in self.streams:
+            stream.close()
+
+
+class SimulatedInputStream:
+    """
+    Input stream that makes each chunk available once its audio has "played"
+
+    started_at holds the time.perf_counter() value at which sample 0 was
+    captured, so sample n is captured at started_at + n / rate. Once the
+    samples run out the stream keeps producing silence.
+    """
+
+    def __init__(self, samples, rate, chunk_size, callback=None):
+        """
+        Initialize the stream
+
+        Args:
+            samples (numpy.ndarray): int16 samples to play
+            rate (int): Sample rate in Hz
+            chunk_size (int): Frames per chunk
+            callback (callable): PyAudio style stream callback
+        """
+        self._samples = samples
+        self._rate = rate
+        self._chunk_size = chunk_size
+        self._callback = callback
+        self._silence = bytes(chunk_size * samples.itemsize)
+        self._index = 0
+        self._active = True
+        self.started_at = time.perf_counter()
+        self._thread = None
+        if callback is not None:
+            self._thread = threading.Thread(target=self._run_callback, daemon=True)
+            self._thread.start()
+
+    def _next_chunk(self):
+        """Wait until the next chunk has been captured and return it"""
+        start = self._index * self._chunk_size
+        self._index += 1
+        ready_at = self.started_at + (start + self._chunk_size) / self._rate
+        delay = ready_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        chunk = self._samples[start : start + self._chunk_size].tobytes()
+        return chunk + self._silence[len(chunk) :]
+
+    def _run_callback(self):
+        """Deliver chunks to the callback like PortAudio's audio thread"""
+        while self._active:
+            data = self._next_chunk()
+            if self._active:
+                self._callback(data, self._chunk_size, {}, 0)
+
+    def read(self, num_frames, exception_on_overflow=True):
+        """Blocking read of the next chunk"""
+        del num_frames, exception_on_overflow  # Always one chunk
+        return self._next_chunk()
+
+    def stop_stream(self):
+        """Stop delivering chunks"""
+        self._active = False
+
+    def close(self):
+        """Stop the stream and wait for the callback thread"""
+        self._active = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
@@ -0,0 +1,574 @@
+"""Audio input sources feeding the AudioMuter detection pipeline."""
+
+import logging
+import time
+import wave
+
+import numpy as np
+import pyaudio
+
+from auto_muter.capture import create_capture
+from auto_muter.dsp import SAMPLE_WIDTH, Resampler
+from auto_muter.host import get_host_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 16000
+
+
+class AudioSource:
+    """
+    Base class for 16-bit PCM sources read chunk by chunk
+
+    Subclasses implement read() and may override start(), stop(),
+    interrupt() and now(). A source that reaches its end sets finished.
+    Sources with several channels return interleaved frames.
+    """
+
+    channels = 1
+
+    def __init__(self, chunk_size=1024, rate=DEFAULT_RATE):
+        """
+        Initialize the source
+
+        Args:
+            chunk_size (int): Samples returned per read
+            rate (int): Sample rate in Hz
+        """
+        self.chunk_size = chunk_size
+        self.rate = rate
+        self.finished = False
+
+    def start(self):
+        """Prepare the source for reading"""
+
+    def read(self, timeout=None):
+        """
+        Return the next chunk
+
+        Args:
+            timeout (float): Maximum seconds a live source waits for it, or
+                             None for the source's default
+
+        Returns:
+            bytes or None: Raw PCM chunk, or None if nothing is available yet
+        """
+        raise NotImplementedError
+
+    def now(self):
+        """time.monotonic() timestamp of the most recently read chunk"""
+        return time.monotonic()
+
+    def interrupt(self):
+        """Wake up a reader blocked in read()"""
+
+    def stop(self):
+        """Release any resources held by the source"""
+
+    @property
+    def backlog(self):
+        """Chunks already captured and waiting to be read"""
+        return 0
+
+
+class MicrophoneSource(AudioSource):
+    """
+    Live capture from a PyAudio input device
+
+    The device is opened at its native rate, so neither the driver nor the
+    OS resamples, and the chunks are resampled to the analysis rate here.
+    Chunks last chunk_duration, rounded to whole resampling periods so that
+    every chunk yields the same number of frames; chunk_size and rate are
+    the analysis frames per chunk and the analysis rate once started.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        input_device="default",
+        capture_mode="callback",
+        host=None,
+        channels=1,
+        chunk_duration=None,
+        **kwargs,
+    ):
+        """
+        Initialize the source
+
+        Args:
+            input_device (str): Device index as a string, or "default"
+            capture_mode (str): "callback" or "blocking", see capture.py
+            host (callable): Factory for a PyAudio host owned by the
+                             source, the process-wide HostSession is
+                             borrowed by default
+            channels (int): Channels to capture, delivered interleaved
+            chunk_duration (float): Seconds per chunk, chunk_size / rate by
+                                    default
+            kwargs: chunk_size and rate of the analysis, see AudioSource
+        """
+        super().__init__(**kwargs)
+        self.input_device = input_device
+        self.capture_mode = capture_mode
+        self.channels = channels
+        self.chunk_duration = chunk_duration or self.chunk_size / self.rate
+        self.native_rate = None
+        self.host = host
+        self._session = None
+        self._pa = None
+        self._capture = None
+        self._resampler = None
+
+    def start(self):
+        """Open the input stream"""
+        # Get the device index if not using default
+        device_index = None
+        if self.input_device != "default" and self.input_device.isdigit():
+            device_index = int(self.input_device)
+
+        if self.host is None:
+            self._session = get_host_session()
+            self._pa = self._session.acquire()
+        else:
+            self._pa = self.host()
+        try:
+            self.native_rate = self._native_rate(device_index)
+            resampler = Resampler(self.native_rate, self.rate, self.channels)
+            periods = round(self.chunk_duration * self.native_rate / resampler.period)
+            native_chunk = max(periods, 1) * resampler.period
+            self.chunk_size = native_chunk * resampler.up // resampler.down
+            self._resampler = None if resampler.passthrough else resampler
+            self._capture = create_capture(
+                self.capture_mode,
+                self._pa,
+                native_chunk,
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.native_rate,
+                input_device_index=device_index,
+            )
+            self._capture.start()
+        except Exception:
+            self._release_host()
+            raise
+        if self._resampler is not None:
+            logger.info(
+                "Capturing at %d Hz, resampled to %d Hz", self.native_rate, self.rate
+            )
+
+    def _native_rate(self, device_index):
+        """Default sample rate of the device, the analysis rate if unknown"""
+        try:
+            if device_index is None:
+                info = self._pa.get_default_input_device_info()
+            else:
+                info = self._pa.get_device_info_by_index(device_index)
+            return int(info["defaultSampleRate"])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Could not read the device sample rate: %s", e)
+            return self.rate
+
+    def read(self, timeout=None):
+        """Wait for the next captured chunk, resampled to the analysis rate"""
+        if timeout is None:
+            data = self._capture.read()
+        else:
+            data = self._capture.read(timeout)
+        if data is None or self._resampler is None:
+            return data
+        return self._resampler.process(data)
+
+    @property
+    def backlog(self):
+        """Chunks captured but not yet read"""
+        return self._capture.backlog if self._capture is not None else 0
+
+    def interrupt(self):
+        """Wake up the reader"""
+        if self._capture is not None:
+            self._capture.interrupt()
+
+    def stop(self):
+        """Close the stream and release the PyAudio host"""
+        if self._capture is not None:
+            self._capture.stop()
+            self._capture = None
+        self._release_host()
+
+    def _release_host(self):
+        """Return the shared host, or terminate one the source created"""
+        if self._session is not None:
+            self._session.release()
+            self._session = None
+        elif self._pa is not None:
+            self._pa.terminate()
+        self._pa = None
+
+
+class MultiDeviceSource(AudioSource):
+    """
+    Reads several sources together and returns their chunks side by side
+
+    Each read() waits for the next chunk of every device and returns them
+    as the columns of one (chunk_size, devices) int16 array, so devices are
+    aligned chunk by chunk. All devices share one deadline of about a chunk
+    duration, so a device that stops delivering only silences its own column
+    instead of holding back the others. Live devices should use callback
+    capture: then PortAudio's own threads capture every device and this
+    source only collects the chunks, with no extra thread per device. Clock
+    drift between devices shows up as a growing backlog on the faster one,
+    which is trimmed to keep them aligned.
+
+    A device that fails to start, raises while reading or misses the
+    deadline for max_misses reads in a row is dropped; its column stays
+    silent and it is left out of active, so the remaining devices keep
+    working.
+    """
+
+    def __init__(self, sources, max_misses=16, **kwargs):
+        """
+        Initialize the source
+
+        Args:
+            sources (list[AudioSource]): Mono sources with the same rate
+                                         and chunk size
+            max_misses (int): Consecutive reads a device may miss the
+                              deadline before it is considered failed
+            kwargs: chunk_size and rate, taken from the first source by
+                    default
+        """
+        if any(source.channels != 1 for source in sources):
+            raise ValueError("Every device of a MultiDeviceSource must be mono")
+        kwargs.setdefault("chunk_size", sources[0].chunk_size)
+        kwargs.setdefault("rate", sources[0].rate)
+        super().__init__(**kwargs)
+        self.sources = list(sources)
+        self.channels = len(self.sources)
+        self.max_misses = max_misses
+        self.active = np.ones(self.channels, dtype=bool)
+        self.realigned = 0
+        self._misses = [0] * self.channels
+        self._now = 0.0
+        self._frames = np.zeros((self.chunk_size, self.channels), dtype=np.int16)
+
+    def start(self):
+        """Start every device, dropping those that fail"""
+        self.active[:] = True
+        self.finished = False
+        for index, source in enumerate(self.sources):
+            try:
+                source.start()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._drop(index, f"could not start: {e}")
+        if not self.active.any():
+            raise OSError("None of the input devices could be started")
+
+        # Live devices only know their chunk size once opened at their
+        # native rate; chunks of other lengths are cut or padded to this one
+        sizes = [
+            self.sources[index].chunk_size for index in np.flatnonzero(self.active)
+        ]
+        if len(set(sizes)) > 1:
+            logger.warning("Input devices deliver chunks of %s frames", sizes)
+        if sizes[0] != self.chunk_size:
+            self.chunk_size = sizes[0]
+            self._frames = np.zeros((self.chunk_size, self.channels), dtype=np.int16)
+
+    def read(self, timeout=None):
+        """
+        Wait for the next chunk of every active device
+
+        Args:
+            timeout (float): Seconds every device has to deliver, by default
+                             one and a half chunk durations to absorb
+                             callback jitter
+
+        Returns:
+            numpy.ndarray or None: (chunk_size, devices) frames, reused by
+                                   the next read, or None if no device
+                                   delivered anything
+        """
+        if timeout is None:
+            timeout = 1.5 * self.chunk_size / self.rate
+        deadline = time.monotonic() + timeout
+        frames = self._frames
+        delivered = False
+        # Wait on the devices that kept up first, so one that stalled only
+        # gets what is left of the deadline
+        active = np.flatnonzero(self.active)
+        for index in sorted(active, key=lambda index: self._misses[index]):
+            source = self.sources[index]
+            try:
+                data = source.read(max(deadline - time.monotonic(), 0.0))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._drop(index, f"read failed: {e}")
+                continue
+            if data is None:
+                if source.finished:
+                    self._drop(index, "finished")
+                else:
+                    self._misses[index] += 1
+                    if self._misses[index] >= self.max_misses:
+                        self._drop(index, "stopped delivering audio")
+                frames[:, index] = 0
+                continue
+            self._misses[index] = 0
+            delivered = True
+            samples = np.frombuffer(data, dtype=np.int16)[: self.chunk_size]
+            frames[: len(samples), index] = samples
+            frames[len(samples) :, index] = 0
+
+        if not self.active.any():
+            self.finished = True
+        self._realign()
+        return frames if delivered else None
+
+    def _realign(self):
+        """Skip a chunk on devices that got ahead of the slowest one"""
+        backlogs = [
+            self.sources[index].backlog for index in np.flatnonzero(self.active)
+        ]
+        if len(backlogs) < 2:
+            return
+        slowest = min(backlogs)
+        for index, backlog in zip(np.flatnonzero(self.active), backlogs):
+            if backlog - slowest >= 2:
+                self.sources[index].read()
+                self.realigned += 1
+
+    def _drop(self, index, reason):
+        """Stop using a device"""
+        self.active[index] = False
+        self._frames[:, index] = 0
+        logger.warning("Input device %d dropped: %s", index, reason)
+        try:
+            self.sources[index].stop()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Error stopping input device %d: %s", index, e)
+
+    def now(self):
+        """
+        Timestamp of the first active device, which all are aligned to, or
+        the last one known once every device is dropped
+        """
+        active = np.flatnonzero(self.active)
+        if len(active):
+            self._now = self.sources[active[0]].now()
+        return self._now
+
+    def interrupt(self):
+        """Wake up the reader"""
+        for source in self.sources:
+            source.interrupt()
+
+    def stop(self):
+        """Stop every device still in use"""
+        for index in np.flatnonzero(self.active):
+            self.sources[index].stop()
+        if self.realigned:
+            logger.info("Realigned input devices %d times", self.realigned)
+
+
+class ArraySource(AudioSource):
+    """
+    Replays int16 samples held in memory
+
+    Timestamps follow the audio position rather than the wall clock, so
+    with realtime=False the whole recording is processed as fast as the
+    pipeline allows while decisions behave as if it were live.
+    """
+
+    def __init__(self, samples, realtime=False, **kwargs):
+        """
+        Initialize the source
+
+        Args:
+            samples (numpy.ndarray): Mono int16 samples, or (frames,
+                                     channels) for interleaved channels
+            realtime (bool): Pace reads to the sample rate instead of
+                             running unthrottled
+            kwargs: chunk_size (in frames) and rate, see AudioSource
+        """
+        super().__init__(**kwargs)
+        samples = np.ascontiguousarray(samples, np.int16)
+        if samples.ndim == 2:
+            self.channels = samples.shape[1]
+        self._frame_size = SAMPLE_WIDTH * self.channels
+        self._data = memoryview(samples.tobytes())
+        self.realtime = realtime
+        self._position = 0
+        self._started_at = None
+
+    @property
+    def samples(self):
+        """Read-only int16 view of the recording, (frames, channels) if interleaved"""
+        samples = np.frombuffer(self._data, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels)
+        return samples
+
+    @property
+    def duration(self):
+        """Length of the recording in seconds"""
+        return len(self._data) / self._frame_size / self.rate
+
+    def start(self):
+        """Rewind to the beginning"""
+        self._position = 0
+        self.finished = False
+        self._started_at = time.monotonic()
+
+    def read(self, timeout=None):
+        """Return the next chunk as a zero-copy view of the recording"""
+        del timeout  # Recorded chunks are always ready
+        start = self._position * self._frame_size
+        end = min(start + self.chunk_size * self._frame_size, len(self._data))
+        if start >= end:
+            self.finished = True
+            return None
+
+        self._position += (end - start) // self._frame_size
+        if self.realtime:
+            delay = self._started_at + self.now() - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return self._data[start:end]
+
+    def now(self):
+        """Position in seconds of the end of the last chunk read"""
+        return self._position / self.rate
+
+
+class WavFileSource(ArraySource):
+    """Replays a 16-bit PCM WAV file, mixing multiple channels down to mono"""
+
+    def __init__(self, path, downmix=True, **kwargs):
+        """
+        Initialize the source
+
+        Args:
+            path (str): Path to the WAV file
+            downmix (bool): Mix channels down to mono, otherwise keep them
+                            interleaved
+            kwargs: realtime and chunk_size, see ArraySource
+        """
+        with wave.open(str(path), "rb") as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+
+        samples = np.frombuffer(frames, dtype="<i2")
+        if channels > 1:
+            samples = samples.reshape(-1, channels)
+            if downmix:
+                samples = samples.mean(axis=1).astype(np.int16)
+        super().__init__(samples, rate=rate, **kwargs)
+        self.path = path
+
+
+class RawPcmSource(ArraySource):
+    """Replays headerless little-endian 16-bit mono PCM"""
+
+    def __init__(self, path, rate=DEFAULT_RATE, **kwargs):
+        """
+        Initialize the source
+
+        Args:
+            path (str): Path to the raw PCM file
+            rate (int): Sample rate the file was recorded at
+            kwargs: realtime and chunk_size, see ArraySource
+        """
+        samples = np.fromfile(path, dtype="<i2")
+        super().__init__(samples, rate=rate, **kwargs)
+        self.path = path
+
+
+class SyntheticSource(ArraySource):
+    """
+    Generates a test signal from a list of segments
+
+    Each segment is a tuple (kind, seconds, amplitude) where kind is
+    "silence", "noise" (white noise with the given RMS), "tone" (a 440 Hz
+    sine with the given RMS), "voice" (a voiced, syllable-modulated
+    harmonic series with the given RMS), "rumble" (noise below 150 Hz with
+    the given RMS, like a fan or a desk thump) or "clicks" (keystrokes,
+    5 ms broadband bursts with the given RMS, eight per second). For
+    example, a quiet room followed by a second of speech-level signal:
+
+        SyntheticSource([("noise", 2.0, 50), ("tone", 1.0, 3000)])
+    """
+
+    def __init__(self, segments, seed=0, rate=DEFAULT_RATE, **kwargs):
+        """
+        Initialize the source
+
+        Args:
+            segments (list[tuple]): (kind, seconds, amplitude) segments
+            seed (int): Seed for the noise generator
+            rate (int): Sample rate in Hz
+            kwargs: realtime and chunk_size, see ArraySource
+        """
+        rng = np.random.default_rng(seed)
+        parts = [generate_segment(segment, rate, rng) for segment in segments]
+        samples = np.concatenate(parts) if parts else np.zeros(0, np.int16)
+        super().__init__(samples, rate=rate, **kwargs)
+        self.segments = segments
+
+
+def generate_segment(segment, rate, rng):
+    """
+    Render one synthetic segment
+
+    Args:
+        segment (tuple): (kind, seconds, amplitude)
+        rate (int): Sample rate in Hz
+        rng (numpy.random.Generator): Noise generator
+
+    Returns:
+        numpy.ndarray: int16 samples
+    """
+    kind, seconds, amplitude = segment
+    count = int(round(seconds * rate))
+    if kind == "silence":
+        signal = np.zeros(count)
+    elif kind == "noise":
+        signal = rng.normal(0.0, amplitude, count)
+    elif kind == "tone":
+        t = np.arange(count) / rate
+        signal = amplitude * np.sqrt(2) * np.sin(2 * np.pi * 440.0 * t)
+    elif kind == "voice":
+        signal = _voice(count, rate)
+        signal *= amplitude / max(np.sqrt(np.mean(signal**2)), 1e-12)
+    elif kind == "rumble":
+        # Low-pass the noise by zeroing its spectrum above 150 Hz
+        spectrum = np.fft.rfft(rng.normal(0.0, 1.0, count))
+        spectrum[np.fft.rfftfreq(count, 1 / rate) > 150.0] = 0
+        signal = np.fft.irfft(spectrum, count)
+        signal *= amplitude / max(np.sqrt(np.mean(signal**2)), 1e-12)
+    elif kind == "clicks":
+        signal = np.zeros(count)
+        length = int(0.005 * rate)
+        click = rng.normal(0.0, 1.0, length) * np.exp(-np.arange(length) / length * 4)
+        click *= amplitude / np.sqrt(np.mean(click**2))
+        for start in range(0, count - length, int(rate / 8)):
+            signal[start : start + length] = click
+    else:
+        raise ValueError(f"Unknown segment kind: {kind}")
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+def _voice(count, rate, pitch=140.0):
+    """
+    Unscaled voiced speech stand-in
+
+    Harmonics of a slowly gliding pitch up to 3.4 kHz, falling off at 6 dB
+    per octave, in 4 Hz syllables.
+    """
+    t = np.arange(count) / rate
+    phase = (
+        2 * np.pi * np.cumsum(pitch * (1 + 0.1 * np.sin(2 * np.pi * 0.5 * t))) / rate
+    )
+    signal = np.zeros(count)
+    for harmonic in range(1, int(3400 // pitch) + 1):
+        signal += np.sin(harmonic * phase) / harmonic
+    return signal * (0.6 + 0.4 * np.sin(2 * np.pi * 4.0 * t))
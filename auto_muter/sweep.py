@@ -0,0 +1,415 @@
+"""Sweep energy_threshold and silence_timeout over a labelled corpus.
+
+A corpus is a folder of WAV recordings, each with an Audacity label file
+of the same name (speech.wav and speech.txt) whose lines hold the start and
+end in seconds of every stretch of speech. Frame energies are computed once
+per recording and cached next to the corpus, so later sweeps only run the
+vectorized MuteDecision over the cached arrays.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from auto_muter.decision import find_transitions
+from auto_muter.dsp import DETECTORS, Resampler, SpectralVad
+from auto_muter.sources import DEFAULT_RATE, WavFileSource
+
+logger = logging.getLogger(__name__)
+
+# Bump when the way energies are computed changes, to ignore old caches
+FEATURE_VERSION = 1
+CACHE_DIR_NAME = ".auto_muter_cache"
+SORT_KEYS = (
+    "clipped_speech_rate",
+    "false_unmutes_per_hour",
+    "open_mic_rate",
+    "toggles_per_hour",
+)
+
+# Recordings of the corpus a worker process evaluates settings against
+_recordings = None
+
+
+def read_labels(path):
+    """
+    Read speech intervals from an Audacity label file
+
+    Args:
+        path (Path): Label file, one "start<TAB>end[<TAB>label]" per line
+
+    Returns:
+        numpy.ndarray: (intervals, 2) start and end times in seconds
+    """
+    intervals = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        fields = line.replace(",", "\t").split()
+        if len(fields) >= 2:
+            intervals.append((float(fields[0]), float(fields[1])))
+    return np.array(intervals, dtype=np.float64).reshape(-1, 2)
+
+
+def compute_energies(path, chunk_size, detector="rms"):
+    """
+    Frame energies of a recording as the pipeline measures them
+
+    Args:
+        path (Path): WAV file, resampled to the analysis rate if needed
+        chunk_size (int): Frames per analysis window at the analysis rate
+        detector (str): "rms" or "spectral", see AudioMuter.detector
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: Energy and end time of every
+                                             complete window
+    """
+    source = WavFileSource(path)
+    samples = source.samples
+    if source.rate != DEFAULT_RATE:
+        samples = Resampler(source.rate, DEFAULT_RATE).process(samples)
+    count = len(samples) // chunk_size
+    work = samples[: count * chunk_size].reshape(count, chunk_size)
+    if detector == "spectral":
+        energies = SpectralVad(chunk_size, DEFAULT_RATE).score(work)
+    else:
+        work = work.astype(np.float64)
+        energies = np.sqrt(np.einsum("ij,ij->i", work, work) / chunk_size)
+    times = np.arange(1, count + 1) * (chunk_size / DEFAULT_RATE)
+    return energies, times
+
+
+def cache_path(path, chunk_size, cache_dir, detector="rms"):
+    """Cache file for a recording, named after what its energies depend on"""
+    stat = path.stat()
+    key = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{chunk_size}"
+    key += f"|{DEFAULT_RATE}|{FEATURE_VERSION}"
+    if detector != "rms":
+        # RMS caches keep their names from before detectors were selectable
+        key += f"|{detector}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"{path.stem}-{digest}.npz"
+
+
+def load_features(path, chunk_size, cache_dir, detector="rms"):
+    """
+    Frame energies of a recording, from the cache when it is up to date
+
+    Args:
+        path (Path): WAV file
+        chunk_size (int): Frames per analysis window
+        cache_dir (Path): Directory of the cached energies
+        detector (str): "rms" or "spectral"
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, bool]: Energies, end times and
+                                                   whether the cache was used
+    """
+    cached = cache_path(path, chunk_size, cache_dir, detector)
+    if cached.exists():
+        try:
+            with np.load(cached) as features:
+                return features["energies"], features["times"], True
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable cache %s: %s", cached, e)
+
+    energies, times = compute_energies(path, chunk_size, detector)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under a temporary name so an interrupted sweep leaves no stub
+    partial = cached.with_suffix(".tmp")
+    with open(partial, "wb") as file:
+        np.savez(file, energies=energies, times=times)
+    os.replace(partial, cached)
+    return energies, times, False
+
+
+def speech_frames(times, intervals, frame_duration):
+    """Whether the middle of each frame falls inside a labelled interval"""
+    if not len(intervals):
+        return np.zeros(len(times), dtype=bool)
+    middles = times - frame_duration / 2
+    # Intervals are sorted so each middle only needs the last one starting
+    # before it
+    intervals = intervals[np.argsort(intervals[:, 0])]
+    index = np.searchsorted(intervals[:, 0], middles, side="right") - 1
+    valid = index >= 0
+    return valid & (middles < intervals[np.maximum(index, 0), 1])
+
+
+def find_recordings(corpus):
+    """
+    WAV files of a corpus that have a label file
+
+    Returns:
+        list[tuple[Path, Path]]: (recording, labels) pairs
+    """
+    pairs = []
+    for path in sorted(Path(corpus).rglob("*.wav")):
+        if CACHE_DIR_NAME in path.parts:
+            continue
+        labels = path.with_suffix(".txt")
+        if labels.exists():
+            pairs.append((path, labels))
+        else:
+            logger.warning("Skipping %s, it has no %s", path, labels.name)
+    return pairs
+
+
+def load_corpus(
+    corpus, chunk_duration=0.064, cache_dir=None, workers=None, detector="rms"
+):
+    """
+    Frame energies and speech labels of every labelled recording
+
+    Recordings missing from the cache are measured in parallel.
+
+    Args:
+        corpus (str): Folder of recordings
+        chunk_duration (float): Seconds per analysis window
+        cache_dir (str): Cache directory, CACHE_DIR_NAME in the corpus by
+                         default
+        workers (int): Worker processes, one per CPU by default
+        detector (str): "rms" or "spectral"
+
+    Returns:
+        tuple[list, int]: (energies, times, speech) per recording, and how
+                          many recordings were read from the cache
+    """
+    chunk_size = max(round(chunk_duration * DEFAULT_RATE), 1)
+    cache_dir = Path(cache_dir or Path(corpus) / CACHE_DIR_NAME)
+    pairs = find_recordings(corpus)
+    paths = [path for path, _ in pairs]
+    if workers == 1 or len(paths) < 2:
+        features = [
+            load_features(path, chunk_size, cache_dir, detector) for path in paths
+        ]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            features = list(
+                pool.map(
+                    load_features,
+                    paths,
+                    [chunk_size] * len(paths),
+                    [cache_dir] * len(paths),
+                    [detector] * len(paths),
+                )
+            )
+
+    recordings = []
+    for (_, labels), (energies, times, _) in zip(pairs, features):
+        speech = speech_frames(times, read_labels(labels), chunk_size / DEFAULT_RATE)
+        recordings.append((energies, times, speech))
+    return recordings, sum(cached for _, _, cached in features)
+
+
+def evaluate(recordings, energy_threshold, silence_timeout):
+    """
+    Replay the mute decisions of one setting over every recording
+
+    Each recording starts muted, like a fresh start of the application.
+
+    Args:
+        recordings (list): (energies, times, speech) per recording
+        energy_threshold (float): Setting to evaluate
+        silence_timeout (float): Setting to evaluate
+
+    Returns:
+        dict: The setting with
+              - clipped_speech_rate: share of speech frames that were muted
+              - false_unmutes_per_hour: unmutes with no speech before the
+                next mute, per hour of audio
+              - open_mic_rate: share of frames without speech that were
+                unmuted
+              - toggles_per_hour: mute state changes per hour of audio
+    """
+    speech_total = clipped = false_unmutes = toggles = opened = 0
+    seconds = 0.0
+    for energies, times, speech in recordings:
+        count = len(energies)
+        if count == 0:
+            continue
+        indices, states, _ = find_transitions(
+            energies,
+            times,
+            energy_threshold,
+            silence_timeout=silence_timeout,
+            muted=True,
+            last_sound_time=0.0,
+        )
+        # Expand the transitions into the mute state each frame was captured
+        # in: a decision only applies from the next frame on
+        bounds = np.concatenate(([0], indices + 1, [count]))
+        bounds = np.minimum(bounds, count)
+        muted = np.repeat(np.concatenate(([True], states)), np.diff(bounds))
+        clipped += int(np.count_nonzero(speech & muted))
+        speech_total += int(np.count_nonzero(speech))
+        opened += int(np.count_nonzero(~speech & ~muted))
+
+        # An unmuted stretch lasts until the next transition or the end
+        ends = np.append(indices[1:], count)[~states]
+        starts = indices[~states]
+        heard = np.concatenate(([0], np.cumsum(speech)))
+        false_unmutes += int(np.count_nonzero(heard[ends] == heard[starts]))
+        toggles += len(indices)
+        seconds += times[-1]
+
+    hours = seconds / 3600 or 1.0
+    frames = sum(len(energies) for energies, _, _ in recordings)
+    silence_total = frames - speech_total
+    return {
+        "energy_threshold": float(energy_threshold),
+        "silence_timeout": float(silence_timeout),
+        "clipped_speech_rate": clipped / speech_total if speech_total else 0.0,
+        "false_unmutes_per_hour": false_unmutes / hours,
+        "open_mic_rate": opened / silence_total if silence_total else 0.0,
+        "toggles_per_hour": toggles / hours,
+    }
+
+
+def _init_worker(recordings):
+    """Hand the corpus to a worker process once, not with every setting"""
+    global _recordings  # pylint: disable=global-statement
+    _recordings = recordings
+
+
+def _evaluate_setting(setting):
+    """Evaluate one (threshold, timeout) pair in a worker process"""
+    return evaluate(_recordings, *setting)
+
+
+def sweep(recordings, thresholds, timeouts, workers=None):
+    """
+    Evaluate every combination of thresholds and timeouts
+
+    Args:
+        recordings (list): See load_corpus()
+        thresholds (list[float]): energy_threshold values
+        timeouts (list[float]): silence_timeout values
+        workers (int): Worker processes, one per CPU by default; 1 runs in
+                       this process
+
+    Returns:
+        list[dict]: evaluate() result per setting, in grid order
+    """
+    grid = [(threshold, timeout) for threshold in thresholds for timeout in timeouts]
+    if workers == 1 or len(grid) < 2:
+        return [evaluate(recordings, *setting) for setting in grid]
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(recordings,)
+    ) as pool:
+        chunksize = max(len(grid) // (workers * 4), 1)
+        return list(pool.map(_evaluate_setting, grid, chunksize=chunksize))
+
+
+def parse_values(text):
+    """
+    Parse "start:stop:step" (stop included) or "a,b,c" into floats
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is neither
+    """
+    try:
+        if ":" in text:
+            start, stop, step = (float(part) for part in text.split(":"))
+            if step <= 0:
+                raise ValueError("step must be positive")
+            return list(np.round(np.arange(start, stop + step / 2, step), 6))
+        return [float(part) for part in text.split(",")]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid values {text!r}: {e}") from e
+
+
+def format_results(results, sort="clipped_speech_rate", top=20):
+    """
+    Table of the best settings
+
+    Args:
+        results (list[dict]): sweep() results
+        sort (str): Metric to sort by, one of SORT_KEYS; the others break
+                    ties
+        top (int): Rows to keep, all if 0
+
+    Returns:
+        list[str]: Header and one line per setting
+    """
+    keys = (sort,) + tuple(key for key in SORT_KEYS if key != sort)
+    rows = sorted(results, key=lambda result: [result[key] for key in keys])
+    if top:
+        rows = rows[:top]
+    lines = [
+        f"{'threshold':>10} {'timeout':>8} {'clipped %':>10} "
+        f"{'false/h':>9} {'open %':>8} {'toggles/h':>10}"
+    ]
+    lines += [
+        f"{row['energy_threshold']:>10.0f} {row['silence_timeout']:>8.2f} "
+        f"{row['clipped_speech_rate'] * 100:>10.2f} "
+        f"{row['false_unmutes_per_hour']:>9.1f} {row['open_mic_rate'] * 100:>8.2f} "
+        f"{row['toggles_per_hour']:>10.1f}"
+        for row in rows
+    ]
+    return lines
+
+
+def main():
+    """Sweep the settings over a corpus and print the best ones"""
+    parser = argparse.ArgumentParser(
+        description="Find energy_threshold and silence_timeout for a seat."
+    )
+    parser.add_argument("corpus", help="Folder of WAV files with label files")
+    parser.add_argument(
+        "--thresholds",
+        type=parse_values,
+        default=parse_values("100:2000:100"),
+        help="energy_threshold values, start:stop:step or a,b,c",
+    )
+    parser.add_argument(
+        "--timeouts",
+        type=parse_values,
+        default=parse_values("0.25:3:0.25"),
+        help="silence_timeout values, start:stop:step or a,b,c",
+    )
+    parser.add_argument(
+        "--chunk-duration", type=float, default=0.064, help="Seconds per frame"
+    )
+    parser.add_argument(
+        "--detector",
+        choices=DETECTORS,
+        default="rms",
+        help="How frames are measured, see the detector setting",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument("--cache-dir", help="Where frame energies are cached")
+    parser.add_argument("--sort", choices=SORT_KEYS, default=SORT_KEYS[0])
+    parser.add_argument("--top", type=int, default=20, help="Rows shown, 0 for all")
+    parser.add_argument("--json", help="Also write every result to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    recordings, cached = load_corpus(
+        args.corpus, args.chunk_duration, args.cache_dir, args.workers, args.detector
+    )
+    if not recordings:
+        logger.error("No labelled recordings found in %s", args.corpus)
+        return 2
+    hours = sum(times[-1] for _, times, _ in recordings if len(times)) / 3600
+    logger.info(
+        "%d recordings, %.2f hours, %d from the cache", len(recordings), hours, cached
+    )
+
+    results = sweep(recordings, args.thresholds, args.timeouts, args.workers)
+    for line in format_results(results, args.sort, args.top):
+        print(line)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 
 import logging
 
-import pyaudio
+from auto_muter.host import get_host_session
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +12,8 @@ def get_audio_devices():
     devices = []
 
     try:
-        p = pyaudio.PyAudio()
-        for i in range(p.get_device_count()):
-            device_info = p.get_device_info_by_index(i)
-            if device_info["maxInputChannels"] > 0:  # It's an input device
-                name = device_info["name"]
-                devices.append({"name": name, "id": str(i)})
-        p.terminate()
+        # Reuses the process-wide host rather than initializing PortAudio
+        devices = get_host_session().input_devices()
     except Exception as e:  # pylint: disable=broad-exception-caught
         logger.error("Error getting devices with PyAudio: %s", e)
 
@@ -4,8 +4,18 @@ from unittest.mock import patch
 
 import pytest
 
-from auto_muter.audio_controller import AudioController
+from auto_muter.audio_controller import AudioController, forget_mute_commands
 from auto_muter.audio_muter import AudioMuter
+from auto_muter.host import reset_host_session
+
+
+@pytest.fixture(autouse=True)
+def isolate_app_data(tmp_path, monkeypatch):
+    """Keep caches, the PortAudio host and our mute commands per test."""
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    yield
+    reset_host_session()
+    forget_mute_commands()
 
 
 @pytest.fixture(name="mock_audio_controller")
@@ -24,10 +34,11 @@ def audio_muter(mock_audio_controller):
     """Fixture to patch the audio controller config."""
     with (
         patch(
-            "auto_muter.audio_muter.AudioController", return_value=mock_audio_controller
+            "auto_muter.audio_controller.AudioController",
+            return_value=mock_audio_controller,
         ),
         patch(
-            "auto_muter.audio_muter.get_audio_devices",
+            "auto_muter.utils.get_audio_devices",
             return_value=[{"name": "Mic", "id": "1"}],
         ),
     ):
@@ -1,7 +1,10 @@
 """Unit test for the Audio controller module."""
 
+import threading
 from unittest.mock import MagicMock
 
+from auto_muter.simulation import FakeMuteNotifier
+
 
 def test_audio_controller_initialization(mock_audio_controller):
     """Test audio controller initialization."""
@@ -28,3 +31,49 @@ def test_toggle_mute(mock_audio_controller):
     mock_audio_controller.volume.SetMute = MagicMock()
     result = mock_audio_controller.toggle_mute()
     assert result is True
+
+
+def test_mute_state_is_served_from_notifications(mock_audio_controller):
+    """Test notifications keep the cached state fresh without endpoint reads."""
+    notifier = FakeMuteNotifier()
+    mock_audio_controller.watch_mute_changes(notifier)
+    mock_audio_controller.volume.GetMute = MagicMock(return_value=0)
+    changes = []
+    mock_audio_controller.add_mute_listener(changes.append)
+
+    notifier.emit(True)
+
+    assert mock_audio_controller.get_mute_state() is True
+    mock_audio_controller.volume.GetMute.assert_not_called()
+    assert changes == [True]
+
+
+def test_set_mute_state_writes_through_cache(mock_audio_controller):
+    """Test our own changes update the cache without notifying listeners."""
+    notifier = FakeMuteNotifier()
+    mock_audio_controller.watch_mute_changes(notifier)
+    changes = []
+    mock_audio_controller.add_mute_listener(changes.append)
+
+    mock_audio_controller.set_mute_state(True)
+    notifier.emit(True)
+
+    assert mock_audio_controller.get_mute_state() is True
+    assert not changes
+
+
+def test_polling_fallback_when_notifications_fail(mock_audio_controller):
+    """Test the controller polls the endpoint if registration fails."""
+    volume = mock_audio_controller.volume
+    volume.RegisterControlChangeNotify = MagicMock(side_effect=OSError)
+    volume.GetMute = MagicMock(return_value=1)
+    changed = threading.Event()
+    mock_audio_controller.add_mute_listener(lambda muted: changed.set())
+    mock_audio_controller.poll_interval = 0.01
+
+    mock_audio_controller.watch_mute_changes()
+    try:
+        assert changed.wait(1.0)
+        assert mock_audio_controller.get_mute_state() is True
+    finally:
+        mock_audio_controller.close()
@@ -1,5 +1,17 @@
 """Unit test for the audio muter module."""
 
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from auto_muter.audio_controller import EVENT_CONTEXT, PollingMuteNotifier
+from auto_muter.audio_muter import AudioMuter
+from auto_muter.events import LevelUpdate, MuteChanged, RunStateChanged
+from auto_muter.simulation import (FakeMuteNotifier, SimulatedAudioController,
+                                   SimulatedSession, SimulatedSessionManager)
+from auto_muter.sources import ArraySource, MultiDeviceSource, SyntheticSource
+
 
 def test_initial_state(audio_muter):
     """Test the initial state."""
@@ -29,3 +41,288 @@ def test_start_and_stop(audio_muter):
     assert audio_muter.running is True
     audio_muter.stop()
     assert audio_muter.running is False
+
+
+def test_process_chunk_unmutes_on_speech_and_mutes_after_silence(audio_muter):
+    """Test the per-chunk decision."""
+    audio_muter.output_monitoring_enabled = False
+    audio_muter.audio_controller.toggle_mute = lambda: None
+    audio_muter.muted = True
+
+    audio_muter._process_chunk(5000, 10.0)  # pylint: disable=protected-access
+    assert audio_muter.muted is False
+
+    audio_muter._process_chunk(10, 10.5)  # pylint: disable=protected-access
+    assert audio_muter.muted is False
+
+    audio_muter._process_chunk(10, 11.5)  # pylint: disable=protected-access
+    assert audio_muter.muted is True
+
+
+def test_replay_synthetic_source(audio_muter):
+    """Test offline replay reports transitions on the audio timeline."""
+    audio_muter.audio_controller = SimulatedAudioController(muted=True)
+    audio_muter.output_monitoring_enabled = False
+    source = SyntheticSource(
+        [("noise", 2.0, 50), ("tone", 1.0, 3000), ("noise", 3.0, 50)]
+    )
+
+    transitions = audio_muter.replay(source)
+
+    assert [muted for _, muted in transitions] == [False, True]
+    assert 2.0 <= transitions[0][0] <= 2.1
+    assert 4.0 <= transitions[1][0] <= 4.1
+    assert audio_muter.running is False
+
+
+def test_mute_changes_are_dispatched_while_running(audio_muter):
+    """Test the audio thread and GUI share the dispatcher while running."""
+    controller = SimulatedAudioController(muted=True, latency=0.05)
+    audio_muter._controller_factory = (
+        lambda: controller
+    )  # pylint: disable=protected-access
+    audio_muter.audio_controller = controller
+    audio_muter.source = SyntheticSource([("silence", 0.1, 0)], realtime=True)
+    audio_muter.start()
+
+    audio_muter._request_mute(False)  # pylint: disable=protected-access
+    audio_muter.toggle_mute()
+    audio_muter.toggle_mute()
+
+    assert audio_muter.muted is False
+    audio_muter.stop()
+    assert audio_muter.dispatcher.stats()["queue_depth"] == 0
+
+
+def test_external_mute_change_updates_state(audio_muter):
+    """Test mute changes made outside AutoMuter are followed."""
+    notifier = FakeMuteNotifier()
+    audio_muter.audio_controller.watch_mute_changes(notifier)
+    audio_muter.muted = True
+
+    notifier.emit(False)
+
+    assert audio_muter.muted is False
+
+
+def test_late_notification_of_own_command_is_ignored(audio_muter):
+    """Test a slow command's notification does not undo a newer request."""
+    notifier = FakeMuteNotifier()
+    audio_muter.audio_controller.watch_mute_changes(notifier)
+    audio_muter.set_mute_state(True)
+    audio_muter.set_mute_state(False)
+
+    # Windows reports the first command only after the second was issued
+    notifier.emit(True, EVENT_CONTEXT)
+    assert audio_muter.muted is False
+    notifier.emit(False, EVENT_CONTEXT)
+
+    notifier.emit(True)
+    assert audio_muter.muted is True
+
+
+def test_polled_echo_of_own_command_is_ignored(audio_muter):
+    """Test polling does not mistake a quick mute and unmute for the user's."""
+    endpoint = [False]
+    notifier = PollingMuteNotifier(lambda: endpoint[0])
+    callback = audio_muter.audio_controller._on_mute_notification
+    notifier.poll(callback)
+    audio_muter.set_mute_state(True)
+    audio_muter.set_mute_state(False)
+
+    # The poll lands between the two commands, then after both
+    endpoint[0] = True
+    notifier.poll(callback)
+    assert audio_muter.muted is False
+    endpoint[0] = False
+    notifier.poll(callback)
+    assert audio_muter.muted is False
+
+    endpoint[0] = True
+    notifier.poll(callback)
+    assert audio_muter.muted is True
+
+
+def test_output_meter_uses_sessions_when_filtered(audio_muter):
+    """Test a process filter switches output metering to sessions."""
+    manager = SimulatedSessionManager(
+        [SimulatedSession("a", "softphone.exe", peak=0.9)]
+    )
+    audio_muter.session_manager_factory = lambda: manager
+    audio_muter.output_exclude_processes = ["softphone.exe"]
+
+    meter = audio_muter._create_output_meter()  # pylint: disable=protected-access
+
+    assert meter.get_peak_meter_value() == 0.0
+
+
+def test_background_initialization(mock_audio_controller):
+    """Test devices and the controller can be set up after construction."""
+    with (
+        patch(
+            "auto_muter.audio_controller.AudioController",
+            return_value=mock_audio_controller,
+        ),
+        patch(
+            "auto_muter.utils.get_audio_devices",
+            return_value=[{"name": "Mic", "id": "1"}],
+        ),
+        patch("auto_muter.audio_muter.current_host_api", return_value="MME"),
+    ):
+        muter = AudioMuter(background_init=True)
+        assert not muter.ready.is_set()
+        assert muter.devices[0]["id"] == "default"
+
+        muter.initialize_in_background().join(timeout=1.0)
+
+    assert muter.ready.is_set()
+    assert muter.devices == [{"name": "Mic", "id": "1"}]
+    assert muter.audio_controller is mock_audio_controller
+    # The next launch lists the devices before enumerating them
+    assert AudioMuter(background_init=True).devices == muter.devices
+
+
+def test_state_changes_are_published_to_subscribers(audio_muter):
+    """Test subscribers receive typed events for the kinds they asked for."""
+    received = []
+    subscription = audio_muter.subscribe(
+        received.append, event_types=(MuteChanged, RunStateChanged)
+    )
+    audio_muter.set_mute_state(False)
+    audio_muter._publish_run_state("Running")  # pylint: disable=protected-access
+    audio_muter.unsubscribe(subscription)
+
+    assert [type(event) for event in received] == [MuteChanged, RunStateChanged]
+    assert received[0].muted is False
+    assert received[0].reason == "Manually set"
+    assert received[1].message == "Running"
+
+
+def test_levels_are_published_during_replay():
+    """Test every analysis window publishes its level to level subscribers."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController())
+    muter.output_monitoring_enabled = False
+    received = []
+    subscription = muter.subscribe(received.append, event_types=(LevelUpdate,))
+    muter.replay(SyntheticSource([("tone", 0.5, 3000)], chunk_size=800))
+    muter.unsubscribe(subscription)
+
+    assert len(received) == 10
+    assert received[0].energy > muter.energy_threshold
+    assert received[0].threshold == muter.energy_threshold
+    assert received[0].output_peak is None
+
+
+def test_metrics_time_each_stage_during_replay():
+    """Test enabled metrics time the pipeline stages and count mute changes."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.silence_timeout = 0.2
+    muter.metrics_enabled = True
+    muter.replay(
+        SyntheticSource([("tone", 0.5, 3000), ("silence", 0.5, 0)], chunk_size=800)
+    )
+
+    snapshot = muter.metrics.snapshot()
+    for stage in ("read", "decode", "energy", "controller"):
+        assert snapshot["stages"][stage]["count"] > 0
+    assert snapshot["counters"]["chunks"] == 20
+    assert snapshot["counters"]["toggles"] == 2
+
+
+@pytest.mark.parametrize("rule, unmutes", [("any", True), ("majority", False)])
+def test_replay_fuses_multiple_devices(rule, unmutes):
+    """Test speech on one of two devices counts only under the any rule."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.fusion_rule = rule
+    headset = SyntheticSource([("noise", 0.5, 50), ("tone", 0.5, 3000)])
+    boundary = SyntheticSource([("noise", 1.0, 50)], seed=1)
+
+    transitions = muter.replay(MultiDeviceSource([headset, boundary]))
+
+    assert bool(transitions) is unmutes
+
+
+@pytest.mark.parametrize(
+    "policy, select, unmutes", [("max", None, True), ("select", 1, False)]
+)
+def test_replay_reduces_channels(policy, select, unmutes):
+    """Test speech on one channel of a device counts unless another is selected."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.channel_policy = policy
+    muter.channel_select = select
+    speech = SyntheticSource([("noise", 0.5, 50), ("tone", 0.5, 3000)]).samples
+    noise = SyntheticSource([("noise", 1.0, 50)], seed=1).samples
+
+    transitions = muter.replay(ArraySource(np.column_stack((speech, noise))))
+
+    assert bool(transitions) is unmutes
+
+
+def test_adaptive_threshold_follows_background_noise():
+    """Test noise above energy_threshold only unmutes until the floor is known."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.adaptive_threshold = True
+    source = SyntheticSource(
+        [("noise", 8.0, 1500), ("tone", 1.0, 12000), ("noise", 3.0, 1500)]
+    )
+
+    transitions = muter.replay(source)
+
+    # Unmuted by the noise while warming up, then only by the speech
+    assert [muted for _, muted in transitions] == [False, True, False, True]
+    assert 8.0 <= transitions[2][0] <= 8.2
+    assert muter.noise_floor == pytest.approx(1500 * 1.25, rel=0.1)
+    assert muter.effective_threshold > 3 * muter.noise_floor
+
+
+@pytest.mark.parametrize("detector,unmutes", [("rms", 2), ("spectral", 1)])
+def test_spectral_detector_ignores_rumble(detector, unmutes):
+    """Test fan rumble unmutes the RMS detector but not the spectral one."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.detector = detector
+    muter.energy_threshold = 300
+    source = SyntheticSource(
+        [
+            ("rumble", 2.0, 3000),
+            ("noise", 2.0, 50),
+            ("voice", 1.0, 2000),
+            ("noise", 2.0, 50),
+        ]
+    )
+
+    transitions = muter.replay(source)
+
+    assert [muted for _, muted in transitions].count(False) == unmutes
+    assert transitions[-1][1] is True
+
+
+def test_unknown_detector_is_rejected():
+    """Test a misspelt detector fails before any audio is read."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.detector = "spectrum"
+    with pytest.raises(ValueError):
+        muter.replay(SyntheticSource([("tone", 0.5, 3000)]))
+
+
+@pytest.mark.parametrize("rejection,unmutes", [(False, 2), (True, 1)])
+def test_transient_rejection_ignores_typing(rejection, unmutes):
+    """Test keystrokes only unmute without the transient filter."""
+    muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+    muter.output_monitoring_enabled = False
+    muter.energy_threshold = 300
+    muter.transient_rejection = rejection
+    source = SyntheticSource(
+        [("noise", 1.0, 50), ("clicks", 2.0, 3000), ("noise", 1.0, 50)]
+        + [("voice", 1.0, 1500), ("noise", 1.0, 50)]
+    )
+
+    transitions = muter.replay(source)
+
+    assert [muted for _, muted in transitions].count(False) == unmutes
+    # Speech is heard as soon as without the filter
+    assert 4.0 <= [t for t, muted in transitions if not muted][-1] <= 4.1
@@ -0,0 +1,96 @@
+"""Unit test for the benchmark module."""
+
+import json
+
+import pytest
+
+from auto_muter.benchmark import (bench_controller, bench_decision,
+                                  bench_energy, bench_pipeline, bench_startup,
+                                  bench_transients, bench_vad, check_budgets,
+                                  compare_results, event_latencies,
+                                  save_results)
+
+
+def test_bench_energy_frame_energy_allocates_less():
+    """Test the preallocated energy path allocates less than the legacy one."""
+    result = bench_energy(count=300)
+    legacy, current = result["legacy"], result["frame_energy"]
+    assert current["peak_bytes_per_chunk"] < legacy["peak_bytes_per_chunk"]
+
+
+def test_bench_pipeline_reports_latencies():
+    """Test the replay benchmark finds every onset and offset."""
+    result = bench_pipeline(seconds=6)
+    assert result["chunk_ms"]["p50"] > 0
+    # Decisions are made at 64 ms chunk boundaries, and the chunk an onset
+    # falls in may not carry enough energy on its own
+    assert 0 <= result["onset_to_unmute_ms"]["p99"] <= 128
+    assert 0 <= result["silence_to_mute_ms"]["p99"] <= 128
+
+
+def test_bench_controller_includes_simulated_latency():
+    """Test mute commands are timed through the simulated controller."""
+    result = bench_controller(count=5, latency=0.002)
+    assert result["set_mute_state_ms"]["p50"] >= 2.0
+
+
+def test_bench_vad_compares_detectors():
+    """Test the spectral detector keeps keystrokes and rumble from unmuting."""
+    result = bench_vad(count=50, repeat=1, repeats=2)
+    rms, spectral = result["rms"]["best_setting"], result["spectral"]["best_setting"]
+    assert spectral["open_mic_rate"] < rms["open_mic_rate"]
+    assert spectral["clipped_speech_rate"] <= 0.1
+
+
+def test_bench_transients_stops_typing_unmutes():
+    """Test the keystroke filter keeps typing from unmuting."""
+    result = bench_transients(count=20, repeat=1, repeats=2)
+    assert result["typing_unmutes_off"] == 2
+    assert result["typing_unmutes_on"] == 0
+
+
+def test_bench_decision_paths_agree():
+    """Test the vectorized and frame-by-frame decisions find the same transitions."""
+    result = bench_decision(hours=0.5, combinations=10)
+    assert result["matches"]
+
+
+def test_startup_does_not_import_heavy_modules():
+    """Test importing the entry point leaves numpy, PyAudio and COM for later."""
+    result = bench_startup(repeat=1, window=False)
+    assert result["import_ms"]["p50"] > 0
+    assert result["eager_heavy_modules"] == 0
+
+
+def test_event_latencies():
+    """Test events are matched to the next transition into the state."""
+    transitions = [(1.1, False), (2.6, True), (4.2, False)]
+    latencies = event_latencies([1.0, 4.0], transitions, False)
+    assert latencies == pytest.approx([0.1, 0.2])
+
+
+def test_save_and_compare_results(tmp_path):
+    """Test results are saved and compared metric by metric."""
+    path = save_results({"pipeline": {"cpu": 2.0}}, tmp_path)
+    previous = json.loads(path.read_text(encoding="utf-8"))["results"]
+
+    lines = compare_results({"pipeline": {"cpu": 1.0}}, previous)
+
+    assert len(lines) == 1
+    assert lines[0].startswith("pipeline.cpu")
+    assert "-50.0%" in lines[0]
+
+
+def test_compare_results_reports_broken_budgets():
+    """Test CPU budgets are checked on benchmark runs rather than in tests."""
+    results = {
+        "energy": {
+            "legacy": {"cpu_per_audio_second": 0.001},
+            "frame_energy": {"cpu_per_audio_second": 0.002},
+        }
+    }
+
+    assert check_budgets(results) == [
+        "Over budget: frame energy uses less CPU than the legacy RMS"
+    ]
+    assert compare_results(results)[0].startswith("Over budget")
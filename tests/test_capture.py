@@ -0,0 +1,55 @@
+"""Unit test for the capture module."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pyaudio
+import pytest
+
+from auto_muter.capture import (BlockingCapture, CallbackCapture, FrameHandoff,
+                                create_capture)
+
+
+def test_handoff_drops_oldest_when_full():
+    """Test a slow consumer loses the oldest chunks, not the newest."""
+    handoff = FrameHandoff(capacity=2)
+    for data in (b"a", b"b", b"c"):
+        handoff.put(data)
+    assert handoff.dropped == 1
+    assert handoff.get(timeout=0) == b"b"
+    assert handoff.get(timeout=0) == b"c"
+    assert handoff.get(timeout=0) is None
+
+
+def test_handoff_close_wakes_consumer():
+    """Test closing the hand-off releases a waiting reader."""
+    handoff = FrameHandoff()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(handoff.get()))
+    reader.start()
+    handoff.close()
+    reader.join(timeout=1.0)
+    assert result == [None]
+
+
+def test_callback_capture_delivers_chunks():
+    """Test chunks from the stream callback are returned by read()."""
+    pa = MagicMock()
+    capture = CallbackCapture(pa, 1024, rate=16000)
+    capture.start()
+    callback = pa.open.call_args.kwargs["stream_callback"]
+
+    result = callback(b"\x01\x00", 1, {}, pyaudio.paInputOverflow)
+
+    assert result == (None, pyaudio.paContinue)
+    assert capture.overflows == 1
+    assert capture.read(timeout=0) == b"\x01\x00"
+
+
+def test_create_capture_modes():
+    """Test capture mode selection."""
+    pa = MagicMock()
+    assert isinstance(create_capture("callback", pa, 1024), CallbackCapture)
+    assert type(create_capture("blocking", pa, 1024)) is BlockingCapture
+    with pytest.raises(ValueError):
+        create_capture("polling", pa, 1024)
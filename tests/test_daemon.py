@@ -0,0 +1,68 @@
+"""Unit test for the daemon module."""
+
+import signal
+import subprocess
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from auto_muter.daemon import (apply_config, install_signal_handlers,
+                               load_config, run_daemon)
+
+
+def test_load_config(tmp_path):
+    """Test settings are read from the [auto_muter] table."""
+    path = tmp_path / "config.toml"
+    path.write_text(
+        '[auto_muter]\ninput_device = "Mic"\nenergy_threshold = 1500\n',
+        encoding="utf-8",
+    )
+    assert load_config(str(path)) == {"input_device": "Mic", "energy_threshold": 1500}
+
+    path.write_text("[auto_muter]\nthreshold = 1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_config(str(path))
+
+
+def test_apply_config_resolves_device_names():
+    """Test an input device can be given by name."""
+    audio_muter = MagicMock()
+    audio_muter.devices = [
+        {"name": "Default", "id": "default"},
+        {"name": "Mic", "id": "3"},
+    ]
+
+    apply_config(audio_muter, {"input_device": "Mic", "output_monitoring": False})
+
+    assert audio_muter.input_device == "3"
+    assert audio_muter.output_monitoring_enabled is False
+
+
+def test_run_daemon_cleans_up_on_signal():
+    """Test a shutdown signal stops the daemon through cleanup_before_exit."""
+    audio_muter = MagicMock()
+    audio_muter.devices = [{"name": "Default", "id": "default"}]
+    stop_event = threading.Event()
+    signals = [signal.SIGINT, signal.SIGTERM, getattr(signal, "SIGBREAK", None)]
+    previous = {sig: signal.getsignal(sig) for sig in signals if sig is not None}
+    install_signal_handlers(stop_event)
+    try:
+        signal.raise_signal(signal.SIGINT)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    assert run_daemon({}, audio_muter, stop_event) == 0
+    audio_muter.start.assert_called_once()
+    audio_muter.cleanup_before_exit.assert_called_once()
+
+
+def test_daemon_does_not_import_tkinter():
+    """Test the headless entry point never loads tkinter."""
+    code = "import sys, auto_muter.daemon; print('tkinter' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
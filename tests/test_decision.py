@@ -0,0 +1,70 @@
+"""Unit test for the decision module."""
+
+import numpy as np
+import pytest
+
+from auto_muter.decision import MuteDecision, find_transitions
+
+
+def run(decision, energies, step=0.1):
+    """Feed energies one frame per step and collect (frame, muted)."""
+    changes = []
+    for frame, energy in enumerate(energies):
+        muted = decision.update(energy, frame * step)
+        if muted is not None:
+            changes.append((frame, muted))
+    return changes
+
+
+def test_hysteresis_keeps_speech_between_thresholds():
+    """Test a level between release and attack neither starts nor ends speech."""
+    energies = [500, 1500, 700, 700, 700, 300, 300, 300]
+    plain = MuteDecision(1000, silence_timeout=0.15, clock=lambda: 0.0)
+    assert run(plain, energies) == [(1, False), (3, True)]
+    hysteresis = MuteDecision(1000, 600, silence_timeout=0.15, clock=lambda: 0.0)
+    assert run(hysteresis, energies) == [(1, False), (6, True)]
+
+
+def test_min_speech_duration_ignores_clicks():
+    """Test short bursts stay muted and sustained speech unmutes."""
+    decision = MuteDecision(1000, min_speech_duration=0.2, clock=lambda: 0.0)
+    assert run(decision, [1500, 0, 1500, 1500, 1500, 0]) == [(4, False)]
+
+
+def test_playing_output_unmutes_and_holds():
+    """Test output audio counts as speech regardless of its length."""
+    decision = MuteDecision(1000, min_speech_duration=1.0, clock=lambda: 5.0)
+    assert decision.update(0, playing=True) is False
+    assert decision.last_sound_time == 5.0
+
+
+@pytest.mark.parametrize("release, min_speech", [(None, 0.0), (600, 0.15)])
+def test_batch_matches_frame_by_frame(release, min_speech):
+    """Test the vectorized path finds the same transitions and end state."""
+    rng = np.random.default_rng(0)
+    energies = rng.choice([0, 700, 1500], size=2000, p=[0.5, 0.2, 0.3])
+    times = np.cumsum(rng.uniform(0.02, 0.1, size=2000))
+    settings = {"release_threshold": release, "min_speech_duration": min_speech}
+    frame_by_frame = MuteDecision(1000, clock=lambda: 0.0, **settings)
+    expected = []
+    for frame, (energy, now) in enumerate(zip(energies, times)):
+        muted = frame_by_frame.update(energy, now)
+        if muted is not None:
+            expected.append((frame, muted))
+
+    batch = MuteDecision(1000, clock=lambda: 0.0, **settings)
+    first = batch.find_transitions(energies[:777], times[:777])
+    rest = batch.find_transitions(energies[777:], times[777:])
+    found = list(zip(first[0], first[1])) + list(zip(rest[0] + 777, rest[1]))
+
+    assert expected
+    assert found == expected
+    assert batch.muted == frame_by_frame.muted
+    assert batch.last_sound_time == frame_by_frame.last_sound_time
+
+
+def test_find_transitions_without_frames():
+    """Test empty input keeps the state."""
+    indices, states, final = find_transitions([], [], 1000, muted=False)
+    assert len(indices) == len(states) == 0
+    assert final[0] is False
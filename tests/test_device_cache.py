@@ -0,0 +1,22 @@
+"""Unit test for the device cache module."""
+
+from auto_muter.device_cache import DeviceCache
+
+
+def test_devices_are_cached_per_host_api(tmp_path):
+    """Test the last host API's devices are returned by default."""
+    cache = DeviceCache(str(tmp_path / "AutoMuter" / "devices.json"))
+    assert cache.load() is None
+
+    cache.save("MME", [{"name": "Mic", "id": "1"}])
+    cache.save("Windows WASAPI", [{"name": "Mic", "id": "7"}])
+
+    assert cache.load() == [{"name": "Mic", "id": "7"}]
+    assert cache.load("MME") == [{"name": "Mic", "id": "1"}]
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    """Test a corrupt cache file does not break startup."""
+    path = tmp_path / "devices.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert DeviceCache(str(path)).load() is None
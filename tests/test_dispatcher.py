@@ -0,0 +1,96 @@
+"""Unit test for the dispatcher module."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from auto_muter.dispatcher import MuteDispatcher
+from auto_muter.simulation import SimulatedAudioController
+
+
+def test_requests_are_applied_on_dispatcher_thread():
+    """Test the controller is created and used on the dispatcher thread."""
+    threads = []
+
+    def factory():
+        threads.append(threading.current_thread())
+        return SimulatedAudioController(muted=True)
+
+    on_result = MagicMock()
+    dispatcher = MuteDispatcher(factory, on_result=on_result)
+    dispatcher.start()
+    controller = dispatcher.controller
+    dispatcher.request(False)
+    dispatcher.stop()
+
+    assert threads[0] is not threading.current_thread()
+    assert controller.muted is False
+    on_result.assert_called_once_with(False, False)
+    assert dispatcher.stats()["applied"] == 1
+
+
+def test_superseded_and_redundant_requests_are_collapsed():
+    """Test a burst of requests behind a slow command ends in one more call."""
+    controller = SimulatedAudioController(muted=True, latency=0.05)
+    dispatcher = MuteDispatcher(lambda: controller)
+    dispatcher.start()
+
+    dispatcher.request(False)
+    time.sleep(0.02)  # Let the dispatcher pick it up and block on the endpoint
+    for muted in (True, False, True, False, True):
+        dispatcher.request(muted)
+    dispatcher.request(True)
+    dispatcher.stop()
+
+    stats = dispatcher.stats()
+    assert controller.muted is True
+    assert controller.calls == 2
+    assert stats["coalesced"] == 5
+    assert stats["queue_depth"] == 0
+    assert stats["latency_ms"]["max"] >= 50
+
+
+def test_request_after_stop_does_not_keep_the_thread_alive():
+    """Test a request queued behind stop() is applied and the thread ends."""
+    controller = SimulatedAudioController(muted=False, latency=0.05)
+    dispatcher = MuteDispatcher(lambda: controller)
+    dispatcher.start()
+    thread = dispatcher._thread  # pylint: disable=protected-access
+
+    dispatcher.request(True)
+    time.sleep(0.02)  # Let the dispatcher block on the endpoint
+    dispatcher.stop(timeout=0)
+    dispatcher.request(False)
+    thread.join(1.0)
+
+    assert not thread.is_alive()
+    assert controller.muted is False
+    assert dispatcher.stats()["coalesced"] == 0
+
+
+def test_request_does_not_block_on_slow_controller():
+    """Test enqueueing returns long before the controller finishes."""
+    controller = SimulatedAudioController(muted=True, latency=0.2)
+    dispatcher = MuteDispatcher(lambda: controller)
+    dispatcher.start()
+
+    dispatcher.request(False)
+    assert controller.calls == 0
+
+    dispatcher.stop()
+    assert controller.calls == 1
+
+
+def test_controller_failure_is_counted():
+    """Test a failing controller does not stop the dispatcher."""
+    controller = MagicMock()
+    controller.get_mute_state.return_value = True
+    controller.set_mute_state.side_effect = [OSError("endpoint gone"), False]
+    dispatcher = MuteDispatcher(lambda: controller)
+    dispatcher.start()
+    dispatcher.request(False)
+    dispatcher.request(True)
+    dispatcher.request(False)
+    dispatcher.stop()
+
+    assert dispatcher.stats()["errors"] + dispatcher.stats()["applied"] >= 1
@@ -0,0 +1,192 @@
+"""Unit test for the dsp module."""
+
+import numpy as np
+import pytest
+
+from auto_muter.benchmark import legacy_rms, make_chunks, peak_bytes_per_chunk
+from auto_muter.dsp import (ChannelEnergy, FrameEnergy, Resampler, SpectralVad,
+                            TransientGate)
+from auto_muter.sources import SyntheticSource
+
+
+def test_rms_matches_legacy_calculation():
+    """Test the energy matches the previous struct based calculation."""
+    frame_energy = FrameEnergy(1024)
+    for data in make_chunks(5):
+        assert np.isclose(frame_energy.rms(data), legacy_rms(data))
+
+
+def test_rms_handles_short_and_empty_chunks():
+    """Test partial reads are measured over the samples received."""
+    frame_energy = FrameEnergy(1024)
+    data = np.full(100, 1000, dtype=np.int16).tobytes()
+    assert frame_energy.rms(data) == 1000.0
+    assert frame_energy.rms(b"") == 0.0
+
+
+def test_rms_allocates_nothing_per_chunk():
+    """Test the hot path does not allocate per chunk."""
+    chunks = make_chunks(50)
+    frame_energy = FrameEnergy(1024)
+    assert peak_bytes_per_chunk(frame_energy.rms, chunks) < 512
+    assert peak_bytes_per_chunk(legacy_rms, chunks) > 10000
+
+
+def test_rms_samples_matches_rms():
+    """Test array input gives the same energy as raw bytes."""
+    frame_energy = FrameEnergy(1024)
+    data = make_chunks(1)[0]
+    samples = np.frombuffer(data, dtype=np.int16)
+    assert frame_energy.rms_samples(samples) == frame_energy.rms(data)
+
+
+def test_channel_energy_matches_per_channel_rms():
+    """Test all channels are measured in one call like separate chunks."""
+    frames = np.stack([np.frombuffer(c, np.int16) for c in make_chunks(3)], axis=1)
+    energies = ChannelEnergy(1024, 3).rms(frames)
+    frame_energy = FrameEnergy(1024)
+    expected = [frame_energy.rms_samples(frames[:, i]) for i in range(3)]
+    assert np.allclose(energies, expected)
+
+
+def tone(frequency, rate, seconds=1.0, level=10000):
+    """int16 sine tone."""
+    times = np.arange(int(rate * seconds)) / rate
+    return (level * np.sin(2 * np.pi * frequency * times)).astype(np.int16)
+
+
+@pytest.mark.parametrize("rate", [48000, 44100])
+def test_resampler_keeps_speech_and_rejects_aliases(rate):
+    """Test the passband is kept and what would alias is filtered out."""
+    speech = Resampler(rate, 16000).process(tone(1000, rate))
+    assert len(speech) == 16000
+    assert np.sqrt(np.mean(speech[500:].astype(np.float64) ** 2)) > 6900
+    alias = Resampler(rate, 16000).process(tone(9000, rate))
+    assert np.sqrt(np.mean(alias[500:].astype(np.float64) ** 2)) < 100
+
+
+def test_resampler_carries_state_across_chunks():
+    """Test chunked resampling matches resampling the whole signal."""
+    signal = np.stack([tone(440, 44100), tone(3000, 44100)], axis=1)
+    whole = Resampler(44100, 16000, channels=2).process(signal)
+    resampler = Resampler(44100, 16000, channels=2)
+    # Chunks that are not whole periods leave the output phase mid-period
+    chunks = [resampler.process(signal[i : i + 1000]) for i in range(0, 44100, 1000)]
+    assert np.array_equal(np.concatenate(chunks), whole)
+
+
+@pytest.mark.parametrize(
+    "kind,expected",
+    [("tone", 1000), ("rumble", 0), ("clicks", 0), ("noise", 0), ("silence", 0)],
+)
+def test_spectral_vad_scores_voice_band_tones_only(kind, expected):
+    """Test an in-band tone scores its RMS and rumble, clicks and hiss nothing."""
+    samples = SyntheticSource([(kind, 1.0, 1000)]).samples[: 15 * 1024]
+    windows = samples.reshape(15, 1024)
+    scores = SpectralVad(1024).score(windows)
+    assert np.allclose(scores, expected, atol=expected * 0.02 + 10)
+
+
+def test_spectral_vad_batches_match_single_windows():
+    """Test batched, single-window and per-channel scores agree."""
+    samples = SyntheticSource([("voice", 1.0, 2000)]).samples[: 8 * 1024]
+    windows = samples.reshape(8, 1024)
+    vad = SpectralVad(1024)
+    batch = vad.score(windows)
+    assert batch.min() > 500
+    assert np.allclose([vad.energy(window) for window in windows], batch)
+    assert np.allclose(vad.energies(windows[:4].T), batch[:4])
+
+
+def window_rms(samples, size=1024):
+    """RMS of each whole window of samples."""
+    windows = samples[: len(samples) // size * size].reshape(
+        -1, size, *samples.shape[1:]
+    )
+    return np.sqrt(np.mean(windows.astype(float) ** 2, axis=1))
+
+
+def gate_chunks(gate, samples, chunk_size):
+    """Run samples through a gate in chunks and join the output."""
+    return np.concatenate(
+        [
+            np.asarray(gate.process(samples[start : start + chunk_size]))
+            for start in range(0, len(samples), chunk_size)
+        ]
+    )
+
+
+def pulse_train(seconds, pitch=110.0, level=1500, rate=16000):
+    """Low voiced speech: glottal pulses ringing at a 700 Hz formant."""
+    count = int(seconds * rate)
+    ring = np.arange(int(0.004 * rate)) / rate
+    pulse = np.exp(-ring / 0.0012) * np.sin(2 * np.pi * 700 * ring)
+    signal = np.zeros(count)
+    for start in np.arange(0, count - len(pulse), rate / pitch).astype(int):
+        signal[start : start + len(pulse)] += pulse
+    return signal * level / np.sqrt(np.mean(signal**2))
+
+
+def fricative(seconds, level=1500, rate=16000):
+    """An "s": noise above 2 kHz, starting abruptly."""
+    count = int(seconds * rate)
+    spectrum = np.fft.rfft(np.random.default_rng(1).normal(0, 1, count))
+    spectrum[np.fft.rfftfreq(count, 1 / rate) < 2000] = 0
+    signal = np.fft.irfft(spectrum, count)
+    return signal * level / np.sqrt(np.mean(signal**2))
+
+
+@pytest.mark.parametrize("chunk_size", [1024, 800, 333])
+def test_transient_gate_removes_keystrokes_across_chunks(chunk_size):
+    """Test every click is removed wherever the chunk boundaries fall."""
+    samples = SyntheticSource([("noise", 1.0, 50), ("clicks", 1.0, 3000)]).samples
+    gate = TransientGate()
+    output = gate_chunks(gate, samples, chunk_size)
+    assert gate.suppressed == 8
+    # A click starting in the last sub-frame of a chunk gets its attack
+    # through, the rest leave only decayed tails
+    assert np.count_nonzero(window_rms(output[16000:]) > 100) <= 1
+    # Up to the sub-frame the first click starts in
+    assert np.array_equal(output[:15900], samples[:15900])
+
+
+@pytest.mark.parametrize("chunk_size", [1024, 333])
+@pytest.mark.parametrize(
+    "sound", ["voice", "rumble", "tone", "noise", "pulses", "fricative"]
+)
+def test_transient_gate_passes_sustained_sounds(sound, chunk_size):
+    """Test speech, including low voices and fricatives, is left untouched."""
+    samples = SyntheticSource([("noise", 1.0, 50)]).samples
+    if sound == "pulses":
+        onset = pulse_train(1.0)
+    elif sound == "fricative":
+        onset = fricative(1.0)
+    else:
+        onset = SyntheticSource([(sound, 1.0, 1500)], seed=1).samples
+    onset = onset + np.random.default_rng(2).normal(0, 50, len(onset))
+    samples = np.concatenate((samples, np.round(onset).astype(np.int16)))
+    gate = TransientGate()
+    assert np.array_equal(gate_chunks(gate, samples, chunk_size), samples)
+    assert gate.suppressed == 0
+
+
+def test_transient_gate_clips_onsets_at_chunk_ends_by_one_attack_at_most():
+    """Test a voice starting at a chunk end loses at most the attack time."""
+    samples = SyntheticSource([("noise", 1.0, 50)]).samples
+    onset = pulse_train(1.0) + np.random.default_rng(2).normal(0, 50, 16000)
+    samples = np.concatenate((samples, np.round(onset).astype(np.int16)))
+    gate = TransientGate()
+    changed = np.flatnonzero(gate_chunks(gate, samples, 256) != samples)
+    assert 0 < len(changed) <= 0.008 * 16000
+    assert changed[0] >= 16000 and changed[-1] < 16000 + 0.008 * 16000
+    assert gate.suppressed == 0
+
+
+def test_transient_gate_gates_channels_separately():
+    """Test a click on one channel leaves the other channel alone."""
+    clicks = SyntheticSource([("noise", 1.0, 50), ("clicks", 0.5, 3000)]).samples
+    voice = SyntheticSource([("noise", 1.0, 50), ("voice", 0.5, 1500)]).samples
+    frames = np.stack([clicks, voice], axis=1)
+    output = gate_chunks(TransientGate(channels=2), frames, 1024)
+    assert np.count_nonzero(window_rms(output[16000:, 0]) > 100) <= 1
+    assert np.array_equal(output[:, 1], voice)
@@ -0,0 +1,87 @@
+"""Unit test for the events module."""
+
+import threading
+
+import pytest
+
+from auto_muter.events import EventBus, LevelUpdate, MuteChanged, Subscription
+
+
+def test_bus_delivers_only_subscribed_types():
+    """Test publish() reaches the subscribers of the event's class."""
+    bus = EventBus()
+    everything, mutes = [], []
+    all_subscription = bus.subscribe(everything.append)
+    mute_subscription = bus.subscribe(mutes.append, event_types=(MuteChanged,))
+    level = LevelUpdate(1200.0, 1000, None, 1.0)
+    mute = MuteChanged(False, "Auto", 1.0)
+
+    assert bus.wants(LevelUpdate)
+    bus.publish(level)
+    bus.publish(mute)
+    bus.unsubscribe(all_subscription)
+    bus.unsubscribe(mute_subscription)
+
+    assert everything == [level, mute]
+    assert mutes == [mute]
+    assert not bus.wants(LevelUpdate)
+
+
+@pytest.mark.parametrize(
+    "drop_policy, kept", [("oldest", [0, 3, 4]), ("newest", [0, 1, 2])]
+)
+def test_full_queue_drops_per_policy(drop_policy, kept):
+    """Test a blocked subscriber loses events instead of blocking publish()."""
+    release = threading.Event()
+    received = []
+
+    def slow(event):
+        release.wait(timeout=1.0)
+        received.append(event)
+
+    subscription = Subscription(slow, max_queue=2, drop_policy=drop_policy)
+    subscription.put(0)
+    # Wait until the first event is being delivered and the queue is empty
+    while subscription._queue:  # pylint: disable=protected-access
+        pass
+    for event in range(1, 5):
+        subscription.put(event)
+    release.set()
+    subscription.close()
+
+    assert received == kept
+    assert subscription.dropped == 2
+
+
+def test_unsubscribe_without_waiting_for_a_busy_subscriber():
+    """Test a zero timeout returns while the callback is still running."""
+    bus = EventBus()
+    release = threading.Event()
+    subscription = bus.subscribe(lambda event: release.wait(timeout=5.0))
+    bus.publish(MuteChanged(True, "Auto", 1.0))
+    while subscription._queue:  # pylint: disable=protected-access
+        pass
+
+    bus.unsubscribe(subscription, timeout=0)
+    assert subscription._thread.is_alive()  # pylint: disable=protected-access
+
+    release.set()
+    subscription._thread.join(1.0)  # pylint: disable=protected-access
+    assert subscription.delivered == 1
+
+
+def test_failing_subscriber_keeps_receiving():
+    """Test an exception in a callback does not stop its subscription."""
+    received = []
+
+    def callback(event):
+        received.append(event)
+        raise RuntimeError("boom")
+
+    subscription = Subscription(callback)
+    subscription.put(1)
+    subscription.put(2)
+    subscription.close()
+
+    assert received == [1, 2]
+    assert subscription.delivered == 2
@@ -0,0 +1,44 @@
+"""Unit test for the fusion module."""
+
+import numpy as np
+import pytest
+
+from auto_muter.fusion import ChannelPolicy, EnergyFusion
+
+
+@pytest.mark.parametrize(
+    "rule, expected", [("any", 3000.0), ("majority", 800.0), ("weighted", 800.0)]
+)
+def test_rules_pick_the_deciding_energy(rule, expected):
+    """Test each rule reduces the energies to the one its vote depends on."""
+    energies = np.array([100.0, 3000.0, 800.0])
+    assert EnergyFusion(rule).fuse(energies) == expected
+
+
+def test_weights_and_inactive_inputs():
+    """Test a heavy input decides alone and inactive inputs are ignored."""
+    energies = np.array([100.0, 3000.0, 800.0])
+    fusion = EnergyFusion("weighted", weights=[3.0, 1.0, 1.0])
+    assert fusion.fuse(energies) == 100.0
+
+    active = np.array([False, True, True])
+    assert fusion.fuse(energies, active) == 3000.0
+    assert EnergyFusion("majority").fuse(energies, active) == 800.0
+    assert EnergyFusion().fuse(energies, np.zeros(3, bool)) == 0.0
+
+
+def test_unknown_rule():
+    """Test an unknown rule is rejected."""
+    with pytest.raises(ValueError):
+        EnergyFusion("loudest")
+
+
+def test_channel_policies():
+    """Test channel energies are reduced by max, mean or a selected channel."""
+    energies = np.array([100.0, 3000.0, 800.0, 400.0])
+    assert ChannelPolicy().reduce(energies) == 3000.0
+    assert ChannelPolicy("mean").reduce(energies) == 1075.0
+    assert ChannelPolicy("max", channels=[0, 2]).reduce(energies) == 800.0
+    assert ChannelPolicy("select", channels=3).reduce(energies) == 400.0
+    with pytest.raises(ValueError):
+        ChannelPolicy("select")
@@ -1,10 +1,13 @@
 """Unit test for the gui module."""
 
+import tkinter as tk
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from auto_muter.gui import AutoMuterGUI
+from auto_muter.events import LevelUpdate
+from auto_muter.gui import (WAKEUP_EVENT, AutoMuterGUI, GuiEventQueue,
+                            LevelMeterView)
 
 
 @pytest.fixture(name="mock_audio_muter")
@@ -77,6 +80,20 @@ def test_start_from_gui(mock_gui):
     mock_gui.audio_muter.start.assert_called_once()
 
 
+def test_backends_ready_enables_start(mock_gui):
+    """Test Start and Test Mute are enabled once the backends are loaded."""
+    buttons = [MagicMock(), MagicMock()]
+    mock_gui._backend_buttons = buttons  # pylint: disable=protected-access
+    mock_gui.device_combo = MagicMock()
+    mock_gui.device_var = MagicMock()
+    mock_gui.status_label = MagicMock()
+
+    mock_gui._show_backends()  # pylint: disable=protected-access
+
+    for button in buttons:
+        button.config.assert_called_once_with(state=tk.NORMAL)
+
+
 def test_stop_from_gui(mock_gui):
     """Test the stop button functionality."""
     mock_gui._stop_from_gui()  # pylint: disable=protected-access
@@ -89,3 +106,78 @@ def test_exit_application(mock_gui):
     mock_gui._exit_application()  # pylint: disable=protected-access
     mock_gui.audio_muter.cleanup_before_exit.assert_called_once()
     mock_gui.root.destroy.assert_called_once()
+
+
+def test_gui_event_queue_coalesces_wakeups():
+    """Test a burst of posts wakes Tk once and is applied in order."""
+    root = MagicMock()
+    shown = []
+    events = GuiEventQueue(root, {"mute": shown.append})
+    root.bind.assert_called_once_with(WAKEUP_EVENT, events.drain)
+
+    events.post("mute", True)
+    events.post("mute", False)
+    assert root.event_generate.call_count == 1
+
+    events.drain()
+    assert shown == [True, False]
+
+    events.post("mute", True)
+    assert root.event_generate.call_count == 2
+
+
+def test_gui_event_queue_survives_stopped_loop():
+    """Test a failed wakeup leaves the change queued for the next drain."""
+    root = MagicMock()
+    root.event_generate.side_effect = RuntimeError("main thread is not in main loop")
+    shown = []
+    events = GuiEventQueue(root, {"status": shown.append})
+
+    events.post("status", "Running")
+    events.post("status", "Stopped")
+    events.drain()
+
+    assert shown == ["Running", "Stopped"]
+
+
+def test_gui_event_queue_ignores_posts_once_closed():
+    """Test a closed queue no longer wakes the window being destroyed."""
+    root = MagicMock()
+    events = GuiEventQueue(root, {"status": MagicMock()})
+
+    events.close()
+    events.post("status", "Stopped")
+
+    root.event_generate.assert_not_called()
+
+
+def test_closing_does_not_wait_for_the_subscriber(mock_gui):
+    """Test the Tk thread leaves the subscriber thread to finish alone."""
+    subscription = mock_gui.audio_muter.subscribe.return_value
+    mock_gui._subscription = subscription  # pylint: disable=protected-access
+    mock_gui.events = MagicMock()
+
+    mock_gui._unsubscribe()  # pylint: disable=protected-access
+
+    mock_gui.events.close.assert_called_once()
+    mock_gui.audio_muter.unsubscribe.assert_called_once_with(subscription, timeout=0)
+
+
+@patch("auto_muter.gui.tk.Canvas")
+def test_levels_are_decimated_and_drawn(mock_canvas, mock_gui):
+    """Test per-window levels reach the meter at a reduced rate."""
+    show_level = mock_gui._show_level  # pylint: disable=protected-access
+    mock_gui.events = GuiEventQueue(MagicMock(), {LevelUpdate: show_level})
+    mock_gui.level_meter = LevelMeterView(MagicMock(), mock_gui.level_history)
+
+    for index in range(60):
+        mock_gui._forward_event(  # pylint: disable=protected-access
+            LevelUpdate(2000.0, 1000, 0.1, index / 60)
+        )
+    mock_gui.events.drain()
+    mock_gui.level_meter.render()
+
+    assert len(mock_gui.level_history.levels) == 30
+    canvas = mock_canvas.return_value
+    assert canvas.after.call_count == 1
+    assert canvas.coords.call_count == 6
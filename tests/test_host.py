@@ -0,0 +1,61 @@
+"""Unit test for the host module."""
+
+import threading
+from unittest.mock import MagicMock
+
+from auto_muter.host import DeviceWatcher, HostSession
+
+
+def make_host():
+    """Create a mock PyAudio host with one input and one output device."""
+    host = MagicMock()
+    host.get_device_count.return_value = 2
+    host.get_device_info_by_index.side_effect = lambda index: [
+        {"name": "Mic", "maxInputChannels": 1},
+        {"name": "Speakers", "maxInputChannels": 0},
+    ][index]
+    host.get_default_host_api_info.return_value = {"name": "MME"}
+    return host
+
+
+def test_host_is_initialized_once():
+    """Test enumeration and streams share one PortAudio initialization."""
+    factory = MagicMock(side_effect=make_host)
+    session = HostSession(factory)
+
+    assert session.input_devices() == [{"name": "Mic", "id": "0"}]
+    assert session.host_api_name() == "MME"
+    session.acquire()
+    session.release()
+
+    factory.assert_called_once()
+
+
+def test_reinitialize_waits_for_streams():
+    """Test PortAudio is only restarted while no stream uses it."""
+    factory = MagicMock(side_effect=make_host)
+    session = HostSession(factory)
+    host = session.acquire()
+
+    assert session.reinitialize() is False
+    session.release()
+    assert session.reinitialize() is True
+    host.terminate.assert_called_once()
+
+    session.input_devices()
+    assert factory.call_count == 2
+
+
+def test_device_watcher_debounces_bursts():
+    """Test a burst of device events reloads the devices once."""
+    reloaded = threading.Event()
+    on_change = MagicMock(side_effect=reloaded.set)
+    session = HostSession(make_host)
+    watcher = DeviceWatcher(on_change, session=session, debounce=0.05)
+
+    for _ in range(5):
+        watcher.notify()
+
+    assert reloaded.wait(1.0)
+    watcher.stop()
+    on_change.assert_called_once()
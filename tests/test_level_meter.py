@@ -0,0 +1,54 @@
+"""Unit test for the level meter module."""
+
+import pytest
+
+from auto_muter.events import LevelUpdate
+from auto_muter.level_meter import (MIC_FULL_SCALE, LevelDecimator,
+                                    LevelHistory, RenderBudget, level_fraction)
+
+
+def test_decimator_keeps_the_loudest_window_per_interval():
+    """Test 60 Hz windows are reduced to 30 Hz keeping their maxima."""
+    decimator = LevelDecimator(rate=30.0)
+    emitted = []
+    for index in range(120):
+        output_peak = 0.5 if index == 3 else 0.01
+        level = LevelUpdate(float(index % 2) * 900, 1000, output_peak, index / 60)
+        reduced = decimator.add(level)
+        if reduced is not None:
+            emitted.append(reduced)
+
+    assert len(emitted) == 60
+    assert all(level.energy == 900 for level in emitted[1:])
+    assert emitted[2].output_peak == 0.5
+
+
+def test_history_is_bounded():
+    """Test levels and transitions outside the span are dropped."""
+    history = LevelHistory(seconds=1.0, rate=10.0)
+    history.add_transition(0.0, False)
+    for index in range(40):
+        history.add_level(LevelUpdate(100.0, 1000, None, index / 10))
+
+    assert len(history.levels) == 11
+    assert history.latest.time == pytest.approx(3.9)
+    assert not history.transitions
+
+
+def test_render_budget_slows_expensive_redraws():
+    """Test redraws are spaced out so their cost stays within the budget."""
+    budget = RenderBudget(max_rate=30.0, budget=0.02, smoothing=1.0)
+    assert budget.delay(0.0) == 0.0
+
+    budget.record(0.0, 0.0005)
+    assert budget.delay(0.0) == pytest.approx(1 / 30)
+
+    budget.record(1.0, 1.004)
+    assert budget.delay(1.0) == pytest.approx(0.2)
+
+
+def test_level_fraction_is_in_db():
+    """Test levels map onto the -60 dB to full scale meter."""
+    assert level_fraction(MIC_FULL_SCALE, MIC_FULL_SCALE) == 1.0
+    assert level_fraction(MIC_FULL_SCALE / 1000, MIC_FULL_SCALE) == pytest.approx(0.0)
+    assert level_fraction(None, 1.0) == 0.0
@@ -0,0 +1,83 @@
+"""Unit test for the logger module."""
+
+import logging
+import threading
+
+from auto_muter.audio_muter import AudioMuter
+from auto_muter.logger import (DroppingQueueHandler, RotatingTimedFileHandler,
+                               setup_logger, shutdown_logger)
+from auto_muter.simulation import SimulatedAudioController
+from auto_muter.sources import SyntheticSource
+
+
+def _queue_handlers():
+    """Queue handlers attached to the root logger"""
+    return [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, DroppingQueueHandler)
+    ]
+
+
+def test_setup_is_idempotent(tmp_path):
+    """Test calling setup_logger again adds no handlers."""
+    shutdown_logger()
+    try:
+        setup_logger(log_dir=str(tmp_path), console=False)
+        setup_logger(log_dir=str(tmp_path), console=False)
+        assert len(_queue_handlers()) == 1
+
+        logging.getLogger("auto_muter.test").info("hello")
+    finally:
+        shutdown_logger()
+
+    assert not _queue_handlers()
+    assert "hello" in (tmp_path / "AutoMuter.log").read_text(encoding="utf-8")
+
+
+def test_log_file_rotates_by_size(tmp_path):
+    """Test the log file rolls over once it exceeds max_bytes."""
+    shutdown_logger()
+    try:
+        setup_logger(log_dir=str(tmp_path), console=False, max_bytes=200)
+        for index in range(10):
+            logging.getLogger("auto_muter.test").info("line %d", index)
+    finally:
+        shutdown_logger()
+
+    assert (tmp_path / "AutoMuter.log.1").exists()
+
+
+def test_slow_log_writes_do_not_delay_processing(tmp_path, monkeypatch):
+    """Test a stalled log file does not block chunk processing."""
+    replayed = threading.Event()
+    stalled = []
+    written = []
+
+    def stalled_emit(self, record):
+        del self
+        # Written on the caller's thread this would wait for the replay
+        # that is waiting for it
+        if not replayed.wait(timeout=5.0):
+            stalled.append(record)
+        written.append(record.getMessage())
+
+    monkeypatch.setattr(RotatingTimedFileHandler, "emit", stalled_emit)
+    shutdown_logger()
+    setup_logger(log_dir=str(tmp_path), console=False)
+    try:
+        muter = AudioMuter(audio_controller=SimulatedAudioController(muted=True))
+        muter.output_monitoring_enabled = False
+        muter.silence_timeout = 0.1
+        source = SyntheticSource(
+            [("tone", 0.2, 3000), ("silence", 0.3, 0)] * 10, chunk_size=800
+        )
+        transitions = muter.replay(source)
+    finally:
+        replayed.set()
+        shutdown_logger()
+
+    # Every transition logs a line, all written once the logger shuts down
+    assert len(transitions) == 20
+    assert not stalled
+    assert sum(message.startswith("Auto: ") for message in written) == 20
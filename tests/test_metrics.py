@@ -0,0 +1,54 @@
+"""Unit test for the metrics module."""
+
+import logging
+
+import pytest
+
+from auto_muter.metrics import PipelineMetrics, StageHistogram, SummaryReporter
+
+
+def test_histogram_percentiles():
+    """Test percentiles come from the bucket holding them."""
+    histogram = StageHistogram()
+    for _ in range(99):
+        histogram.add(0.00012)
+    histogram.add(0.05)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert 0.12 <= summary["p50_ms"] <= 0.18
+    assert summary["p99_ms"] == summary["p50_ms"]
+    assert summary["max_ms"] == pytest.approx(50.0)
+
+
+def test_disabled_metrics_record_nothing():
+    """Test calls pass through and counters stay empty while disabled."""
+    metrics = PipelineMetrics()
+    assert metrics.call("controller", max, 1, 2) == 2
+    metrics.count("toggles")
+    metrics.gauge("noise_floor", 200.0)
+
+    assert metrics.stage("controller").count == 0
+    assert metrics.snapshot()["gauges"] == {}
+    assert metrics.snapshot()["counters"] == {}
+
+    metrics.enabled = True
+    metrics.call("controller", max, 1, 2)
+    metrics.count("toggles", 2)
+    assert metrics.stage("controller").count == 1
+    assert metrics.snapshot()["counters"] == {"toggles": 2}
+
+
+def test_reporter_logs_a_summary_on_stop(caplog):
+    """Test stopping the reporter logs the final summary line."""
+    metrics = PipelineMetrics(enabled=True)
+    metrics.count("errors")
+    metrics.gauge("noise_floor", 212.4)
+    reporter = SummaryReporter(metrics, interval=60.0)
+
+    with caplog.at_level(logging.INFO, logger="auto_muter.metrics"):
+        reporter.start()
+        reporter.stop()
+
+    assert "errors=1" in caplog.text
+    assert "noise_floor=212" in caplog.text
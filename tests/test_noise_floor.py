@@ -0,0 +1,42 @@
+"""Unit test for the noise_floor module."""
+
+import pytest
+
+from auto_muter.noise_floor import NoiseFloorTracker
+
+
+def feed(tracker, level, seconds, start, step=0.064):
+    """Track a steady level and return the last floor and time."""
+    floor = None
+    frames = int(seconds / step)
+    for index in range(frames):
+        floor = tracker.update(level, start + index * step)
+    return floor, start + frames * step
+
+
+def test_floor_ignores_speech_and_follows_noise():
+    """Test speech bursts leave the floor alone while a noise change moves it."""
+    tracker = NoiseFloorTracker(bias=1.0)
+    assert tracker.update(200.0, 0.0) is None
+    floor, now = feed(tracker, 200.0, 3.0, 0.064)
+    assert floor == pytest.approx(200.0)
+    floor, now = feed(tracker, 5000.0, 2.0, now)
+    assert floor == pytest.approx(200.0)
+
+    # An HVAC switching on is adopted once the quiet part leaves the window
+    floor, now = feed(tracker, 800.0, 12.0, now)
+    assert floor == pytest.approx(800.0)
+    # A quieter room is adopted within a few smoothing time constants
+    floor, now = feed(tracker, 100.0, 2.0, now)
+    assert floor == pytest.approx(100.0, rel=0.01)
+    assert len(tracker._minima) == 8  # pylint: disable=protected-access
+
+
+def test_threshold_is_a_margin_above_the_floor():
+    """Test the threshold sits margin_db above the floor, and not below the minimum."""
+    tracker = NoiseFloorTracker(bias=1.0, margin_db=20.0, min_threshold=100.0)
+    assert tracker.threshold is None
+    feed(tracker, 300.0, 2.0, 0.0)
+    assert tracker.threshold == pytest.approx(3000.0)
+    feed(tracker, 1.0, 2.0, 2.0)
+    assert tracker.threshold == 100.0
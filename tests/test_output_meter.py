@@ -0,0 +1,43 @@
+"""Unit test for the output meter module."""
+
+import time
+
+from auto_muter.output_meter import OutputLevelSampler
+from auto_muter.simulation import SimulatedAudioController
+
+
+def test_record_holds_peak_over_window():
+    """Test a short peak is held for the hold window only."""
+    sampler = OutputLevelSampler(SimulatedAudioController, hold=0.5)
+    sampler.record(0.2, 10.0)
+    sampler.record(0.0, 10.1)
+    assert sampler.latest.peak == 0.0
+    assert sampler.latest.held_peak == 0.2
+    assert sampler.is_playing(now=10.1)
+
+    sampler.record(0.0, 10.6)
+    assert sampler.latest.held_peak == 0.0
+    assert not sampler.is_playing(now=10.6)
+
+
+def test_stale_level_is_not_playing():
+    """Test a reading older than the hold window counts as silence."""
+    sampler = OutputLevelSampler(SimulatedAudioController, hold=0.5)
+    sampler.record(0.3, 1.0)
+    assert not sampler.is_playing(now=2.0)
+
+
+def test_sampler_thread_reads_controller():
+    """Test the sampler thread publishes the controller's level."""
+    controller = SimulatedAudioController(audio_playing=True)
+    sampler = OutputLevelSampler(lambda: controller, rate=200)
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 1.0
+        while not sampler.is_playing() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert sampler.is_playing()
+    finally:
+        sampler.stop()
+    assert not sampler.running
+    assert not sampler.is_playing()
@@ -0,0 +1,77 @@
+"""Unit test for the ring buffer module."""
+
+import numpy as np
+import pytest
+
+from auto_muter.ring_buffer import AudioRingBuffer
+
+
+def test_overlapping_windows():
+    """Test windows advance by one hop and overlap by the remainder."""
+    ring = AudioRingBuffer(capacity=16, window_size=4, hop_size=2)
+    ring.write(np.arange(8, dtype=np.int16))
+
+    assert ring.overlap == 2
+    assert ring.available == 3
+    windows = [ring.read_window() for _ in range(3)]
+    assert [w.tolist() for w in windows] == [
+        [0, 1, 2, 3],
+        [2, 3, 4, 5],
+        [4, 5, 6, 7],
+    ]
+    assert ring.read_window() is None
+
+
+def test_wrapped_window_is_a_view():
+    """Test windows crossing the end of the buffer are not copied."""
+    ring = AudioRingBuffer(capacity=10, window_size=4, hop_size=3)
+    samples = np.arange(1, 31, dtype=np.int16)
+    seen = []
+    for start in range(0, 30, 5):
+        ring.write(samples[start : start + 5].tobytes())
+        window = ring.read_window()
+        while window is not None:
+            storage = ring._storage  # pylint: disable=protected-access
+            assert np.shares_memory(window, storage)
+            seen.append(window.tolist())
+            window = ring.read_window()
+
+    expected = [samples[i : i + 4].tolist() for i in range(0, 27, 3)]
+    assert seen == expected
+    assert ring.overruns == 0
+
+
+def test_slow_consumer_is_counted_not_blocking():
+    """Test a lagging consumer skips ahead and reports an overrun."""
+    ring = AudioRingBuffer(capacity=8, window_size=4)
+    ring.write(np.arange(20, dtype=np.int16))
+
+    window = ring.read_window()
+
+    assert ring.overruns == 1
+    assert window.tolist() == [12, 13, 14, 15]
+    assert ring.read_window().tolist() == [16, 17, 18, 19]
+
+
+def test_invalid_configuration():
+    """Test the capacity must fit a window and a hop."""
+    with pytest.raises(ValueError):
+        AudioRingBuffer(capacity=4, window_size=4)
+
+
+def test_interleaved_channels():
+    """Test multi-channel frames are windowed as (frames, channels) views."""
+    ring = AudioRingBuffer(capacity=8, window_size=4, hop_size=2, channels=2)
+    frames = np.arange(20, dtype=np.int16).reshape(10, 2)
+    ring.write(frames[:6].tobytes())
+    ring.write(frames[6:])
+
+    windows = []
+    window = ring.read_window()
+    while window is not None:
+        windows.append(window.copy())
+        window = ring.read_window()
+
+    assert [w.shape for w in windows] == [(4, 2)] * 3
+    assert windows[-1].tolist() == frames[6:10].tolist()
+    assert ring.overruns == 1
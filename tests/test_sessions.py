@@ -0,0 +1,48 @@
+"""Unit test for the sessions module."""
+
+from auto_muter.sessions import SessionLevelMonitor
+from auto_muter.simulation import SimulatedSession, SimulatedSessionManager
+
+
+def test_monitor_filters_sessions_by_process():
+    """Test excluded processes do not count as output."""
+    manager = SimulatedSessionManager(
+        [
+            SimulatedSession("a", "Teams.exe", peak=0.8),
+            SimulatedSession("b", "spotify.exe", peak=0.2),
+        ]
+    )
+    monitor = SessionLevelMonitor(manager, exclude=["teams.exe"]).start()
+
+    assert monitor.get_peak_meter_value() == 0.2
+    assert list(monitor.peaks) == ["b"]
+
+
+def test_monitor_include_list():
+    """Test only included processes are metered."""
+    manager = SimulatedSessionManager(
+        [
+            SimulatedSession("a", "chime.exe", peak=0.9),
+            SimulatedSession("b", "spotify.exe", peak=0.0),
+        ]
+    )
+    monitor = SessionLevelMonitor(manager, include=["Spotify.exe"]).start()
+    assert monitor.sweep() == 0.0
+
+
+def test_monitor_follows_session_events_without_enumerating():
+    """Test created and expired sessions update the cached list."""
+    manager = SimulatedSessionManager()
+    monitor = SessionLevelMonitor(manager).start()
+    assert monitor.sweep() == 0.0
+
+    session = manager.create_session("a", "vlc.exe", peak=0.5)
+    assert monitor.sweep() == 0.5
+    manager.expire_session("a")
+    assert monitor.sweep() == 0.0
+
+    assert manager.enumerations == 1
+    assert session.reads == 1
+    monitor.close()
+    manager.create_session("b", "vlc.exe", peak=0.5)
+    assert not monitor.sessions
@@ -0,0 +1,24 @@
+"""Unit test for the simulation module."""
+
+from auto_muter.simulation import SimulatedAudioController
+
+
+def test_simulated_controller_tracks_state():
+    """Test the simulated controller behaves like the real one."""
+    controller = SimulatedAudioController(muted=False)
+    assert controller.toggle_mute() is True
+    assert controller.set_mute_state(False) is False
+    assert controller.get_mute_state() is False
+    assert controller.calls == 2
+    assert controller.is_audio_playing() is False
+
+
+def test_simulated_external_mute_change():
+    """Test external changes reach listeners like endpoint notifications."""
+    controller = SimulatedAudioController(muted=False)
+    changes = []
+    controller.add_mute_listener(changes.append)
+    controller.external_mute_change(True)
+    controller.external_mute_change(True)
+    assert changes == [True]
+    assert controller.get_mute_state() is True
@@ -0,0 +1,220 @@
+"""Unit test for the sources module."""
+
+import time
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from auto_muter.capture import FrameHandoff
+from auto_muter.host import HostSession
+from auto_muter.simulation import SimulatedPyAudio
+from auto_muter.sources import (ArraySource, AudioSource, MicrophoneSource,
+                                MultiDeviceSource, RawPcmSource,
+                                SyntheticSource, WavFileSource)
+
+
+def read_all(source):
+    """Drain a source and return its chunks."""
+    source.start()
+    chunks = []
+    while not source.finished:
+        data = source.read()
+        if data is not None:
+            chunks.append(bytes(data))
+    source.stop()
+    return chunks
+
+
+def test_array_source_chunks_and_timestamps():
+    """Test chunks and audio-position timestamps."""
+    source = ArraySource(np.arange(2500, dtype=np.int16), chunk_size=1000, rate=1000)
+    source.start()
+    assert len(source.read()) == 2000
+    assert source.now() == 1.0
+    source.read()
+    assert len(source.read()) == 1000
+    assert source.now() == 2.5
+    assert source.read() is None
+    assert source.finished
+
+
+def test_wav_file_source_mixes_to_mono(tmp_path):
+    """Test stereo WAV files are read and mixed down."""
+    path = tmp_path / "speech.wav"
+    stereo = np.tile(np.array([[100, 300]], dtype=np.int16), (4000, 1))
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(stereo.tobytes())
+
+    source = WavFileSource(path, chunk_size=1024)
+
+    assert source.rate == 8000
+    assert source.duration == 0.5
+    samples = np.frombuffer(b"".join(read_all(source)), dtype=np.int16)
+    assert len(samples) == 4000
+    assert np.all(samples == 200)
+
+
+def test_sources_keep_interleaved_channels(tmp_path):
+    """Test multi-channel arrays and WAV files are read frame by frame."""
+    frames = np.arange(6000, dtype=np.int16).reshape(-1, 3)
+    source = ArraySource(frames, chunk_size=500, rate=1000)
+    assert source.channels == 3
+    assert source.duration == 2.0
+    source.start()
+    assert len(source.read()) == 500 * 3 * 2
+    assert source.now() == 0.5
+
+    path = tmp_path / "array.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(3)
+        wav.setsampwidth(2)
+        wav.setframerate(1000)
+        wav.writeframes(frames.tobytes())
+    source = WavFileSource(path, downmix=False, chunk_size=500)
+    assert source.channels == 3
+    assert np.array_equal(source.samples, frames)
+
+
+def test_raw_pcm_source(tmp_path):
+    """Test headerless PCM replay."""
+    path = tmp_path / "speech.pcm"
+    np.full(3000, 7, dtype="<i2").tofile(path)
+    assert len(b"".join(read_all(RawPcmSource(path)))) == 6000
+
+
+def test_synthetic_source_levels():
+    """Test generated segments have the requested length and level."""
+    source = SyntheticSource([("silence", 0.5, 0), ("tone", 1.0, 2000)])
+    samples = np.frombuffer(b"".join(read_all(source)), dtype=np.int16)
+    assert len(samples) == 24000
+    assert np.all(samples[:8000] == 0)
+    assert np.isclose(np.sqrt(np.mean(samples[8000:].astype(float) ** 2)), 2000, 1e-2)
+
+    for kind in ("voice", "rumble", "clicks"):
+        samples = SyntheticSource([(kind, 0.5, 1000)]).samples.astype(float)
+        level = np.sqrt(np.mean(samples**2))
+        # Clicks only sound 5 ms out of every 125 ms
+        assert np.isclose(
+            level, 1000 * np.sqrt(0.04) if kind == "clicks" else 1000, 0.05
+        )
+
+    with pytest.raises(ValueError):
+        SyntheticSource([("chirp", 1.0, 10)])
+
+
+def test_microphone_source_borrows_shared_host():
+    """Test live capture reuses the process-wide host instead of its own."""
+    session = HostSession(lambda: SimulatedPyAudio(np.zeros(1600, np.int16)))
+    with patch("auto_muter.sources.get_host_session", return_value=session):
+        source = MicrophoneSource(capture_mode="blocking", chunk_size=160)
+        source.start()
+        assert source.read() is not None
+        assert session.reinitialize() is False
+        source.stop()
+    assert session.reinitialize() is True
+
+
+def test_microphone_source_opens_device_at_native_rate():
+    """Test a 48 kHz device is captured natively and resampled to 16 kHz."""
+    times = np.arange(48000) / 48000
+    samples = (8000 * np.sin(2 * np.pi * 500 * times)).astype(np.int16)
+    host = SimulatedPyAudio(samples, rate=48000)
+    source = MicrophoneSource(
+        capture_mode="blocking", host=lambda: host, chunk_duration=0.02
+    )
+    source.start()
+    chunk = source.read()
+    source.stop()
+
+    assert host.streams[0]._rate == 48000  # pylint: disable=protected-access
+    assert source.native_rate == 48000
+    assert source.rate == 16000
+    assert source.chunk_size == len(chunk) == 320
+
+
+class _FailingSource(ArraySource):
+    """Source whose device disappears after a few chunks."""
+
+    def __init__(self, fail_after, **kwargs):
+        super().__init__(np.zeros(16000, np.int16), **kwargs)
+        self.fail_after = fail_after
+        self.reads = 0
+
+    def read(self, timeout=None):
+        self.reads += 1
+        if self.reads > self.fail_after:
+            raise OSError("Stream closed")
+        return super().read(timeout)
+
+
+class _StalledSource(AudioSource):
+    """Live device whose callback never delivers a chunk."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.handoff = FrameHandoff()
+
+    def read(self, timeout=None):
+        return self.handoff.get(1.0 if timeout is None else timeout)
+
+
+def test_multi_device_source_does_not_wait_for_a_stalled_device():
+    """Test a silent device costs a miss, not the healthy device's latency."""
+    healthy = ArraySource(np.full(3200, 500, np.int16), chunk_size=160, realtime=True)
+    source = MultiDeviceSource([_StalledSource(chunk_size=160), healthy], max_misses=3)
+    source.start()
+
+    started = time.monotonic()
+    latencies = []
+    for _ in range(10):
+        frames = source.read()
+        latencies.append(time.monotonic() - started - healthy.now())
+        assert (frames[:, 1] == 500).all()
+
+    # Chunks last 10 ms; waiting out the stalled device would take 1 s each
+    assert max(latencies) < 0.05
+    assert source.active.tolist() == [False, True]
+    source.stop()
+
+
+def test_multi_device_source_clock_follows_the_remaining_device():
+    """Test time keeps advancing after the first device ends."""
+    short = ArraySource(np.zeros(2000, np.int16), chunk_size=1000)
+    long = ArraySource(np.zeros(5000, np.int16), chunk_size=1000)
+    source = MultiDeviceSource([short, long])
+    source.start()
+
+    times = []
+    while not source.finished:
+        if source.read() is not None:
+            times.append(source.now())
+
+    assert times == [1000 / 16000 * n for n in range(1, 6)]
+    assert source.now() == times[-1]
+    source.stop()
+
+
+def test_multi_device_source_aligns_and_survives_failures():
+    """Test devices are read side by side and a failing one is dropped."""
+    loud = ArraySource(np.full(4000, 500, np.int16), chunk_size=1000)
+    failing = _FailingSource(2, chunk_size=1000)
+    source = MultiDeviceSource([loud, failing])
+    source.start()
+
+    first = source.read()
+    assert first.shape == (1000, 2)
+    assert (first[:, 0] == 500).all() and (first[:, 1] == 0).all()
+    source.read()
+    third = source.read()
+
+    assert source.active.tolist() == [True, False]
+    assert (third[:, 0] == 500).all()
+    source.read()
+    assert source.read() is None
+    assert source.finished
+    source.stop()
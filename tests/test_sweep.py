@@ -0,0 +1,72 @@
+"""Unit test for the sweep module."""
+
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from auto_muter import sweep
+from auto_muter.sources import SyntheticSource
+
+SEGMENTS = [("noise", 1.0, 60), ("tone", 1.0, 2500), ("noise", 2.0, 60)] * 3
+
+
+@pytest.fixture(name="corpus")
+def fixture_corpus(tmp_path):
+    """Two labelled recordings of speech bursts between background noise."""
+    samples = SyntheticSource(SEGMENTS).samples
+    for name in ("seat1", "seat2"):
+        with wave.open(str(tmp_path / f"{name}.wav"), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(samples.tobytes())
+        labels = [f"{start}\t{start + 1.0}\tspeech" for start in (1.0, 5.0, 9.0)]
+        (tmp_path / f"{name}.txt").write_text("\n".join(labels), encoding="utf-8")
+    return tmp_path
+
+
+def test_energies_are_cached_between_runs(corpus):
+    """Test a second load reads every recording from the cache."""
+    recordings, cached = sweep.load_corpus(corpus, workers=1)
+    assert len(recordings) == 2 and cached == 0
+
+    with patch("auto_muter.sweep.compute_energies") as compute:
+        again, cached = sweep.load_corpus(corpus, workers=1)
+    compute.assert_not_called()
+    assert cached == 2
+    assert np.array_equal(again[0][0], recordings[0][0])
+
+
+def test_sweep_scores_settings(corpus):
+    """Test a threshold above the speech clips it and a low one does not."""
+    recordings, _ = sweep.load_corpus(corpus, workers=1)
+    results = sweep.sweep(recordings, [500, 5000], [0.5], workers=2)
+
+    good, deaf = results
+    assert good["clipped_speech_rate"] < 0.1
+    assert good["false_unmutes_per_hour"] == 0
+    # Three unmutes and three mutes in each 12 s recording
+    assert good["toggles_per_hour"] == pytest.approx(6 * 3600 / 12, rel=0.05)
+    # Only the 0.5 s hangover after each burst is heard without speech
+    assert good["open_mic_rate"] == pytest.approx(1.5 / 9, abs=0.05)
+    assert deaf["clipped_speech_rate"] == 1.0
+    assert deaf["toggles_per_hour"] == 0
+    assert sweep.format_results(results, top=1)[1].split()[0] == "500"
+
+
+def test_parse_values():
+    """Test ranges include their end and lists are split."""
+    assert sweep.parse_values("0.5:1.5:0.5") == [0.5, 1.0, 1.5]
+    assert sweep.parse_values("100,300") == [100.0, 300.0]
+
+
+def test_spectral_features_are_cached_separately(corpus):
+    """Test each detector gets its own cache entry and energies."""
+    rms, _ = sweep.load_corpus(corpus, workers=1)
+    spectral, cached = sweep.load_corpus(corpus, workers=1, detector="spectral")
+    assert cached == 0
+    assert not np.allclose(rms[0][0], spectral[0][0])
+    # The speech is a 440 Hz tone, inside the voice band
+    assert spectral[0][0][spectral[0][2]].mean() > 2000
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 from auto_muter.utils import get_audio_devices
 
 
-@patch("auto_muter.utils.pyaudio.PyAudio")
+@patch("auto_muter.host.pyaudio.PyAudio")
 def test_get_audio_devices_with_inputs(mock_pyaudio):
     """Test retrieval of audio devices."""
     mock_instance = MagicMock()
@@ -24,7 +24,7 @@ def test_get_audio_devices_with_inputs(mock_pyaudio):
     assert len(devices) == 2
 
 
-@patch("auto_muter.utils.pyaudio.PyAudio", side_effect=Exception("pyaudio boom"))
+@patch("auto_muter.host.pyaudio.PyAudio", side_effect=Exception("pyaudio boom"))
 def test_get_audio_devices_error(mock_pyaudio):  # pylint: disable=unused-argument
     """Test audio device retrieval when default present."""
     devices = get_audio_devices()